@@ -0,0 +1,111 @@
+import os
+import sys
+import threading
+import time
+import numpy as np
+from PyQt5.QtCore import QCoreApplication, QObject, QThread, pyqtSignal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from components.paging_collector import PAGE_PRESENT
+from components.process_collector import list_pids
+from components.sampler import Sampler
+
+TICKS = 50
+
+
+def legacy_payloads(paging, segments):
+    page_size = paging.page_size
+    pages = [{
+        'page_id': int(page['vpn']),
+        'in_physical': bool(page['flags'] & PAGE_PRESENT),
+        'physical_address': int(page['pfn']) * page_size if page['pfn'] else None,
+        'process_id': int(page['pid'])
+    } for page in paging.pages]
+    paging_info = {
+        'page_size': page_size,
+        'total_pages': paging.total_pages,
+        'used_pages': paging.used_pages,
+        'pages': pages
+    }
+    segmentation_info = {
+        'segments': [{
+            'segment_id': segment_id, 'base': base, 'limit': limit, 'type': seg_type, 'process_id': pid
+        } for segment_id, base, limit, seg_type, pid in segments.tolist()],
+        'total_memory': 16384,
+        'fragmentation': 0.0
+    }
+    return paging_info, segmentation_info
+
+
+class Emitter(QThread):
+    dict_payload = pyqtSignal(dict, dict, float, int)
+    object_payload = pyqtSignal(object, object, float, int)
+
+    def __init__(self, build, typed):
+        super().__init__()
+        self.build = build
+        self.typed = typed
+        self.received = threading.Event()
+
+    def run(self):
+        for _ in range(TICKS):
+            self.received.clear()
+            blocks = sys.getallocatedblocks()
+            start = time.perf_counter()
+            paging, segmentation = self.build()
+            signal = self.object_payload if self.typed else self.dict_payload
+            signal.emit(paging, segmentation, start, blocks)
+            self.received.wait()
+            del paging, segmentation
+
+
+class Receiver(QObject):
+    def __init__(self, emitter):
+        super().__init__()
+        self.emitter = emitter
+        self.latencies = []
+        self.blocks = []
+
+    def receive(self, paging, segmentation, start, blocks):
+        self.latencies.append(time.perf_counter() - start)
+        self.blocks.append(sys.getallocatedblocks() - blocks)
+        self.emitter.received.set()
+
+
+def measure(app, build, typed):
+    emitter = Emitter(build, typed)
+    receiver = Receiver(emitter)
+    (emitter.object_payload if typed else emitter.dict_payload).connect(receiver.receive)
+    emitter.finished.connect(app.quit)
+    emitter.start()
+    app.exec_()
+    emitter.wait()
+    latencies = np.array(receiver.latencies) * 1000
+    return np.median(receiver.blocks), np.median(latencies), np.percentile(latencies, 99)
+
+
+def main():
+    app = QCoreApplication(sys.argv)
+    sampler = Sampler()
+    paging = sampler.get_paging_info()
+    segments = sampler.segmentation_collector
+    segments.collect(list_pids())
+    segment_array = segments.snapshot()
+    print(f"{len(paging.pages)} pages, {len(segment_array)} segments, {TICKS} ticks")
+
+    def build_dicts():
+        return legacy_payloads(paging, segment_array)
+
+    def build_objects():
+        return (type(paging)(paging.timestamp, paging.page_size, paging.total_pages, paging.used_pages,
+                             paging.pages.copy()),
+                segment_array.copy())
+
+    print(f"{'payload':<10}{'blocks/tick':>14}{'median ms':>12}{'p99 ms':>10}")
+    for label, build, typed in (('dict', build_dicts, False), ('typed', build_objects, True)):
+        blocks, median, p99 = measure(app, build, typed)
+        print(f"{label:<10}{blocks:>14.0f}{median:>12.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
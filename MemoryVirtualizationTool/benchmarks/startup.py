@@ -0,0 +1,38 @@
+import argparse
+import os
+import re
+import subprocess
+import sys
+import numpy as np
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'main.py')
+REPORT = re.compile(r'window painted ([\d.]+) s, first data frame ([\d.]+) s')
+DEFAULT_RUNS = 10
+RUN_TIMEOUT = 60
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start time of the offscreen GUI")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="number of fresh processes to start")
+    args = parser.parse_args()
+
+    env = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    painted, first_data = [], []
+    for _ in range(args.runs):
+        output = subprocess.run([sys.executable, MAIN, '--startup-report'], env=env, capture_output=True,
+                                text=True, timeout=RUN_TIMEOUT).stdout
+        match = REPORT.search(output)
+        if match is None:
+            print(f"no startup report in output: {output!r}", file=sys.stderr)
+            continue
+        painted.append(float(match.group(1)))
+        first_data.append(float(match.group(2)))
+    if not painted:
+        sys.exit(1)
+    print(f"{'phase':<22}{'p50 s':>9}{'p99 s':>9}{'runs':>6}")
+    for label, values in (('window painted', painted), ('first data frame', first_data)):
+        print(f"{label:<22}{np.percentile(values, 50):>9.3f}{np.percentile(values, 99):>9.3f}{len(values):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+import argparse
+import json
+import os
+import itertools
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tests.fake_procfs import FakeProcfs, pagemap_entries
+from components.paging_collector import PAGE_DTYPE, PAGE_PRESENT, PAGE_DIRTY
+from components.process_collector import PROCESS_DTYPE
+from components.segmentation_collector import SEGMENT_DTYPE, SEGMENT_TYPES, SegmentationCollector
+from components.samples import MemorySample, ProcessSnapshot, PagingSnapshot, SegmentationDelta
+from components.system_monitor import SystemMonitor
+from components.memory_view import MemoryView, HISTORY_WINDOWS
+from components.paging_view import PagingView
+from components.segmentation_view import SegmentationView
+import main as app_main
+
+DEFAULT_SIZES = (10, 1000, 100000, 1000000)
+DEFAULT_REPEAT = 20
+DEFAULT_BUDGET = 10.0
+MIN_REPEAT = 3
+REGRESSION_THRESHOLD = 1.25
+PROCESS_LIMIT = 2000
+CHURN = 0.01
+PAGING_PID = 100
+SEGMENTATION_PID = 200
+BASE_ADDRESS = 0x7f0000000000
+TOTAL_MEMORY = 64 << 30
+
+
+def write_process_files(root, pid, name, rss_kb):
+    pid_dir = os.path.join(root, str(pid))
+    os.makedirs(pid_dir, exist_ok=True)
+    with open(os.path.join(pid_dir, 'stat'), 'w') as f:
+        f.write(f"{pid} ({name}) S 1 {pid} {pid} 0 -1 4194304 100 0 0 0 5 3 0 0 20 0 1 0 100 "
+                f"{rss_kb * 4096} {rss_kb // 4} 18446744073709551615\n")
+    with open(os.path.join(pid_dir, 'smaps_rollup'), 'w') as f:
+        f.write(f"Rss: {rss_kb} kB\nPss: {rss_kb // 2} kB\nPrivate_Clean: 0 kB\n"
+                f"Private_Dirty: {rss_kb // 4} kB\nSwap: 0 kB\n")
+
+
+def build_procfs(root, size, rng):
+    procfs = FakeProcfs(root)
+    base_vpn = BASE_ADDRESS >> 12
+    vpns = np.arange(base_vpn, base_vpn + size, dtype=np.uint64)
+    pfns = rng.choice(TOTAL_MEMORY >> 12, size, replace=False) + 1
+    procfs.add_process(PAGING_PID, [(BASE_ADDRESS, BASE_ADDRESS + (size << 12), 'rw-p', None)],
+                       vpns, pagemap_entries(pfns))
+    starts = BASE_ADDRESS + (np.arange(size, dtype=np.int64) << 13)
+    procfs.add_process(SEGMENTATION_PID, [(int(start), int(start) + 4096, 'rw-p', None) for start in starts])
+    for pid in (PAGING_PID, SEGMENTATION_PID):
+        write_process_files(root, pid, 'bench', 4 * size)
+    for pid in range(1000, 1000 + min(size, PROCESS_LIMIT)):
+        write_process_files(root, pid, f'worker{pid}', int(rng.integers(1, 1 << 20)))
+    return procfs
+
+
+def synthetic_pages(size, rng):
+    pages = np.zeros(size, dtype=PAGE_DTYPE)
+    pages['vpn'] = np.arange(size) + (BASE_ADDRESS >> 12)
+    pages['pfn'] = rng.choice(TOTAL_MEMORY >> 12, size, replace=False) + 1
+    pages['pid'] = rng.integers(1, 200, size)
+    pages['flags'] = PAGE_PRESENT | (rng.random(size) < 0.2) * PAGE_DIRTY
+    return pages
+
+
+def churned(pages, rng):
+    pages = pages.copy()
+    changed = rng.random(len(pages)) < CHURN
+    pages['pfn'][changed] = rng.choice(TOTAL_MEMORY >> 12, int(changed.sum())) + 1
+    return pages
+
+
+def synthetic_segments(size, rng):
+    segments = np.zeros(size, dtype=SEGMENT_DTYPE)
+    segments['segment_id'] = np.arange(size)
+    segments['base'] = (np.arange(size, dtype=np.uint64) * 8) + (BASE_ADDRESS >> 10)
+    segments['limit'] = 4
+    segments['type'] = np.array(SEGMENT_TYPES)[rng.integers(0, len(SEGMENT_TYPES), size)]
+    segments['process_id'] = rng.integers(1, 200, size)
+    return segments
+
+
+def synthetic_processes(size, rng):
+    processes = np.zeros(size, dtype=PROCESS_DTYPE)
+    processes['pid'] = np.arange(1, size + 1)
+    processes['name'] = 'worker'
+    processes['rss'] = rng.integers(1 << 20, 1 << 30, size)
+    processes['pss'] = processes['rss'] // 2
+    processes['uss'] = processes['rss'] // 4
+    return processes
+
+
+def memory_sample(timestamp, rng):
+    used = int(rng.integers(8 << 30, 32 << 30))
+    return MemorySample(timestamp, TOTAL_MEMORY, TOTAL_MEMORY - used, used, TOTAL_MEMORY - used,
+                        100.0 * used / TOTAL_MEMORY, 8 << 30, 1 << 30, 7 << 30, 12.5)
+
+
+def measure(run, repeat, budget, setup=None):
+    latencies = []
+    deadline = time.perf_counter() + budget
+    while len(latencies) < repeat and (len(latencies) < MIN_REPEAT or time.perf_counter() < deadline):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        latencies.append(time.perf_counter() - start)
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        run()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    latencies = np.array(latencies) * 1000
+    return {'p50_ms': float(np.percentile(latencies, 50)), 'p99_ms': float(np.percentile(latencies, 99)),
+            'peak_kb': peak / 1024, 'runs': len(latencies)}
+
+
+def collector_cases(root, size):
+    monitor = SystemMonitor(root)
+    sampler = monitor.sampler
+    sampler.set_paging_pids([PAGING_PID])
+    sampler.set_segmentation_pids([SEGMENTATION_PID])
+
+    def reset_segmentation():
+        sampler.segmentation_collector = SegmentationCollector(root)
+
+    return monitor, [
+        ('get_memory_info', sampler.get_memory_info, None),
+        ('get_process_info', sampler.get_process_info, None),
+        ('get_paging_info', sampler.get_paging_info, None),
+        ('get_segmentation_info', sampler.get_segmentation_info, reset_segmentation),
+    ]
+
+
+def view_cases(app, monitor, size, rng):
+    now = time.time()
+    memory_view = MemoryView(monitor)
+    memory_view.window_combo.setCurrentIndex(len(HISTORY_WINDOWS) - 1)
+    for offset in range(min(size, memory_view.history.capacity), 0, -1):
+        memory_view.history.append(now - offset, memory_sample(now - offset, rng))
+    memory_view.ingest_process_info(ProcessSnapshot(now, synthetic_processes(size, rng)))
+
+    paging_view = PagingView(monitor)
+    pages = [synthetic_pages(size, rng)]
+    pages.append(churned(pages[0], rng))
+    paging_view.update_paging_info(PagingSnapshot(now, 4096, TOTAL_MEMORY >> 12, size, pages[0]))
+    paging_ticks = itertools.count()
+
+    segmentation_view = SegmentationView(monitor)
+    segments = synthetic_segments(size, rng)
+    segmentation_view.update_segmentation_info(
+        SegmentationDelta(now, segments, segments[:0], np.empty(0, dtype=np.int64), True, TOTAL_MEMORY >> 10, 0.0))
+    churn = segments[rng.random(size) < CHURN]
+    segmentation_ticks = itertools.count()
+
+    for view in (memory_view, paging_view, segmentation_view):
+        view.resize(1000, 700)
+        view.show()
+    app.processEvents()
+
+    def update_memory():
+        memory_view.update_memory_info(memory_sample(time.time(), rng))
+
+    def update_paging():
+        tick = next(paging_ticks)
+        paging_view.update_paging_info(PagingSnapshot(time.time(), 4096, TOTAL_MEMORY >> 12, size, pages[tick % 2]))
+
+    def update_segmentation():
+        resized = churn.copy()
+        resized['limit'] = 4 + next(segmentation_ticks) % 2 * 4
+        segmentation_view.update_segmentation_info(
+            SegmentationDelta(time.time(), segments[:0], resized, np.empty(0, dtype=np.int64), False,
+                              TOTAL_MEMORY >> 10, 0.0))
+
+    return [memory_view, paging_view, segmentation_view], [
+        ('MemoryView.update_memory_info', update_memory, None),
+        ('PagingView.update_paging_info', update_paging, None),
+        ('SegmentationView.update_segmentation_info', update_segmentation, None),
+    ]
+
+
+def theme_case(app, root, size, rng):
+    monitor = SystemMonitor(root)
+    window = app_main.MemoryVisualizationApp(monitor)
+    window.show()
+    while 'window' not in window.startup_times or not monitor.isRunning():
+        app.processEvents()
+    monitor.stop()
+    for tab in window.lazy_tabs:
+        tab.ensure()
+    now = time.time()
+    window.memory_tab.view.update_memory_info(memory_sample(now, rng))
+    window.paging_tab.view.ingest_paging_info(
+        PagingSnapshot(now, 4096, TOTAL_MEMORY >> 12, size, synthetic_pages(size, rng)))
+    segments = synthetic_segments(size, rng)
+    window.segmentation_tab.view.ingest_segmentation_info(
+        SegmentationDelta(now, segments, segments[:0], np.empty(0, dtype=np.int64), True, TOTAL_MEMORY >> 10, 0.0))
+    app.processEvents()
+
+    def toggle_theme():
+        window.toggle_theme()
+        app.processEvents()
+
+    return window, ('apply_theme', toggle_theme, None)
+
+
+def run_suite(app, sizes, repeat, budget, only):
+    results = {}
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix='membench-') as root:
+            build_procfs(root, size, rng)
+            monitor, cases = collector_cases(root, size)
+            views, view_benchmarks = view_cases(app, monitor, size, rng)
+            window, theme = theme_case(app, root, size, rng)
+            for name, run, setup in cases + view_benchmarks + [theme]:
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                result = measure(run, repeat, budget, setup)
+                results[f'{name}/{size}'] = result
+                print(f"{name:<44}{size:>9}{result['p50_ms']:>11.2f}{result['p99_ms']:>11.2f}"
+                      f"{result['peak_kb'] / 1024:>11.1f}{result['runs']:>6}", flush=True)
+            window.close()
+            monitor.sampler.process_collector.shutdown()
+            for view in views:
+                view.close()
+                view.deleteLater()
+            window.deleteLater()
+            app.processEvents()
+            plt.close('all')
+    return results
+
+
+def compare(results, baseline, threshold):
+    regressions = 0
+    print(f"\n{'benchmark':<54}{'base p50':>11}{'p50':>11}{'ratio':>8}")
+    for key, result in results.items():
+        previous = baseline['results'].get(key)
+        if previous is None:
+            continue
+        ratio = result['p50_ms'] / max(previous['p50_ms'], 1e-6)
+        flag = '  REGRESSION' if ratio > threshold else ''
+        regressions += bool(flag)
+        print(f"{key:<54}{previous['p50_ms']:>11.2f}{result['p50_ms']:>11.2f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offscreen collector and view benchmarks")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="comma separated page/segment counts")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="timed runs per benchmark")
+    parser.add_argument('--budget', type=float, default=DEFAULT_BUDGET,
+                        help=f"seconds per benchmark before stopping early, at least {MIN_REPEAT} runs")
+    parser.add_argument('--only', action='append', default=[], help="run benchmarks whose name contains this")
+    parser.add_argument('--save-baseline', metavar='PATH', help="write results as a JSON baseline")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a saved baseline")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="p50 ratio above which a benchmark counts as a regression")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+
+    sizes = [int(size) for size in args.sizes.split(',')]
+    print(f"{'benchmark':<44}{'size':>9}{'p50 ms':>11}{'p99 ms':>11}{'peak MB':>11}{'runs':>6}")
+    results = run_suite(app, sizes, args.repeat, args.budget, args.only)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({'created': time.time(), 'python': platform.python_version(),
+                       'machine': platform.machine(), 'results': results}, f, indent=1)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import signal
+import sys
+from components.sampler import Sampler
+from components.recording import ChunkEncoder, encode_memory, memory_row
+from components.scheduler import DEFAULT_INTERVALS, SampleScheduler
+from components.pressure import PressureWatcher, open_pressure_triggers
+from components.stream import DEFAULT_ADDRESS, StreamServer
+from components.metrics_server import DEFAULT_METRICS_ADDRESS, MetricsServer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless memory collector")
+    parser.add_argument('--listen', default=DEFAULT_ADDRESS,
+                        help="Unix socket path or host:port to serve viewers on")
+    parser.add_argument('--interval', type=float, default=1.0,
+                        help="multiplier applied to every source's sampling interval")
+    parser.add_argument('--pressure', action='store_true',
+                        help="sample slowly and burst while PSI memory stall triggers fire")
+    parser.add_argument('--cgroup', action='append', default=[],
+                        help="also watch this cgroup v2 memory.pressure, may be repeated")
+    parser.add_argument('--metrics', metavar='ADDRESS', nargs='?', const=DEFAULT_METRICS_ADDRESS,
+                        help="serve self-monitoring metrics as Prometheus text and JSON on host:port")
+    parser.add_argument('--pid', type=int, action='append', help="process to scan, may be repeated")
+    args = parser.parse_args()
+
+    sampler = Sampler()
+    if args.pid:
+        sampler.set_paging_pids(args.pid)
+        sampler.set_segmentation_pids(args.pid)
+    encoder = ChunkEncoder()
+    encoders = {
+        'memory': lambda sample: [encode_memory([memory_row(sample)])],
+        'processes': encoder.encode_processes,
+        'paging': encoder.encode_paging,
+        'segmentation': encoder.encode_segmentation
+    }
+    scheduler = SampleScheduler(sampler.sources(),
+                                {name: interval * args.interval for name, interval in DEFAULT_INTERVALS.items()})
+    server = StreamServer(args.listen, encoder.keyframes)
+    metrics_server = MetricsServer(args.metrics) if args.metrics else None
+    pressure = None
+    if args.pressure:
+        try:
+            pressure = PressureWatcher(scheduler, open_pressure_triggers(args.cgroup))
+        except OSError as error:
+            print(f"PSI triggers unavailable, polling instead: {error}", file=sys.stderr)
+        else:
+            server.add_reader(pressure, lambda: pressure.wait(0))
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    scheduler.restart()
+    try:
+        while True:
+            for kind, payload in scheduler.run_due():
+                server.broadcast(encoders[kind](payload))
+            server.poll(scheduler.wait_time())
+            if pressure is not None:
+                pressure.wait(0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        if metrics_server is not None:
+            metrics_server.close()
+        if pressure is not None:
+            pressure.close()
+        sampler.process_collector.shutdown()
+
+
+if __name__ == "__main__":
+    main()
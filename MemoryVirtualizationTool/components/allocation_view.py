@@ -0,0 +1,123 @@
+import functools
+from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QComboBox, QSpinBox, QFileDialog
+from PyQt5.QtCore import QObject, pyqtSignal
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from components.allocator_sim import (POLICIES, DEFAULT_ARENA, synthetic_trace, load_session_trace, load_trace,
+                                      simulate)
+from components.samples import merge_segment_deltas
+from components.segmentation_view import SegmentationView
+from components.simulation_view import PlaybackView
+
+TRACE_SOURCES = ('Synthetic', 'Session recording', 'Trace file (.npy)')
+ARENA_SIZES = [('16 MB', 16 << 20), ('64 MB', DEFAULT_ARENA), ('256 MB', 256 << 20), ('1 GB', 1 << 30)]
+
+
+class SimulationFeed(QObject):
+    segmentation_updated = pyqtSignal(object)
+
+
+class AllocationView(PlaybackView):
+    def __init__(self):
+        super().__init__()
+        self.feed = SimulationFeed(self)
+        self.result = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QVBoxLayout()
+
+        self.controls_layout = QHBoxLayout()
+        self.policy_combo = QComboBox()
+        self.policy_combo.addItems(POLICIES)
+        self.controls_layout.addWidget(self.policy_combo)
+        self.trace_combo = QComboBox()
+        self.trace_combo.addItems(TRACE_SOURCES)
+        self.controls_layout.addWidget(self.trace_combo)
+        self.ops_spin = QSpinBox()
+        self.ops_spin.setRange(1000, 50000000)
+        self.ops_spin.setSingleStep(100000)
+        self.ops_spin.setValue(1000000)
+        self.ops_spin.setSuffix(" ops")
+        self.controls_layout.addWidget(self.ops_spin)
+        self.arena_combo = QComboBox()
+        for label, size in ARENA_SIZES:
+            self.arena_combo.addItem(label, size)
+        self.arena_combo.setCurrentIndex(1)
+        self.controls_layout.addWidget(self.arena_combo)
+        self.add_run_button(self.controls_layout)
+        self.add_play_button(self.controls_layout)
+        self.layout.addLayout(self.controls_layout)
+
+        self.add_status_label(self.layout, "Choose a policy and trace, then run the simulation")
+        self.add_frame_slider(self.layout)
+
+        self.figure, self.ax = plt.subplots(figsize=(10, 2.5))
+        self.axes = (self.ax,)
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setMaximumHeight(220)
+        self.layout.addWidget(self.canvas)
+        self.fragmentation_line, = self.ax.plot([], [], label='External fragmentation', color='#F44336')
+        self.utilization_line, = self.ax.plot([], [], label='Arena used', color='#2196F3')
+        self.cursor_line = self.ax.axvline(0, color='gray', linestyle='--', linewidth=1)
+        self.ax.set_ylim(0, 1.05)
+        self.ax.set_xlabel('Operations', fontsize=10)
+        self.ax.set_title('Fragmentation Over Time', fontsize=12)
+        self.ax.legend(fontsize=9, loc='upper left')
+        self.figure.tight_layout()
+
+        self.segmentation_view = SegmentationView(self.feed, unit='B')
+        self.segmentation_view.title_label.setText("Simulated Heap Layout")
+        self.segmentation_view.dirty.connect(self.dirty)
+        self.layout.addWidget(self.segmentation_view)
+
+        self.setLayout(self.layout)
+
+    def update_theme(self, style):
+        self.segmentation_view.update_theme(style)
+        super().update_theme(style)
+
+    def render(self):
+        self.segmentation_view.render()
+        super().render()
+
+    def trace_loader(self):
+        source = self.trace_combo.currentText()
+        if source == 'Synthetic':
+            return functools.partial(synthetic_trace, self.ops_spin.value())
+        if source == 'Session recording':
+            path, _ = QFileDialog.getOpenFileName(self, "Open session recording")
+            return path and functools.partial(load_session_trace, path)
+        path, _ = QFileDialog.getOpenFileName(self, "Open allocation trace", filter="NumPy arrays (*.npy)")
+        return path and functools.partial(load_trace, path)
+
+    def simulation_job(self):
+        load = self.trace_loader()
+        if not load:
+            return None
+        policy, arena = self.policy_combo.currentText(), self.arena_combo.currentData()
+        return f"Simulating {policy}...", lambda: simulate(load(), policy, arena)
+
+    def show_result(self, result):
+        self.result = result
+        timeline = result.timeline
+        self.status_label.setText(
+            f"{result.policy}: {result.operations:,} ops | {result.failures:,} failed allocations | "
+            f"peak used {timeline['used'].max() / result.arena:.1%} | "
+            f"final fragmentation {timeline['fragmentation'][-1]:.2f}" if len(timeline) else
+            f"{result.policy}: empty trace")
+        self.fragmentation_line.set_data(timeline['op_index'], timeline['fragmentation'])
+        self.utilization_line.set_data(timeline['op_index'], timeline['used'] / result.arena)
+        self.ax.set_xlim(0, max(result.operations, 1))
+        self.set_frame_count(len(result.frames))
+
+    def show_frame(self, index):
+        frames = self.result.frames if self.result is not None else []
+        if not 0 <= index < len(frames) or index == self.frame_index:
+            return
+        pending = frames[self.frame_index + 1:index + 1] if index > self.frame_index else frames[:index + 1]
+        self.frame_index = index
+        self.feed.segmentation_updated.emit(functools.reduce(merge_segment_deltas, pending))
+        self.cursor_line.set_xdata([frames[index].timestamp] * 2)
+        self.plot_stale = True
+        self.dirty.emit()
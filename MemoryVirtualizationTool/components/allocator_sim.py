@@ -0,0 +1,403 @@
+import bisect
+import itertools
+import numpy as np
+from components.recording import SessionReader
+from components.segmentation_collector import SEGMENT_DTYPE
+from components.samples import SegmentationDelta, empty_segments
+
+OP_ALLOC = 0
+OP_FREE = 1
+
+TRACE_DTYPE = np.dtype([
+    ('op', np.uint8),
+    ('id', np.int64),
+    ('size', np.uint64),
+    ('pid', np.int32),
+])
+
+TIMELINE_DTYPE = np.dtype([
+    ('op_index', np.int64),
+    ('used', np.int64),
+    ('free', np.int64),
+    ('largest_free', np.int64),
+    ('fragmentation', np.float64),
+    ('failures', np.int64),
+])
+
+POLICIES = ('first-fit', 'next-fit', 'best-fit', 'worst-fit', 'buddy', 'slab')
+DEFAULT_ARENA = 64 << 20
+ALIGNMENT = 16
+ADDRESS_BITS = 48
+ADDRESS_MASK = (1 << ADDRESS_BITS) - 1
+MAX_FRAMES = 200
+MAX_TIMELINE_POINTS = 2000
+
+BUDDY_MIN_ORDER = 4
+SLAB_SIZE = 1 << 15
+SLAB_CLASSES = (16, 32, 64, 96, 128, 192, 256, 512, 1024, 2048, 4096, 8192)
+
+
+def synthetic_trace(count, seed=0, mean_size=256, mean_lifetime=2000, pid=0):
+    rng = np.random.default_rng(seed)
+    allocations = count
+    sizes = np.maximum(rng.lognormal(np.log(mean_size), 1.2, allocations), 1).astype(np.uint64)
+    born = np.arange(allocations, dtype=np.float64)
+    lifetimes = rng.exponential(mean_lifetime, allocations) * rng.choice([0.1, 1.0, 10.0], allocations)
+    order = np.argsort(np.concatenate([born, born + lifetimes + 0.5]), kind='stable')[:count]
+    trace = np.empty(len(order), dtype=TRACE_DTYPE)
+    trace['op'] = np.repeat([OP_ALLOC, OP_FREE], allocations)[order]
+    trace['id'] = np.tile(np.arange(allocations), 2)[order]
+    trace['size'] = np.tile(sizes, 2)[order]
+    trace['pid'] = pid
+    return trace
+
+
+def session_trace(reader):
+    ops = []
+    live = set()
+    for _, _, delta in reader.segmentation_samples(0.0):
+        if delta.reset:
+            ops.extend((OP_FREE, segment_id, 0, 0) for segment_id in sorted(live))
+            live.clear()
+        for segment_id in delta.removed.tolist():
+            if segment_id in live:
+                live.discard(segment_id)
+                ops.append((OP_FREE, segment_id, 0, 0))
+        for segments in (delta.added, delta.resized):
+            for segment_id, limit, pid in zip(segments['segment_id'].tolist(), segments['limit'].tolist(),
+                                              segments['process_id'].tolist()):
+                if segment_id in live:
+                    ops.append((OP_FREE, segment_id, 0, 0))
+                live.add(segment_id)
+                ops.append((OP_ALLOC, segment_id, limit * 1024, pid))
+    return np.array(ops, dtype=TRACE_DTYPE)
+
+
+def load_session_trace(path):
+    reader = SessionReader(path)
+    try:
+        return session_trace(reader)
+    finally:
+        reader.close()
+
+
+def load_trace(path):
+    trace = np.load(path)
+    missing = set(TRACE_DTYPE.names) - set(trace.dtype.names or ())
+    if missing:
+        raise ValueError(f"{path} is missing trace fields: {', '.join(sorted(missing))}")
+    return trace.astype(TRACE_DTYPE)
+
+
+class FreeListAllocator:
+    def __init__(self, arena, policy='first-fit'):
+        self.arena = arena
+        self.policy = policy
+        self.by_start = {}
+        self.by_end = {}
+        self.by_size = []
+        self.classes = [[] for _ in range(ADDRESS_BITS + 1)]
+        self.class_sizes = [[] for _ in range(ADDRESS_BITS + 1)]
+        self.nonempty = 0
+        self.rover = 0
+        self.free_bytes = 0
+        self.address_ordered = policy in ('first-fit', 'next-fit')
+        self._find = {
+            'first-fit': self._first_fit,
+            'next-fit': self._next_fit,
+            'best-fit': self._best_fit,
+            'worst-fit': self._worst_fit,
+        }[policy]
+        self._insert(0, arena)
+
+    def allocate(self, size):
+        size = max((size + ALIGNMENT - 1) & -ALIGNMENT, ALIGNMENT)
+        start = self._find(size)
+        if start is None:
+            return None
+        block = self.by_start[start]
+        self._remove(start, block)
+        if block > size:
+            self._insert(start + size, block - size)
+        self.rover = start + size
+        return start, size
+
+    def free(self, start, size):
+        end = start + size
+        following = self.by_start.get(end)
+        if following is not None:
+            self._remove(end, following)
+            size += following
+        previous = self.by_end.get(start)
+        if previous is not None:
+            previous_size = start - previous
+            self._remove(previous, previous_size)
+            start, size = previous, size + previous_size
+        self._insert(start, size)
+
+    def largest_free(self):
+        if not self.address_ordered:
+            return self.by_size[-1] >> ADDRESS_BITS if self.by_size else 0
+        if not self.nonempty:
+            return 0
+        return self.class_sizes[self.nonempty.bit_length() - 1][-1] >> ADDRESS_BITS
+
+    def _insert(self, start, size):
+        self.by_start[start] = size
+        self.by_end[start + size] = start
+        self.free_bytes += size
+        if self.address_ordered:
+            cls = size.bit_length()
+            bisect.insort(self.classes[cls], start)
+            bisect.insort(self.class_sizes[cls], size << ADDRESS_BITS | start)
+            self.nonempty |= 1 << cls
+        else:
+            bisect.insort(self.by_size, size << ADDRESS_BITS | start)
+
+    def _remove(self, start, size):
+        del self.by_start[start]
+        del self.by_end[start + size]
+        self.free_bytes -= size
+        if self.address_ordered:
+            cls = size.bit_length()
+            members = self.classes[cls]
+            del members[bisect.bisect_left(members, start)]
+            sizes = self.class_sizes[cls]
+            del sizes[bisect.bisect_left(sizes, size << ADDRESS_BITS | start)]
+            if not members:
+                self.nonempty &= ~(1 << cls)
+        else:
+            by_size = self.by_size
+            del by_size[bisect.bisect_left(by_size, size << ADDRESS_BITS | start)]
+
+    def _lowest_fit(self, size, floor):
+        cls = size.bit_length()
+        classes = self.classes
+        best = None
+        larger = self.nonempty >> (cls + 1)
+        above = cls
+        while larger:
+            low = larger & -larger
+            members = classes[above + low.bit_length()]
+            if floor:
+                i = bisect.bisect_left(members, floor)
+                start = members[i] if i < len(members) else None
+            else:
+                start = members[0]
+            if start is not None and (best is None or start < best):
+                best = start
+            larger ^= low
+        members = classes[cls]
+        first = bisect.bisect_left(members, floor) if floor else 0
+        last = bisect.bisect_left(members, best) if best is not None else len(members)
+        sizes = self.class_sizes[cls]
+        fitting = bisect.bisect_left(sizes, size << ADDRESS_BITS)
+        if len(sizes) - fitting < last - first:
+            for entry in sizes[fitting:]:
+                start = entry & ADDRESS_MASK
+                if start >= floor and (best is None or start < best):
+                    best = start
+            return best
+        by_start = self.by_start
+        for i in range(first, last):
+            start = members[i]
+            if by_start[start] >= size:
+                return start
+        return best
+
+    def _first_fit(self, size):
+        return self._lowest_fit(size, 0)
+
+    def _next_fit(self, size):
+        start = self._lowest_fit(size, self.rover)
+        return start if start is not None else self._lowest_fit(size, 0)
+
+    def _best_fit(self, size):
+        by_size = self.by_size
+        i = bisect.bisect_left(by_size, size << ADDRESS_BITS)
+        return by_size[i] & ADDRESS_MASK if i < len(by_size) else None
+
+    def _worst_fit(self, size):
+        by_size = self.by_size
+        if by_size and by_size[-1] >> ADDRESS_BITS >= size:
+            return by_size[-1] & ADDRESS_MASK
+        return None
+
+
+class BuddyAllocator:
+    def __init__(self, arena, min_order=BUDDY_MIN_ORDER):
+        self.max_order = arena.bit_length() - 1
+        self.min_order = min_order
+        self.arena = 1 << self.max_order
+        self.free_lists = [set() for _ in range(self.max_order + 1)]
+        self.free_lists[self.max_order].add(0)
+        self.nonempty = 1 << self.max_order
+        self.free_bytes = self.arena
+
+    def allocate(self, size):
+        order = max(self.min_order, (size - 1).bit_length())
+        available = self.nonempty >> order << order
+        if not available:
+            return None
+        found = (available & -available).bit_length() - 1
+        start = self._pop(found)
+        while found > order:
+            found -= 1
+            self._push(found, start + (1 << found))
+        self.free_bytes -= 1 << order
+        return start, 1 << order
+
+    def free(self, start, size):
+        self.free_bytes += size
+        order = size.bit_length() - 1
+        while order < self.max_order:
+            buddy = start ^ (1 << order)
+            free_list = self.free_lists[order]
+            if buddy not in free_list:
+                break
+            free_list.remove(buddy)
+            if not free_list:
+                self.nonempty &= ~(1 << order)
+            start &= ~(1 << order)
+            order += 1
+        self._push(order, start)
+
+    def largest_free(self):
+        return 1 << (self.nonempty.bit_length() - 1) if self.nonempty else 0
+
+    def _pop(self, order):
+        free_list = self.free_lists[order]
+        start = free_list.pop()
+        if not free_list:
+            self.nonempty &= ~(1 << order)
+        return start
+
+    def _push(self, order, start):
+        self.free_lists[order].add(start)
+        self.nonempty |= 1 << order
+
+
+class SlabAllocator:
+    def __init__(self, arena):
+        self.pages = BuddyAllocator(arena, min_order=12)
+        self.arena = self.pages.arena
+        self.partial = [set() for _ in SLAB_CLASSES]
+        self.slab_objects = {}
+        self.slack = 0
+
+    @property
+    def free_bytes(self):
+        return self.pages.free_bytes + self.slack
+
+    def allocate(self, size):
+        if size > SLAB_CLASSES[-1]:
+            return self.pages.allocate(size)
+        cls = bisect.bisect_left(SLAB_CLASSES, size)
+        object_size = SLAB_CLASSES[cls]
+        partial = self.partial[cls]
+        if not partial:
+            slab = self.pages.allocate(SLAB_SIZE)
+            if slab is None:
+                return None
+            base = slab[0]
+            capacity = SLAB_SIZE // object_size
+            self.slab_objects[base] = list(range(base + (capacity - 1) * object_size, base - 1, -object_size))
+            self.slack += capacity * object_size
+            partial.add(base)
+        base = next(iter(partial))
+        objects = self.slab_objects[base]
+        start = objects.pop()
+        if not objects:
+            partial.discard(base)
+        self.slack -= object_size
+        return start, object_size
+
+    def free(self, start, size):
+        if size > SLAB_CLASSES[-1]:
+            self.pages.free(start, size)
+            return
+        cls = bisect.bisect_left(SLAB_CLASSES, size)
+        base = start & -SLAB_SIZE
+        objects = self.slab_objects[base]
+        objects.append(start)
+        self.slack += size
+        self.partial[cls].add(base)
+        capacity = SLAB_SIZE // size
+        if len(objects) == capacity:
+            self.partial[cls].discard(base)
+            del self.slab_objects[base]
+            self.slack -= capacity * size
+            self.pages.free(base, SLAB_SIZE)
+
+    def largest_free(self):
+        return self.pages.largest_free()
+
+
+def make_allocator(policy, arena=DEFAULT_ARENA):
+    if policy == 'buddy':
+        return BuddyAllocator(arena)
+    if policy == 'slab':
+        return SlabAllocator(arena)
+    return FreeListAllocator(arena, policy)
+
+
+def external_fragmentation(free_bytes, largest_free):
+    return 1.0 - largest_free / free_bytes if free_bytes else 0.0
+
+
+class SimulationResult:
+    __slots__ = ('policy', 'arena', 'operations', 'frames', 'frame_ops', 'timeline', 'failures')
+
+    def __init__(self, policy, arena, operations, frames, frame_ops, timeline, failures):
+        self.policy = policy
+        self.arena = arena
+        self.operations = operations
+        self.frames = frames
+        self.frame_ops = frame_ops
+        self.timeline = timeline
+        self.failures = failures
+
+
+def simulate(trace, policy, arena=DEFAULT_ARENA, segment_type='heap'):
+    allocator = make_allocator(policy, arena)
+    allocate, free = allocator.allocate, allocator.free
+    arena = allocator.arena
+    count = len(trace)
+    sample_ops = max(1, -(-count // MAX_TIMELINE_POINTS))
+    frame_ops = sample_ops * max(1, -(-count // (sample_ops * MAX_FRAMES)))
+    ops, trace_ids, sizes, pids = (trace[name].tolist() for name in ('op', 'id', 'size', 'pid'))
+    segment_ids = itertools.count()
+    frames, timeline = [], []
+    live, added, removed = {}, {}, []
+    failures = 0
+    for chunk_start in range(0, count, sample_ops):
+        chunk_end = min(chunk_start + sample_ops, count)
+        for op, trace_id, size, pid in zip(ops[chunk_start:chunk_end], trace_ids[chunk_start:chunk_end],
+                                           sizes[chunk_start:chunk_end], pids[chunk_start:chunk_end]):
+            block = live.pop(trace_id, None)
+            if block is not None:
+                free(block[0], block[1])
+                if added.pop(block[2], None) is None:
+                    removed.append(block[2])
+            if op == OP_ALLOC:
+                allocation = allocate(size)
+                if allocation is None:
+                    failures += 1
+                    continue
+                segment_id = next(segment_ids)
+                live[trace_id] = allocation + (segment_id,)
+                added[segment_id] = allocation + (pid,)
+        free_bytes = allocator.free_bytes
+        largest = allocator.largest_free()
+        fragmentation = external_fragmentation(free_bytes, largest)
+        timeline.append((chunk_end, arena - free_bytes, free_bytes, largest, fragmentation, failures))
+        if chunk_end % frame_ops == 0 or chunk_end == count:
+            rows = [(segment_id, start, size, segment_type, pid)
+                    for segment_id, (start, size, pid) in added.items()]
+            frames.append(SegmentationDelta(
+                float(chunk_end), np.array(rows, dtype=SEGMENT_DTYPE) if rows else empty_segments(),
+                empty_segments(), np.array(removed, dtype=np.int64), not frames, arena,
+                fragmentation))
+            added, removed = {}, []
+    return SimulationResult(policy, arena, count, frames, frame_ops,
+                            np.array(timeline, dtype=TIMELINE_DTYPE), failures)
@@ -0,0 +1,6 @@
+import numpy as np
+
+
+def as_void(rows):
+    rows = np.ascontiguousarray(rows)
+    return rows.view(np.dtype((np.void, rows.dtype.itemsize)))
@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def minmax_decimate(x, y, n_bins):
+    n = len(x)
+    if n <= 2 * n_bins:
+        return x, y
+    bin_size = n // n_bins
+    usable = bin_size * n_bins
+    bins = y[:usable].reshape(n_bins, bin_size)
+    offsets = np.arange(n_bins) * bin_size
+    lo = offsets + np.argmin(bins, axis=1)
+    hi = offsets + np.argmax(bins, axis=1)
+    idx = np.unique(np.concatenate([lo, hi, np.arange(usable, n)]))
+    return x[idx], y[idx]
+
+
+def downsample(x, y, width):
+    return minmax_decimate(x, y, max(width, 1))
@@ -0,0 +1,108 @@
+import os
+import numpy as np
+from components.procfs import DEFAULT_PROC_ROOT, read_bytes
+
+COSTLY_ORDER = 3
+ZONE_ORDERS = 16
+
+ZONE_DTYPE = np.dtype([
+    ('node', np.int32),
+    ('zone', 'U8'),
+    ('migrate_type', 'U12'),
+    ('orders', np.uint8),
+    ('free_blocks', np.int64, (ZONE_ORDERS,)),
+    ('fragmentation_index', np.float64, (ZONE_ORDERS,)),
+    ('unusable_index', np.float64, (ZONE_ORDERS,)),
+])
+
+
+def parse_buddyinfo(data):
+    zones = []
+    for line in data.splitlines():
+        head, _, counts = line.partition(b'zone')
+        if not counts:
+            continue
+        node = int(head.split()[1].rstrip(b','))
+        zone, *counts = counts.split()
+        zones.append((node, zone.decode(), '', np.array(counts, dtype=np.int64)))
+    return zones
+
+
+def parse_pagetypeinfo(data):
+    zones = []
+    in_free_counts = False
+    for line in data.splitlines():
+        if line.startswith(b'Free pages count per migrate type'):
+            in_free_counts = True
+            continue
+        if not in_free_counts:
+            continue
+        if not line.startswith(b'Node'):
+            break
+        location, _, counts = line.partition(b'type')
+        fields = location.replace(b',', b' ').split()
+        migrate_type, *counts = counts.split()
+        zones.append((int(fields[1]), fields[3].decode(), migrate_type.decode(),
+                      np.array(counts, dtype=np.int64)))
+    return zones
+
+
+def fragmentation_index(counts):
+    orders = np.arange(len(counts))
+    free_blocks = counts.sum()
+    free_pages = (counts << orders).sum()
+    if not free_blocks:
+        return np.zeros(len(counts))
+    requested = 1 << orders
+    suitable = np.array([(counts[order:] << (orders[order:] - order)).sum() for order in orders])
+    index = (1000 - (1000 + free_pages * 1000 // requested) // free_blocks) / 1000
+    return np.where(suitable > 0, -1.0, np.clip(index, 0.0, 1.0))
+
+
+def unusable_index(counts):
+    orders = np.arange(len(counts))
+    free_pages = (counts << orders).sum()
+    if not free_pages:
+        return np.zeros(len(counts))
+    usable = np.cumsum((counts << orders)[::-1])[::-1]
+    return (free_pages - usable) / free_pages
+
+
+def empty_zones():
+    return np.empty(0, dtype=ZONE_DTYPE)
+
+
+def zone_rows(zones):
+    rows = np.zeros(len(zones), dtype=ZONE_DTYPE)
+    for i, (node, zone, migrate_type, counts) in enumerate(zones):
+        counts = counts[:ZONE_ORDERS]
+        orders = len(counts)
+        rows['node'][i], rows['zone'][i], rows['migrate_type'][i], rows['orders'][i] = node, zone, migrate_type, orders
+        rows['free_blocks'][i, :orders] = counts
+        rows['fragmentation_index'][i, :orders] = fragmentation_index(counts)
+        rows['unusable_index'][i, :orders] = unusable_index(counts)
+    return rows
+
+
+class FragmentationEngine:
+    def __init__(self, proc_root=DEFAULT_PROC_ROOT):
+        self.buddyinfo_path = os.path.join(proc_root, 'buddyinfo')
+        self.pagetypeinfo_path = os.path.join(proc_root, 'pagetypeinfo')
+
+    def zones(self):
+        try:
+            zones = parse_buddyinfo(read_bytes(self.buddyinfo_path))
+        except (FileNotFoundError, PermissionError):
+            return empty_zones()
+        try:
+            zones += [zone for zone in parse_pagetypeinfo(read_bytes(self.pagetypeinfo_path)) if zone[3].any()]
+        except (FileNotFoundError, PermissionError):
+            pass
+        return zone_rows(zones)
+
+
+def system_fragmentation(zones, order=COSTLY_ORDER):
+    buddy = zones[zones['migrate_type'] == '']
+    if not len(buddy):
+        return 0.0
+    return float(unusable_index(buddy['free_blocks'].sum(axis=0))[order])
@@ -0,0 +1,100 @@
+import bisect
+import heapq
+from collections import Counter
+import numpy as np
+
+HOLE_BUCKETS = 48
+
+
+def hole_bucket(size):
+    return min(int(size).bit_length(), HOLE_BUCKETS - 1)
+
+
+class IntervalIndex:
+    def __init__(self):
+        self.starts = {}
+        self.ends = {}
+        self.histogram = np.zeros(HOLE_BUCKETS, dtype=np.int64)
+        self.hole_count = 0
+        self.hole_total = 0
+        self._hole_heap = []
+        self._stale_holes = Counter()
+
+    def clear(self):
+        self.__init__()
+
+    def insert(self, pid, start, end):
+        starts = self.starts.setdefault(pid, [])
+        ends = self.ends.setdefault(pid, {})
+        if start in ends:
+            self.resize(pid, start, end)
+            return
+        i = bisect.bisect_left(starts, start)
+        prev_end = ends[starts[i - 1]] if i else None
+        next_start = starts[i] if i < len(starts) else None
+        if prev_end is not None and next_start is not None:
+            self._drop_hole(next_start - prev_end)
+        if prev_end is not None:
+            self._add_hole(start - prev_end)
+        if next_start is not None:
+            self._add_hole(next_start - end)
+        starts.insert(i, start)
+        ends[start] = end
+
+    def remove(self, pid, start):
+        starts = self.starts.get(pid)
+        if not starts or start not in self.ends[pid]:
+            return
+        ends = self.ends[pid]
+        i = bisect.bisect_left(starts, start)
+        end = ends.pop(start)
+        del starts[i]
+        prev_end = ends[starts[i - 1]] if i else None
+        next_start = starts[i] if i < len(starts) else None
+        if prev_end is not None:
+            self._drop_hole(start - prev_end)
+        if next_start is not None:
+            self._drop_hole(next_start - end)
+        if prev_end is not None and next_start is not None:
+            self._add_hole(next_start - prev_end)
+        if not starts:
+            del self.starts[pid], self.ends[pid]
+
+    def resize(self, pid, start, end):
+        ends = self.ends.get(pid)
+        if not ends or start not in ends:
+            self.insert(pid, start, end)
+            return
+        starts = self.starts[pid]
+        i = bisect.bisect_right(starts, start)
+        if i < len(starts):
+            self._drop_hole(starts[i] - ends[start])
+            self._add_hole(starts[i] - end)
+        ends[start] = end
+
+    def largest_hole(self):
+        heap = self._hole_heap
+        while heap and self._stale_holes[-heap[0]]:
+            self._stale_holes[-heapq.heappop(heap)] -= 1
+        return -heap[0] if heap else 0
+
+    def _add_hole(self, size):
+        if size <= 0:
+            return
+        self.histogram[hole_bucket(size)] += 1
+        self.hole_count += 1
+        self.hole_total += size
+        heapq.heappush(self._hole_heap, -size)
+
+    def _drop_hole(self, size):
+        if size <= 0:
+            return
+        self.histogram[hole_bucket(size)] -= 1
+        self.hole_count -= 1
+        self.hole_total -= size
+        self._stale_holes[size] += 1
+        if len(self._hole_heap) > 2 * self.hole_count + 64:
+            live = Counter(-size for size in self._hole_heap) - self._stale_holes
+            self._hole_heap = [-size for size in live.elements()]
+            heapq.heapify(self._hole_heap)
+            self._stale_holes.clear()
@@ -0,0 +1,43 @@
+import functools
+import importlib
+from PyQt5.QtWidgets import QWidget, QVBoxLayout
+from PyQt5.QtCore import pyqtSignal
+
+
+class LazyTab(QWidget):
+    built = pyqtSignal(object)
+
+    def __init__(self, module, class_name, args=(), feeds=()):
+        super().__init__()
+        self.module = module
+        self.class_name = class_name
+        self.args = args
+        self.feeds = feeds
+        self.view = None
+        self.backlog = {}
+        self.layout = QVBoxLayout()
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.setLayout(self.layout)
+        self.holders = []
+        for signal, ingest, merge in feeds:
+            holder = functools.partial(self.hold, ingest, merge)
+            signal.connect(holder)
+            self.holders.append((signal, holder))
+
+    def hold(self, ingest, merge, payload):
+        previous = self.backlog.get(ingest)
+        self.backlog[ingest] = merge(previous, payload) if merge and previous is not None else payload
+
+    def ensure(self):
+        if self.view is None:
+            for signal, holder in self.holders:
+                signal.disconnect(holder)
+            self.holders.clear()
+            view_class = getattr(importlib.import_module(self.module), self.class_name)
+            self.view = view_class(*self.args)
+            self.layout.addWidget(self.view)
+            for ingest, payload in self.backlog.items():
+                getattr(self.view, ingest)(payload)
+            self.backlog.clear()
+            self.built.emit(self.view)
+        return self.view
@@ -0,0 +1,35 @@
+import threading
+from PyQt5.QtCore import QObject, Qt, pyqtSignal
+
+
+class SampleMailbox(QObject):
+    ready = pyqtSignal()
+
+    def __init__(self, signals, merges=None, parent=None):
+        super().__init__(parent)
+        self.signals = signals
+        self.merges = merges or {}
+        self.pending = {}
+        self.scheduled = False
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.ready.connect(self.deliver, Qt.QueuedConnection)
+
+    def post(self, kind, payload):
+        with self.lock:
+            if kind in self.pending:
+                merge = self.merges.get(kind)
+                payload = merge(self.pending[kind], payload) if merge else payload
+                self.dropped += 1
+            self.pending[kind] = payload
+            if self.scheduled:
+                return
+            self.scheduled = True
+        self.ready.emit()
+
+    def deliver(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.scheduled = False
+        for kind, payload in pending.items():
+            self.signals[kind].emit(payload)
@@ -1,16 +1,56 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar
-from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QComboBox, QTableView
+from PyQt5.QtCore import Qt, pyqtSignal
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.ticker import FuncFormatter, MultipleLocator
 import numpy as np
+import time
+from collections import deque
+from components.metric_history import MetricHistory
+from components.downsample import downsample
+from components.table_model import StructuredTableModel
+from components.process_collector import UNAVAILABLE
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+MEMORY_LABELS = ['Used', 'Free', 'Available']
+BAR_WIDTH = 0.35
+RENDER_HISTORY = 300
+HISTORY_WINDOWS = [('60 s', 60, 10), ('10 min', 600, 120), ('1 h', 3600, 600), ('24 h', 86400, 14400)]
+HISTORY_SERIES = [('used', 'Used', '#4CAF50'), ('free', 'Free', '#9E9E9E'),
+                  ('available', 'Available', '#FF9800'), ('swap_used', 'Swap Used', '#2196F3')]
+
+
+def format_age(seconds, pos=None):
+    seconds = abs(seconds)
+    if seconds >= 3600:
+        return f'-{seconds / 3600:g}h'
+    if seconds >= 60:
+        return f'-{seconds / 60:g}m'
+    return f'-{seconds:g}s' if seconds else 'now'
+
+
+def format_mb(value):
+    if value == UNAVAILABLE:
+        return 'n/a'
+    return f'{value / MB:.1f} MB'
 
 class MemoryView(QWidget):
+    dirty = pyqtSignal()
+
     def __init__(self, system_monitor):
         super().__init__()
         self.system_monitor = system_monitor
         self.current_style = 'default'
+        self.memory_info = None
+        self.process_info = None
+        self.background = None
+        self.render_times = deque(maxlen=RENDER_HISTORY)
+        self.history = MetricHistory()
+        self.history_window = HISTORY_WINDOWS[0][1]
         self.init_ui()
-        self.system_monitor.memory_updated.connect(self.update_memory_info)
+        self.system_monitor.memory_updated.connect(self.ingest_memory_info)
+        self.system_monitor.processes_updated.connect(self.ingest_process_info)
 
     def init_ui(self):
         self.layout = QVBoxLayout()
@@ -28,50 +68,178 @@ class MemoryView(QWidget):
         self.swap_progress.setFormat("Swap Usage: %p%")
         self.layout.addWidget(self.swap_progress)
         
-        self.figure, self.ax = plt.subplots(figsize=(10, 6))
+        self.window_layout = QHBoxLayout()
+        self.window_layout.addStretch()
+        self.window_layout.addWidget(QLabel("History window:"))
+        self.window_combo = QComboBox()
+        self.window_combo.addItems([label for label, _, _ in HISTORY_WINDOWS])
+        self.window_combo.currentIndexChanged.connect(self.set_history_window)
+        self.window_layout.addWidget(self.window_combo)
+        self.layout.addLayout(self.window_layout)
+        
+        self.figure, (self.ax, self.history_ax) = plt.subplots(2, 1, figsize=(10, 8))
+        self.figure.subplots_adjust(hspace=0.45)
         self.canvas = FigureCanvas(self.figure)
         self.layout.addWidget(self.canvas)
+        self.init_plot()
+        self.canvas.mpl_connect('draw_event', self.on_draw)
+        
+        self.process_model = StructuredTableModel([
+            ('PID', 'pid', lambda process: str(process['pid'])),
+            ('Name', 'name', lambda process: process['name']),
+            ('RSS', 'rss', lambda process: format_mb(process['rss'])),
+            ('PSS', 'pss', lambda process: format_mb(process['pss'])),
+            ('USS', 'uss', lambda process: format_mb(process['uss'])),
+            ('Swap', 'swap', lambda process: format_mb(process['swap'])),
+        ], self)
+        self.process_table = QTableView()
+        self.process_table.setModel(self.process_model)
+        self.process_table.setSortingEnabled(True)
+        self.process_table.sortByColumn(3, Qt.DescendingOrder)
+        self.process_table.setMaximumHeight(220)
+        self.layout.addWidget(self.process_table)
         
         self.setLayout(self.layout)
 
+    def init_plot(self):
+        x = np.arange(len(MEMORY_LABELS))
+        zeros = np.zeros(len(MEMORY_LABELS))
+        self.ram_bars = self.ax.bar(x - BAR_WIDTH/2, zeros, BAR_WIDTH, label='RAM', color='#4CAF50', animated=True)
+        self.swap_bars = self.ax.bar(x + BAR_WIDTH/2, zeros, BAR_WIDTH, label='Swap', color='#2196F3', animated=True)
+        self.value_texts = [self.ax.text(bar.get_x() + bar.get_width()/2, 0, '', ha='center', va='bottom',
+                                         fontsize=9, animated=True)
+                            for bar in list(self.ram_bars) + list(self.swap_bars)[:2]]
+        self.history_lines = {metric: self.history_ax.plot([], [], label=label, color=color,
+                                                           linewidth=1.2, animated=True)[0]
+                              for metric, label, color in HISTORY_SERIES}
+        self.animated_artists = (list(self.ram_bars) + list(self.swap_bars) + self.value_texts +
+                                 list(self.history_lines.values()))
+        
+        self.ax.set_ylabel('GB', fontsize=12)
+        self.ax.set_title('Memory Allocation', fontsize=14, pad=15)
+        self.ax.set_xticks(x)
+        self.ax.set_xticklabels(MEMORY_LABELS, fontsize=10)
+        self.ax.set_ylim(0, 1)
+        self.ax.legend(fontsize=10)
+        self.ax.grid(True, linestyle='--', alpha=0.7)
+        self.ax.set_axisbelow(True)
+        
+        self.history_ax.set_ylabel('GB', fontsize=12)
+        self.history_ax.set_title('Memory History', fontsize=14, pad=15)
+        self.history_ax.set_xlim(-self.history_window, 0)
+        self.history_ax.xaxis.set_major_locator(MultipleLocator(HISTORY_WINDOWS[0][2]))
+        self.history_ax.set_ylim(0, 1)
+        self.history_ax.xaxis.set_major_formatter(FuncFormatter(format_age))
+        self.history_ax.legend(fontsize=9, loc='upper left', ncol=len(HISTORY_SERIES))
+        self.history_ax.grid(True, linestyle='--', alpha=0.7)
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.figure.bbox)
+        for artist in self.animated_artists:
+            self.figure.draw_artist(artist)
+
+    def set_history_window(self, index):
+        _, self.history_window, tick_step = HISTORY_WINDOWS[index]
+        self.history_ax.set_xlim(-self.history_window, 0)
+        self.history_ax.xaxis.set_major_locator(MultipleLocator(tick_step))
+        self.background = None
+        self.dirty.emit()
+
+    def render_stats(self):
+        if not self.render_times:
+            return {'count': 0, 'mean_ms': 0.0, 'p99_ms': 0.0, 'max_ms': 0.0}
+        times = np.array(self.render_times) * 1000
+        return {
+            'count': len(times),
+            'mean_ms': float(times.mean()),
+            'p99_ms': float(np.percentile(times, 99)),
+            'max_ms': float(times.max())
+        }
+
     def update_theme(self, style):
         self.current_style = style
-        self.update_memory_info(self.system_monitor.get_memory_info())
+        dark = style == 'dark_background'
+        text_color = 'white' if dark else 'black'
+        face_color = '#2B2B2B' if dark else '#FFFFFF'
+        self.figure.patch.set_facecolor(face_color)
+        for ax in (self.ax, self.history_ax):
+            ax.set_facecolor(face_color)
+            ax.yaxis.label.set_color(text_color)
+            ax.title.set_color(text_color)
+            ax.tick_params(colors=text_color)
+            for spine in ax.spines.values():
+                spine.set_color(text_color)
+            ax.grid(True, linestyle='--', alpha=0.7, color='#666666' if dark else '#CCCCCC')
+            legend = ax.get_legend()
+            legend.get_frame().set_facecolor('#3C3C3C' if dark else '#FFFFFF')
+            for text in legend.get_texts():
+                text.set_color(text_color)
+        for text in self.value_texts:
+            text.set_color(text_color)
+        self.background = None
+        self.dirty.emit()
+
+    def ingest_memory_info(self, memory_info):
+        self.memory_info = memory_info
+        self.history.append(memory_info.timestamp, memory_info)
+        self.dirty.emit()
+
+    def ingest_process_info(self, process_info):
+        self.process_info = process_info
+        self.dirty.emit()
 
     def update_memory_info(self, memory_info):
-        self.ram_progress.setValue(int(memory_info['percent']))
-        self.swap_progress.setValue(int(memory_info['swap_percent']))
-        
-        plt.style.use(self.current_style)
-        self.figure.patch.set_facecolor('#2B2B2B' if self.current_style == 'dark_background' else '#FFFFFF')
-        self.ax.clear()
-        self.ax.set_facecolor('#2B2B2B' if self.current_style == 'dark_background' else '#FFFFFF')
-        
-        labels = ['Used', 'Free', 'Available']
-        ram_values = [memory_info['used'] / (1024 ** 3), 
-                     memory_info['free'] / (1024 ** 3), 
-                     memory_info['available'] / (1024 ** 3)]
-        swap_values = [memory_info['swap_used'] / (1024 ** 3), 
-                      memory_info['swap_free'] / (1024 ** 3), 
-                      0]
-        
-        x = np.arange(len(labels))
-        width = 0.35
+        self.memory_info = memory_info
+        self.history.append(memory_info.timestamp, memory_info)
+        self.render()
+
+    def render(self):
+        if self.process_info is not None:
+            self.process_model.set_array(self.process_info.processes)
+            self.process_info = None
+        memory_info = self.memory_info
+        if memory_info is None:
+            self.canvas.draw()
+            return
+        start = time.perf_counter()
+        self.ram_progress.setValue(int(memory_info.percent))
+        self.swap_progress.setValue(int(memory_info.swap_percent))
         
-        self.ax.bar(x - width/2, ram_values, width, label='RAM', color='#4CAF50')
-        self.ax.bar(x + width/2, swap_values, width, label='Swap', color='#2196F3')
+        ram_values = [memory_info.used / GB, memory_info.free / GB, memory_info.available / GB]
+        swap_values = [memory_info.swap_used / GB, memory_info.swap_free / GB, 0]
+        for bar, value in zip(list(self.ram_bars) + list(self.swap_bars), ram_values + swap_values):
+            bar.set_height(value)
+        for text, value in zip(self.value_texts, ram_values + swap_values[:2]):
+            text.set_visible(value > 0)
+            text.set_y(value)
+            text.set_text(f'{value:.2f}')
+        self.update_history_lines()
         
-        text_color = 'white' if self.current_style == 'dark_background' else 'black'
-        self.ax.set_ylabel('GB', fontsize=12, color=text_color)
-        self.ax.set_title('Memory Allocation', fontsize=14, pad=15, color=text_color)
-        self.ax.set_xticks(x)
-        self.ax.set_xticklabels(labels, fontsize=10, color=text_color)
-        self.ax.legend(fontsize=10)
+        ceiling = max(memory_info.total, memory_info.swap_total) / GB * 1.15
+        if abs(self.ax.get_ylim()[1] - ceiling) > 1e-6:
+            self.ax.set_ylim(0, ceiling)
+            self.history_ax.set_ylim(0, ceiling)
+            self.background = None
         
-        for i, v in enumerate(ram_values + swap_values[:2]):
-            if v > 0:
-                self.ax.text(i % 3 + (i // 3 - 0.5) * width, v, f'{v:.2f}',
-                            ha='center', va='bottom', fontsize=9, color=text_color)
+        if self.background is None:
+            self.canvas.draw()
+        else:
+            self.canvas.restore_region(self.background)
+            for artist in self.animated_artists:
+                self.figure.draw_artist(artist)
+            self.canvas.blit(self.figure.bbox)
         
-        self.ax.grid(True, linestyle='--', alpha=0.7, color='#666666' if self.current_style == 'dark_background' else '#CCCCCC')
-        self.canvas.draw()
+        self.render_times.append(time.perf_counter() - start)
+        stats = self.render_stats()
+        self.canvas.setToolTip(f"Render time: {stats['mean_ms']:.1f} ms mean, "
+                               f"{stats['p99_ms']:.1f} ms p99 over {stats['count']} ticks")
+
+    def update_history_lines(self):
+        timestamps, columns = self.history.window(self.history_window)
+        if not len(timestamps):
+            return
+        ages = timestamps - timestamps[-1]
+        width = max(int(self.history_ax.bbox.width), 3)
+        for metric, line in self.history_lines.items():
+            x, y = downsample(ages, columns[metric], width)
+            line.set_data(x, y / GB)
@@ -0,0 +1,58 @@
+import numpy as np
+
+HISTORY_METRICS = ('used', 'free', 'available', 'swap_used')
+DEFAULT_CAPACITY = 3 * 24 * 3600
+
+
+class MetricHistory:
+    def __init__(self, metrics=HISTORY_METRICS, capacity=DEFAULT_CAPACITY):
+        self.metrics = tuple(metrics)
+        self.capacity = capacity
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.columns = {name: np.zeros(capacity, dtype=np.float32) for name in self.metrics}
+        self.head = 0
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def append(self, timestamp, sample):
+        if self.count and timestamp < self.latest_timestamp():
+            self.clear()
+        self.timestamps[self.head] = timestamp
+        for name, column in self.columns.items():
+            column[self.head] = getattr(sample, name, np.nan)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def latest_timestamp(self):
+        return self.timestamps[self.head - 1] if self.count else None
+
+    def window(self, seconds, end=None):
+        if not self.count:
+            return np.empty(0), {name: np.empty(0, dtype=np.float32) for name in self.metrics}
+        if end is None:
+            end = self.latest_timestamp()
+        start = end - seconds
+        if self.count < self.capacity or self.head == 0:
+            segments = [slice(0, self.count)]
+        else:
+            segments = [slice(self.head, self.capacity), slice(0, self.head)]
+        selected = []
+        for segment in segments:
+            times = self.timestamps[segment]
+            lo = np.searchsorted(times, start, side='left')
+            hi = np.searchsorted(times, end, side='right')
+            if hi > lo:
+                selected.append(slice(segment.start + lo, segment.start + hi))
+        if len(selected) == 1:
+            part = selected[0]
+            return self.timestamps[part], {name: column[part] for name, column in self.columns.items()}
+        timestamps = np.concatenate([self.timestamps[part] for part in selected]) if selected else np.empty(0)
+        return timestamps, {name: np.concatenate([column[part] for part in selected]) if selected
+                            else np.empty(0, dtype=np.float32)
+                            for name, column in self.columns.items()}
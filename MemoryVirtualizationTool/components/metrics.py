@@ -0,0 +1,150 @@
+import bisect
+import json
+import os
+import threading
+import time
+import psutil
+
+METRIC_PREFIX = 'memviz_'
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def format_labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ''
+    return '{' + ','.join(f'{key}="{value}"' for key, value in items) + '}'
+
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += value
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.count, self.total
+
+    def merge(self, other):
+        counts, count, total = other.snapshot()
+        with self.lock:
+            self.counts = [mine + theirs for mine, theirs in zip(self.counts, counts)]
+            self.count += count
+            self.total += total
+
+    def quantile(self, q):
+        counts, count, _ = self.snapshot()
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for index, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[index - 1] if index else 0.0
+                return lower + (self.buckets[index] - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.histograms = {}
+        self.gauges = {}
+        self.kinds = {}
+        self.help = {}
+        self.lock = threading.Lock()
+
+    def histogram(self, name, help, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(key, Histogram(buckets))
+                self.kinds[name] = 'histogram'
+                self.help[name] = help
+        return histogram
+
+    def gauge(self, name, help, read, kind='gauge', **labels):
+        with self.lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = read
+            self.kinds[name] = kind
+            self.help[name] = help
+
+    def merged(self, name):
+        combined = None
+        for (metric, _), histogram in list(self.histograms.items()):
+            if metric == name:
+                if combined is None:
+                    combined = Histogram(histogram.buckets)
+                combined.merge(histogram)
+        return combined or Histogram()
+
+    def read_gauges(self, name):
+        values = []
+        for (metric, labels), read in list(self.gauges.items()):
+            if metric == name:
+                try:
+                    values.append((labels, float(read())))
+                except (ProcessLookupError, psutil.Error):
+                    continue
+        return values
+
+    def prometheus_text(self):
+        lines = []
+        for name in sorted(self.kinds):
+            kind = self.kinds[name]
+            lines.append(f'# HELP {METRIC_PREFIX}{name} {self.help[name]}')
+            lines.append(f'# TYPE {METRIC_PREFIX}{name} {kind}')
+            if kind != 'histogram':
+                for labels, value in self.read_gauges(name):
+                    lines.append(f'{METRIC_PREFIX}{name}{format_labels(labels)} {value:g}')
+                continue
+            for (metric, labels), histogram in sorted(self.histograms.items()):
+                if metric != name:
+                    continue
+                counts, count, total = histogram.snapshot()
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{METRIC_PREFIX}{name}_bucket{format_labels(labels, [("le", bound)])} {cumulative}')
+                lines.append(f'{METRIC_PREFIX}{name}_sum{format_labels(labels)} {total:g}')
+                lines.append(f'{METRIC_PREFIX}{name}_count{format_labels(labels)} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        histograms = {}
+        for (name, labels), histogram in sorted(self.histograms.items()):
+            counts, count, total = histogram.snapshot()
+            histograms.setdefault(name, []).append({
+                'labels': dict(labels), 'count': count, 'sum': total,
+                'p50': histogram.quantile(0.5), 'p99': histogram.quantile(0.99),
+                'buckets': list(zip(histogram.buckets + ('+Inf',), counts))
+            })
+        gauges = {name: [{'labels': dict(labels), 'value': value} for labels, value in self.read_gauges(name)]
+                  for name, kind in sorted(self.kinds.items()) if kind != 'histogram'}
+        return json.dumps({'timestamp': time.time(), 'histograms': histograms, 'gauges': gauges})
+
+
+def register_process_metrics(registry):
+    process = psutil.Process(os.getpid())
+    registry.gauge('process_cpu_seconds_total', "CPU time used by the monitor process", time.process_time,
+                   kind='counter')
+    registry.gauge('process_resident_memory_bytes', "Resident set size of the monitor process",
+                   lambda: process.memory_info().rss)
+    registry.gauge('process_threads', "Threads in the monitor process", threading.active_count)
+
+
+REGISTRY = MetricsRegistry()
+register_process_metrics(REGISTRY)
@@ -0,0 +1,112 @@
+import numpy as np
+
+PYRAMID_SHIFT = 3
+DEFAULT_SLOTS = 10
+STATE_PRESENT = 0x1
+STATE_SWAPPED = 0x2
+STATE_DIRTY = 0x4
+STATE_CHANNELS = ('present', 'swapped', 'dirty')
+CODE_SHIFT = 8
+SLOT_SHIFT = 3
+
+
+def page_codes(keys, slots, states):
+    return (keys.astype(np.uint64) << np.uint64(CODE_SHIFT)) | \
+        (slots.astype(np.uint64) << np.uint64(SLOT_SHIFT)) | states.astype(np.uint64)
+
+
+class PagePyramid:
+    def __init__(self, slots=DEFAULT_SLOTS, shift=PYRAMID_SHIFT):
+        self.slots = slots
+        self.shift = shift
+        self.channels = len(STATE_CHANNELS) + slots
+        self.codes = np.empty(0, dtype=np.uint64)
+        self.multiplicity = np.empty(0, dtype=np.int64)
+        self.levels = [(np.empty(0, dtype=np.int64), np.empty((0, self.channels), dtype=np.uint32))]
+
+    def update(self, keys, slots, states):
+        codes, multiplicity = np.unique(page_codes(keys, slots, states), return_counts=True)
+        merged, inverse = np.unique(np.concatenate([self.codes, codes]), return_inverse=True)
+        weights = np.concatenate([-self.multiplicity, multiplicity])
+        delta = np.bincount(inverse, weights, minlength=len(merged)).astype(np.int64)
+        changed = delta != 0
+        self.codes, self.multiplicity = codes, multiplicity.astype(np.int64)
+        if not changed.any():
+            return False
+        self._extend(int(keys.max()) if len(keys) else 0)
+        buckets, deltas = self._page_deltas(merged[changed], delta[changed])
+        for level in range(1, len(self.levels)):
+            buckets, deltas = self._aggregate(buckets >> self.shift, deltas)
+            self._apply(level, buckets, deltas)
+        return True
+
+    def level_for(self, span, budget):
+        level = 0
+        while level + 1 < len(self.levels) and -(-span >> (self.shift * level)) > budget:
+            level += 1
+        return level
+
+    def window(self, level, first, count):
+        out = np.zeros((count, self.channels), dtype=np.uint32)
+        if level == 0:
+            lo = np.searchsorted(self.codes, np.uint64(first) << np.uint64(CODE_SHIFT))
+            hi = np.searchsorted(self.codes, np.uint64(first + count) << np.uint64(CODE_SHIFT))
+            buckets, deltas = self._page_deltas(self.codes[lo:hi], self.multiplicity[lo:hi])
+            out[buckets - first] = deltas
+            return out
+        keys, counts = self.levels[level]
+        lo, hi = np.searchsorted(keys, [first, first + count])
+        out[keys[lo:hi] - first] = counts[lo:hi]
+        return out
+
+    def _page_deltas(self, codes, weights):
+        keys = (codes >> np.uint64(CODE_SHIFT)).astype(np.int64)
+        slots = ((codes >> np.uint64(SLOT_SHIFT)) & np.uint64(0x1f)).astype(np.int64)
+        states = (codes & np.uint64((1 << SLOT_SHIFT) - 1)).astype(np.int64)
+        channels = [np.full(len(codes), len(STATE_CHANNELS)) + slots]
+        rows = [np.arange(len(codes))]
+        values = [weights]
+        for channel, bit in enumerate((STATE_PRESENT, STATE_SWAPPED, STATE_DIRTY)):
+            selected = np.flatnonzero(states & bit)
+            rows.append(selected)
+            channels.append(np.full(len(selected), channel))
+            values.append(weights[selected])
+        return self._aggregate(keys, self._scatter(len(codes), rows, channels, values))
+
+    def _scatter(self, count, rows, channels, values):
+        flat = np.concatenate(rows) * self.channels + np.concatenate(channels)
+        return np.bincount(flat, np.concatenate(values),
+                           minlength=count * self.channels).astype(np.int64).reshape(count, self.channels)
+
+    def _aggregate(self, keys, deltas):
+        buckets, inverse = np.unique(keys, return_inverse=True)
+        if len(buckets) == len(keys):
+            return buckets, deltas
+        summed = np.zeros((len(buckets), self.channels), dtype=np.int64)
+        np.add.at(summed, inverse, deltas)
+        return buckets, summed
+
+    def _apply(self, level, buckets, deltas):
+        keys, counts = self.levels[level]
+        positions = np.searchsorted(keys, buckets)
+        found = positions < len(keys)
+        found[found] = keys[positions[found]] == buckets[found]
+        counts[positions[found]] = (counts[positions[found]] + deltas[found]).astype(np.uint32)
+        if not found.all():
+            keys = np.insert(keys, positions[~found], buckets[~found])
+            counts = np.insert(counts, positions[~found], deltas[~found].astype(np.uint32), axis=0)
+        touched = np.searchsorted(keys, buckets)
+        empty = touched[counts[touched, len(STATE_CHANNELS):].sum(axis=1) == 0]
+        if len(empty):
+            keys = np.delete(keys, empty)
+            counts = np.delete(counts, empty, axis=0)
+        self.levels[level] = (keys, counts)
+
+    def _extend(self, max_key):
+        while len(self.levels) == 1 or max_key >> (self.shift * (len(self.levels) - 1)):
+            if len(self.levels) == 1:
+                level_keys, level_counts = np.empty(0, dtype=np.int64), np.empty((0, self.channels), dtype=np.int64)
+            else:
+                keys, counts = self.levels[-1]
+                level_keys, level_counts = self._aggregate(keys >> self.shift, counts.astype(np.int64))
+            self.levels.append((level_keys, level_counts.astype(np.uint32)))
@@ -0,0 +1,144 @@
+import os
+import numpy as np
+from components.procfs import DEFAULT_PROC_ROOT, proc_path, read_maps
+
+PAGEMAP_ENTRY_SIZE = 8
+CHUNK_PAGES = 1 << 18
+KPAGEFLAGS_GAP = 512
+
+# /proc/<pid>/pagemap entry layout (Documentation/admin-guide/mm/pagemap.rst)
+PM_PFN_MASK = np.uint64((1 << 55) - 1)
+PM_SOFT_DIRTY = np.uint64(1 << 55)
+PM_EXCLUSIVE = np.uint64(1 << 56)
+PM_FILE = np.uint64(1 << 61)
+PM_SWAP = np.uint64(1 << 62)
+PM_PRESENT = np.uint64(1 << 63)
+
+KPF_DIRTY = np.uint64(1 << 4)
+KPF_ACTIVE = np.uint64(1 << 6)
+KPF_HUGE = np.uint64(1 << 17)
+KPF_THP = np.uint64(1 << 22)
+
+PAGE_PRESENT = 0x01
+PAGE_SWAPPED = 0x02
+PAGE_FILE = 0x04
+PAGE_EXCLUSIVE = 0x08
+PAGE_SOFT_DIRTY = 0x10
+PAGE_DIRTY = 0x20
+PAGE_ACTIVE = 0x40
+PAGE_HUGE = 0x80
+
+PAGE_DTYPE = np.dtype([
+    ('vpn', np.uint64),
+    ('pfn', np.uint64),
+    ('pid', np.int32),
+    ('flags', np.uint8),
+])
+
+
+class PagingCollector:
+    def __init__(self, proc_root=DEFAULT_PROC_ROOT, page_size=None):
+        self.proc_root = proc_root
+        self.page_size = page_size or os.sysconf('SC_PAGE_SIZE')
+        self.kpageflags_available = True
+        self._buffer = np.empty(CHUNK_PAGES, dtype=np.uint64)
+
+    def scan_processes(self, pids):
+        scans = [self.scan(pid) for pid in pids]
+        pages = np.concatenate(scans) if scans else np.empty(0, dtype=PAGE_DTYPE)
+        if self.kpageflags_available and pages.size:
+            self._annotate_kpageflags(pages)
+        return pages
+
+    def scan(self, pid):
+        try:
+            regions = read_maps(self.proc_root, pid)
+            fd = os.open(proc_path(self.proc_root, pid, 'pagemap'), os.O_RDONLY)
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            return np.empty(0, dtype=PAGE_DTYPE)
+        parts = []
+        try:
+            for start_vpn, end_vpn in self._vpn_runs(regions):
+                self._scan_run(fd, pid, start_vpn, end_vpn, parts)
+        except (ProcessLookupError, PermissionError):
+            pass
+        finally:
+            os.close(fd)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=PAGE_DTYPE)
+
+    def _vpn_runs(self, regions):
+        runs = []
+        for start, end, perms, _ in regions:
+            if perms.startswith('---'):
+                continue
+            start_vpn, end_vpn = start // self.page_size, end // self.page_size
+            if runs and runs[-1][1] == start_vpn:
+                runs[-1][1] = end_vpn
+            else:
+                runs.append([start_vpn, end_vpn])
+        return runs
+
+    def _scan_run(self, fd, pid, start_vpn, end_vpn, parts):
+        vpn = start_vpn
+        while vpn < end_vpn:
+            count = min(end_vpn - vpn, CHUNK_PAGES)
+            nread = os.preadv(fd, [self._buffer[:count]], vpn * PAGEMAP_ENTRY_SIZE)
+            entries = self._buffer[:nread // PAGEMAP_ENTRY_SIZE]
+            idx = np.flatnonzero(entries & (PM_PRESENT | PM_SWAP))
+            if idx.size:
+                parts.append(self._decode(entries[idx], vpn + idx, pid))
+            if nread < count * PAGEMAP_ENTRY_SIZE:
+                break
+            vpn += count
+
+    def _decode(self, entries, vpns, pid):
+        pages = np.empty(entries.size, dtype=PAGE_DTYPE)
+        present = (entries & PM_PRESENT) != 0
+        pages['vpn'] = vpns
+        pages['pfn'] = np.where(present, entries & PM_PFN_MASK, 0)
+        pages['pid'] = pid
+        flags = present.astype(np.uint8) * PAGE_PRESENT
+        flags |= ((entries & PM_SWAP) != 0).astype(np.uint8) * PAGE_SWAPPED
+        flags |= ((entries & PM_FILE) != 0).astype(np.uint8) * PAGE_FILE
+        flags |= ((entries & PM_EXCLUSIVE) != 0).astype(np.uint8) * PAGE_EXCLUSIVE
+        flags |= ((entries & PM_SOFT_DIRTY) != 0).astype(np.uint8) * PAGE_SOFT_DIRTY
+        pages['flags'] = flags
+        return pages
+
+    def _annotate_kpageflags(self, pages):
+        known = np.flatnonzero(pages['pfn'])
+        if not known.size:
+            return
+        try:
+            fd = os.open(os.path.join(self.proc_root, 'kpageflags'), os.O_RDONLY)
+        except (FileNotFoundError, PermissionError):
+            self.kpageflags_available = False
+            return
+        order = known[np.argsort(pages['pfn'][known], kind='stable')]
+        pfns = pages['pfn'][order]
+        kflags = np.zeros(pfns.size, dtype=np.uint64)
+        gaps = np.flatnonzero(np.diff(pfns) > KPAGEFLAGS_GAP)
+        try:
+            i = 0
+            while i < pfns.size:
+                lo = int(pfns[i])
+                j = int(np.searchsorted(pfns, lo + CHUNK_PAGES, side='left'))
+                k = np.searchsorted(gaps, i, side='left')
+                if k < gaps.size:
+                    j = min(j, int(gaps[k]) + 1)
+                count = int(pfns[j - 1]) - lo + 1
+                nread = os.preadv(fd, [self._buffer[:count]], lo * PAGEMAP_ENTRY_SIZE)
+                offsets = (pfns[i:j] - np.uint64(lo)).astype(np.intp)
+                valid = offsets < nread // PAGEMAP_ENTRY_SIZE
+                kflags[i:j][valid] = self._buffer[offsets[valid]]
+                i = j
+        except PermissionError:
+            self.kpageflags_available = False
+            return
+        finally:
+            os.close(fd)
+        flags = pages['flags'][order]
+        flags |= ((kflags & KPF_DIRTY) != 0).astype(np.uint8) * PAGE_DIRTY
+        flags |= ((kflags & KPF_ACTIVE) != 0).astype(np.uint8) * PAGE_ACTIVE
+        flags |= ((kflags & (KPF_HUGE | KPF_THP)) != 0).astype(np.uint8) * PAGE_HUGE
+        pages['flags'][order] = flags
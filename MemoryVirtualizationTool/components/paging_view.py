@@ -1,18 +1,50 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QFrame
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QLineEdit, QCheckBox, QComboBox
+from PyQt5.QtCore import Qt, pyqtSignal
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.patches import Rectangle
+from matplotlib.colors import ListedColormap, to_hex
+import numpy as np
+from components.paging_collector import PAGE_PRESENT, PAGE_SWAPPED, PAGE_DIRTY
+from components.page_pyramid import PagePyramid, STATE_CHANNELS, STATE_PRESENT, STATE_SWAPPED, STATE_DIRTY
+from components.table_model import StructuredTableModel
+from components.process_legend import ProcessLegend, LEGEND_LIMITS, legend_limit_label
+
+FRAME_MAP_COLUMNS = 1024
+FRAME_MAP_BUDGET = FRAME_MAP_COLUMNS * 256
+MAP_SPACES = ('Physical frames', 'Virtual pages')
+COLOR_MODES = ('Color by owner', 'Color by state')
+COLD_FRAME = 1
+HOT_FRAME = 4
+SWAPPED_CELL = 2
+CLEAN_CELL = 3
+DIRTY_CELL = 4
 
 class PagingView(QWidget):
+    dirty = pyqtSignal()
+
     def __init__(self, system_monitor):
         super().__init__()
         self.system_monitor = system_monitor
         self.current_style = 'default'
-        self.process_cards = {}
+        self.paging_info = None
+        self.pyramid = PagePyramid(len(plt.cm.tab10.colors))
+        self.map_extent = 0
+        self.view_start = 0
+        self.view_span = None
+        self.frame_first = 0
+        self.cell_pages = 1
+        self.pan_origin = None
+        self.frame_window_stale = True
+        self.legend_pids = set()
+        self.page_size = 4096
+        self.working_set = None
         self.init_ui()
-        self.system_monitor.paging_updated.connect(self.update_paging_info)
+        self.system_monitor.paging_updated.connect(self.ingest_paging_info)
+        if hasattr(self.system_monitor, 'working_set_updated'):
+            self.system_monitor.working_set_updated.connect(self.ingest_working_set)
+        else:
+            self.overlay_check.hide()
 
     def init_ui(self):
         self.layout = QVBoxLayout()
@@ -26,97 +58,282 @@ class PagingView(QWidget):
         self.info_label.setAlignment(Qt.AlignCenter)
         self.layout.addWidget(self.info_label)
         
-        self.process_container = QWidget()
-        self.process_layout = QHBoxLayout()
-        self.process_container.setLayout(self.process_layout)
-        self.layout.addWidget(self.process_container)
+        self.process_legend = ProcessLegend([to_hex(color) for color in plt.cm.tab10.colors])
+        self.layout.addWidget(self.process_legend)
+        
+        self.filter_layout = QHBoxLayout()
+        self.pid_filter = QLineEdit()
+        self.pid_filter.setPlaceholderText("Filter by PID")
+        self.pid_filter.textChanged.connect(self.apply_pid_filter)
+        self.filter_layout.addWidget(self.pid_filter)
+        self.legend_limit = QComboBox()
+        self.legend_limit.addItems([legend_limit_label(limit) for limit in LEGEND_LIMITS])
+        self.legend_limit.setCurrentIndex(LEGEND_LIMITS.index(self.process_legend.limit))
+        self.legend_limit.currentIndexChanged.connect(self.change_legend_limit)
+        self.filter_layout.addWidget(self.legend_limit)
+        self.overlay_check = QCheckBox("Hot/cold overlay")
+        self.overlay_check.toggled.connect(self.toggle_overlay)
+        self.filter_layout.addWidget(self.overlay_check)
+        self.space_combo = QComboBox()
+        self.space_combo.addItems(MAP_SPACES)
+        self.space_combo.currentIndexChanged.connect(self.change_map_space)
+        self.filter_layout.addWidget(self.space_combo)
+        self.color_combo = QComboBox()
+        self.color_combo.addItems(COLOR_MODES)
+        self.color_combo.currentIndexChanged.connect(self.change_color_mode)
+        self.filter_layout.addWidget(self.color_combo)
+        self.layout.addLayout(self.filter_layout)
         
-        self.page_table = QTableWidget()
-        self.page_table.setColumnCount(4)
-        self.page_table.setHorizontalHeaderLabels(['Page ID', 'In Physical', 'Physical Address', 'Process ID'])
+        self.page_model = StructuredTableModel([
+            ('Page ID', 'vpn', lambda page: str(page['vpn'])),
+            ('In Physical', 'flags', lambda page: str(bool(page['flags'] & PAGE_PRESENT))),
+            ('Physical Address', 'pfn',
+             lambda page: str(int(page['pfn']) * self.page_size) if page['pfn'] else "None"),
+            ('Process ID', 'pid', lambda page: str(page['pid'])),
+        ], self)
+        self.page_table = QTableView()
+        self.page_table.setModel(self.page_model)
+        self.page_table.setSortingEnabled(True)
+        self.page_table.sortByColumn(-1, Qt.AscendingOrder)
         self.layout.addWidget(self.page_table)
         
         self.figure, self.ax = plt.subplots(figsize=(10, 6))
         self.canvas = FigureCanvas(self.figure)
+        self.canvas.mpl_connect('scroll_event', self.zoom_frame_map)
+        self.canvas.mpl_connect('button_press_event', self.start_pan)
+        self.canvas.mpl_connect('motion_notify_event', self.pan_frame_map)
+        self.canvas.mpl_connect('button_release_event', self.end_pan)
         self.layout.addWidget(self.canvas)
         
+        self.frame_image = self.ax.imshow(np.zeros((1, FRAME_MAP_COLUMNS), dtype=np.uint8),
+                                          cmap=self.frame_colormap(), vmin=0, vmax=len(plt.cm.tab10.colors),
+                                          aspect='auto', interpolation='nearest',
+                                          interpolation_stage='data')
+        self.frame_notice = self.ax.text(0.5, 0.5, '', ha='center', va='center',
+                                         transform=self.ax.transAxes, fontsize=10)
+        self.ax.set_title('Physical Memory Frame Map', fontsize=14, pad=15)
+        self.ax.axis('off')
+        
         self.setLayout(self.layout)
 
+    def frame_colormap(self):
+        bg_color = '#333333' if self.current_style == 'dark_background' else 'lightgray'
+        return ListedColormap([bg_color] + list(plt.cm.tab10.colors))
+
     def update_theme(self, style):
         self.current_style = style
-        self.update_paging_info(self.system_monitor.get_paging_info())
+        dark = style == 'dark_background'
+        text_color = 'white' if dark else 'black'
+        self.figure.patch.set_facecolor('#2B2B2B' if dark else '#FFFFFF')
+        self.frame_image.set_cmap(self.frame_colormap())
+        self.ax.title.set_color(text_color)
+        self.frame_notice.set_color(text_color)
+        self.process_legend.set_dark(dark)
+        self.legend_pids = None
+        self.dirty.emit()
+
+    def ingest_paging_info(self, paging_info):
+        self.paging_info = paging_info
+        self.dirty.emit()
+
+    def ingest_working_set(self, working_set):
+        self.working_set = working_set
+        if self.overlay_check.isChecked():
+            self.legend_pids = None
+            self.dirty.emit()
+
+    def toggle_overlay(self, enabled):
+        self.legend_pids = None
+        self.dirty.emit()
+
+    def change_map_space(self, index):
+        self.pyramid = PagePyramid(len(plt.cm.tab10.colors))
+        self.map_extent = 0
+        self.view_start = 0
+        self.view_span = None
+        self.frame_window_stale = True
+        self.dirty.emit()
+
+    def change_color_mode(self, index):
+        self.legend_pids = None
+        self.frame_window_stale = True
+        self.dirty.emit()
+
+    def overlay_active(self):
+        return self.overlay_check.isChecked() and self.working_set is not None
 
     def update_paging_info(self, paging_info):
-        self.info_label.setText(
-            f"Page Size: {paging_info['page_size']} bytes | "
-            f"Total Pages: {paging_info['total_pages']} | "
-            f"Used Pages: {paging_info['used_pages']}"
-        )
+        self.paging_info = paging_info
+        self.render()
+
+    def render(self):
+        paging_info = self.paging_info
+        if paging_info is None:
+            self.canvas.draw()
+            return
+        info = (f"Page Size: {paging_info.page_size} bytes | "
+                f"Total Pages: {paging_info.total_pages} | "
+                f"Used Pages: {paging_info.used_pages}")
+        if self.overlay_active() and self.working_set.interval:
+            working_set = self.working_set
+            info += (f" | Working Set: {int(np.count_nonzero(working_set.accessed))} of "
+                     f"{len(working_set.accessed)} pages touched in {working_set.interval:.1f} s")
+        self.info_label.setText(info)
         
-        unique_processes = set(page['process_id'] for page in paging_info['pages'])
-        current_pids = set(self.process_cards.keys())
+        page_array = paging_info.pages
+        pids, page_counts = np.unique(page_array['pid'], return_counts=True)
+        unique_processes = set(pids.tolist())
+        self.process_legend.set_processes(pids, page_counts * paging_info.page_size)
         
-        for pid in current_pids - unique_processes:
-            card = self.process_cards.pop(pid)
-            self.process_layout.removeWidget(card)
-            card.deleteLater()
+        self.page_size = paging_info.page_size
+        self.page_model.set_array(page_array)
         
         colors = plt.cm.tab10.colors
-        for pid in unique_processes - current_pids:
-            card = QFrame()
-            card.setObjectName("processCard")
-            card_layout = QVBoxLayout()
-            card_label = QLabel(f"Process {pid}")
-            card_label.setAlignment(Qt.AlignCenter)
-            card_color = QWidget()
-            card_color.setFixedSize(20, 20)
-            color = colors[pid % len(colors)]
-            card_color.setStyleSheet(f"background-color: rgb({int(color[0]*255)}, {int(color[1]*255)}, {int(color[2]*255)});")
-            card_layout.addWidget(card_label)
-            card_layout.addWidget(card_color)
-            card.setLayout(card_layout)
-            card.setFixedSize(100, 80)
-            self.process_cards[pid] = card
-            self.process_layout.addWidget(card)
-        self.process_layout.addStretch()
-        
-        self.page_table.setRowCount(len(paging_info['pages']))
-        bg_color = QColor('#333333') if self.current_style == 'dark_background' else QColor('#FFFFFF')
-        for row, page in enumerate(paging_info['pages']):
-            for col, value in enumerate([str(page['page_id']), str(page['in_physical']),
-                                       str(page['physical_address']) if page['physical_address'] is not None else "None",
-                                       str(page['process_id'])]):
-                item = QTableWidgetItem(value)
-                item.setBackground(bg_color)
-                self.page_table.setItem(row, col, item)
-        
-        plt.style.use(self.current_style)
-        self.figure.patch.set_facecolor('#2B2B2B' if self.current_style == 'dark_background' else '#FFFFFF')
-        self.ax.clear()
-        
-        bg_color = '#333333' if self.current_style == 'dark_background' else 'lightgray'
-        edge_color = '#FFFFFF' if self.current_style == 'dark_background' else 'black'
-        text_color = 'white' if self.current_style == 'dark_background' else 'black'
-        
-        self.ax.add_patch(Rectangle((0, 0), 100, 1, facecolor=bg_color, edgecolor=edge_color))
-        
-        for page in paging_info['pages']:
-            if page['in_physical'] and page['physical_address'] is not None:
-                x = page['physical_address'] % 100
-                color = colors[page['process_id'] % len(colors)]
-                page_rect = Rectangle((x, 0), 8, 0.8, facecolor=color, edgecolor=edge_color, alpha=0.8)
-                self.ax.add_patch(page_rect)
-                self.ax.text(x + 4, 0.4, str(page['page_id']), 
-                           ha='center', va='center', fontsize=8, color=text_color)
-        
-        self.ax.set_xlim(0, 100)
-        self.ax.set_ylim(0, 1)
-        self.ax.set_title('Physical Memory Page Allocation', fontsize=14, pad=15)
-        self.ax.axis('off')
-        
-        legend_patches = [Rectangle((0, 0), 1, 1, facecolor=colors[pid % len(colors)], 
-                         label=f'Process {pid}') for pid in unique_processes]
-        if legend_patches:
-            self.ax.legend(handles=legend_patches, loc='upper right', fontsize=10)
+        changed = self.update_frame_map(paging_info.total_pages, page_array)
+        if unique_processes != self.legend_pids:
+            self.legend_pids = unique_processes
+            if self.color_combo.currentIndex() == 1:
+                legend_patches = [Rectangle((0, 0), 1, 1, facecolor=colors[value - 1], label=label)
+                                  for value, label in ((CLEAN_CELL, 'Clean'), (DIRTY_CELL, 'Dirty'),
+                                                       (SWAPPED_CELL, 'Swapped'))]
+            elif self.overlay_active():
+                legend_patches = [Rectangle((0, 0), 1, 1, facecolor=colors[HOT_FRAME - 1], label='Hot (accessed)'),
+                                  Rectangle((0, 0), 1, 1, facecolor=colors[COLD_FRAME - 1], label='Cold (idle)')]
+            else:
+                slots = {}
+                for pid in sorted(unique_processes):
+                    slots.setdefault(pid % len(colors), []).append(pid)
+                legend_patches = [Rectangle((0, 0), 1, 1, facecolor=colors[slot],
+                                 label=self.legend_label(pids)) for slot, pids in sorted(slots.items())]
+            legend = self.ax.legend(handles=legend_patches, loc='upper right', fontsize=10)
+            legend.get_frame().set_facecolor('#3C3C3C' if self.current_style == 'dark_background' else '#FFFFFF')
+            for text in legend.get_texts():
+                text.set_color('white' if self.current_style == 'dark_background' else 'black')
+            changed = True
+        if changed:
+            self.canvas.draw()
+
+    def apply_pid_filter(self, text):
+        text = text.strip()
+        self.page_model.set_filter('pid', int(text) if text.isdigit() else None)
+        self.process_legend.set_filter(text)
+
+    def change_legend_limit(self, index):
+        self.process_legend.set_limit(LEGEND_LIMITS[index])
+
+    def legend_label(self, pids):
+        label = 'Process ' + ', '.join(str(pid) for pid in pids[:3])
+        if len(pids) > 3:
+            label += f' +{len(pids) - 3}'
+        return label
+
+    def update_frame_map(self, total_frames, page_array):
+        if self.space_combo.currentIndex() == 1:
+            mapped = page_array
+            keys = mapped['vpn'].astype(np.int64)
+            notice = ''
+            extent = 0
+        else:
+            resident = page_array[(page_array['flags'] & PAGE_PRESENT) != 0]
+            mapped = resident[resident['pfn'] != 0]
+            keys = mapped['pfn'].astype(np.int64)
+            notice = '' if mapped.size or not resident.size else \
+                'Physical frame numbers are hidden (reading them requires CAP_SYS_ADMIN)'
+            extent = total_frames
+        notice_changed = notice != self.frame_notice.get_text()
+        if notice_changed:
+            self.frame_notice.set_text(notice)
         
-        self.canvas.draw()
+        if self.overlay_active():
+            working_set = self.working_set
+            hot = working_set.pages['pfn'][working_set.accessed]
+            slots = np.where(np.isin(mapped['pfn'], hot), HOT_FRAME - 1, COLD_FRAME - 1)
+        else:
+            slots = mapped['pid'] % len(plt.cm.tab10.colors)
+        flags = mapped['flags']
+        states = np.where(flags & PAGE_PRESENT, STATE_PRESENT, 0) | \
+            np.where(flags & PAGE_SWAPPED, STATE_SWAPPED, 0) | np.where(flags & PAGE_DIRTY, STATE_DIRTY, 0)
+        extent = max(extent, int(keys.max()) + 1 if keys.size else 0)
+        if self.pyramid.update(keys, slots, states) or extent != self.map_extent:
+            self.frame_window_stale = True
+        if extent != self.map_extent:
+            self.map_extent = extent
+            self.clamp_frame_view()
+        if not self.frame_window_stale:
+            return notice_changed
+        self.draw_frame_window()
+        return True
+
+    def clamp_frame_view(self):
+        span = self.view_span or self.map_extent
+        if span >= self.map_extent:
+            self.view_span = None
+            span = self.map_extent
+        self.view_start = min(max(self.view_start, 0), self.map_extent - span)
+
+    def draw_frame_window(self):
+        self.frame_window_stale = False
+        span = max(self.view_span or self.map_extent, 1)
+        level = self.pyramid.level_for(span, FRAME_MAP_BUDGET)
+        shift = self.pyramid.shift * level
+        first = self.view_start >> shift
+        count = ((self.view_start + span - 1) >> shift) - first + 1
+        rows = -(-count // FRAME_MAP_COLUMNS)
+        cells = np.zeros(rows * FRAME_MAP_COLUMNS, dtype=np.uint8)
+        cells[:count] = self.cell_values(self.pyramid.window(level, first, count))
+        self.frame_image.set_data(cells.reshape(rows, FRAME_MAP_COLUMNS))
+        self.frame_image.set_extent((0, FRAME_MAP_COLUMNS, rows, 0))
+        self.frame_first = first
+        self.cell_pages = 1 << shift
+        title = 'Virtual Address Space Map' if self.space_combo.currentIndex() == 1 else 'Physical Memory Frame Map'
+        if self.cell_pages > 1:
+            title += f' ({self.cell_pages:,} pages per cell)'
+        self.ax.title.set_text(title)
+
+    def cell_values(self, counts):
+        owners = counts[:, len(STATE_CHANNELS):]
+        if self.color_combo.currentIndex() == 1:
+            present, swapped, dirty = counts[:, 0].astype(np.int64), counts[:, 1], counts[:, 2]
+            states = np.stack([present - dirty, dirty, swapped], axis=1)
+            values = np.array([CLEAN_CELL, DIRTY_CELL, SWAPPED_CELL], dtype=np.uint8)[states.argmax(axis=1)]
+        else:
+            values = (owners.argmax(axis=1) + 1).astype(np.uint8)
+        values[owners.sum(axis=1) == 0] = 0
+        return values
+
+    def cell_index(self, event):
+        cell = int(event.ydata) * FRAME_MAP_COLUMNS + int(event.xdata)
+        return (self.frame_first + cell) * self.cell_pages
+
+    def set_frame_view(self, start, span):
+        self.view_start = start
+        self.view_span = span
+        self.clamp_frame_view()
+        self.draw_frame_window()
+        self.canvas.draw_idle()
+
+    def zoom_frame_map(self, event):
+        if event.inaxes is not self.ax or not self.map_extent:
+            return
+        index = self.cell_index(event)
+        span = self.view_span or self.map_extent
+        zoomed = max(span // 2, FRAME_MAP_COLUMNS) if event.button == 'up' else span * 2
+        self.set_frame_view(index - (index - self.view_start) * zoomed // span, zoomed)
+
+    def start_pan(self, event):
+        if event.inaxes is not self.ax or not self.map_extent:
+            return
+        if event.dblclick:
+            self.set_frame_view(0, self.map_extent)
+        else:
+            self.pan_origin = (event.ydata, self.view_start)
+
+    def pan_frame_map(self, event):
+        if self.pan_origin is None or event.inaxes is not self.ax or self.view_span is None:
+            return
+        row, start = self.pan_origin
+        rows = int(row - event.ydata)
+        self.set_frame_view(start + rows * FRAME_MAP_COLUMNS * self.cell_pages, self.view_span)
+
+    def end_pan(self, event):
+        self.pan_origin = None
@@ -0,0 +1,120 @@
+import os
+import select
+import time
+
+SYSTEM_PRESSURE_PATH = '/proc/pressure/memory'
+CGROUP_ROOT = '/sys/fs/cgroup'
+STALL_THRESHOLD_US = 100000
+TRACKING_WINDOW_US = 1000000
+BURST_INTERVAL = 0.05
+BURST_HOLD = 2.0
+IDLE_SCALE = 5.0
+BURST_SOURCES = ('memory',)
+
+
+def read_pressure(path=SYSTEM_PRESSURE_PATH):
+    pressure = {}
+    with open(path) as f:
+        for line in f:
+            kind, *fields = line.split()
+            pressure[kind] = {key: float(value) for key, value in
+                              (field.split('=') for field in fields)}
+    return pressure
+
+
+def cgroup_pressure_path(cgroup):
+    if not cgroup.startswith('/'):
+        cgroup = '/' + cgroup
+    if cgroup.startswith(CGROUP_ROOT + '/'):
+        return os.path.join(cgroup, 'memory.pressure')
+    return os.path.join(CGROUP_ROOT + cgroup, 'memory.pressure')
+
+
+class PressureTrigger:
+    events = select.EPOLLPRI
+
+    def __init__(self, path, stall_us=STALL_THRESHOLD_US, window_us=TRACKING_WINDOW_US, kind='some'):
+        self.path = path
+        self.fd = os.open(path, os.O_RDWR | os.O_NONBLOCK)
+        try:
+            os.write(self.fd, f'{kind} {stall_us} {window_us}'.encode())
+        except OSError:
+            os.close(self.fd)
+            raise
+
+    def fileno(self):
+        return self.fd
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PressureWatcher:
+    def __init__(self, scheduler, triggers, burst_interval=BURST_INTERVAL, burst_hold=BURST_HOLD,
+                 idle_scale=IDLE_SCALE, burst_sources=BURST_SOURCES):
+        self.scheduler = scheduler
+        self.triggers = {trigger.fileno(): trigger for trigger in triggers}
+        self.burst_interval = burst_interval
+        self.burst_hold = burst_hold
+        self.burst_sources = burst_sources
+        self.burst_until = None
+        self.events = 0
+        self.epoll = select.epoll()
+        for fd, trigger in self.triggers.items():
+            self.epoll.register(fd, trigger.events)
+        self.wake_read, self.wake_write = os.pipe2(os.O_NONBLOCK | os.O_CLOEXEC)
+        self.epoll.register(self.wake_read, select.EPOLLIN)
+        self.scheduler.set_scale(idle_scale)
+
+    def fileno(self):
+        return self.epoll.fileno()
+
+    def wait(self, timeout):
+        fired = False
+        for fd, mask in self.epoll.poll(max(timeout, 0)):
+            if fd == self.wake_read:
+                try:
+                    os.read(self.wake_read, 4096)
+                except BlockingIOError:
+                    pass
+            elif mask & select.EPOLLERR:
+                self.epoll.unregister(fd)
+                self.triggers.pop(fd).close()
+            else:
+                fired = True
+        now = time.monotonic()
+        if fired:
+            self.events += 1
+            if self.burst_until is None:
+                self.scheduler.set_burst(self.burst_sources, self.burst_interval)
+            self.burst_until = now + self.burst_hold
+        elif self.burst_until is not None and now >= self.burst_until:
+            self.scheduler.clear_burst()
+            self.burst_until = None
+        return fired
+
+    def wake(self):
+        try:
+            os.write(self.wake_write, b'\0')
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        for trigger in self.triggers.values():
+            trigger.close()
+        self.epoll.close()
+        os.close(self.wake_read)
+        os.close(self.wake_write)
+
+
+def open_pressure_triggers(cgroups=(), stall_us=STALL_THRESHOLD_US, window_us=TRACKING_WINDOW_US):
+    paths = [SYSTEM_PRESSURE_PATH] + [cgroup_pressure_path(cgroup) for cgroup in cgroups]
+    triggers = []
+    try:
+        for path in paths:
+            triggers.append(PressureTrigger(path, stall_us, window_us))
+    except OSError as error:
+        for trigger in triggers:
+            trigger.close()
+        raise OSError(error.errno, f"cannot register PSI trigger on {path}: {error.strerror}") from error
+    return triggers
@@ -0,0 +1,126 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+import numpy as np
+from components.procfs import DEFAULT_PROC_ROOT, proc_path, read_bytes
+
+PROCESS_DTYPE = np.dtype([
+    ('pid', np.int32),
+    ('name', 'U16'),
+    ('rss', np.uint64),
+    ('pss', np.uint64),
+    ('uss', np.uint64),
+    ('swap', np.uint64),
+])
+
+ROLLUP_FIELDS = {
+    b'Rss:': 'rss',
+    b'Pss:': 'pss',
+    b'Private_Clean:': 'uss',
+    b'Private_Dirty:': 'uss',
+    b'Swap:': 'swap',
+}
+UNAVAILABLE = np.iinfo(np.uint64).max
+SCAN_BUDGET = 2.0
+CACHE_MAX_AGE = 30.0
+MAX_WORKERS = 16
+
+
+def list_pids(proc_root=DEFAULT_PROC_ROOT):
+    return [int(name) for name in os.listdir(proc_root) if name.isdigit()]
+
+
+def parse_stat(data):
+    name = data[data.index(b'(') + 1:data.rindex(b')')].decode(errors='replace')
+    fields = data[data.rindex(b')') + 2:].split()
+    # minflt, majflt, utime, stime, starttime, vsize, rss
+    fingerprint = tuple(fields[i] for i in (7, 9, 11, 12, 19, 20, 21))
+    return name, fingerprint
+
+
+def parse_rollup(data):
+    totals = {'rss': 0, 'pss': 0, 'uss': 0, 'swap': 0}
+    for line in data.splitlines():
+        field = ROLLUP_FIELDS.get(line.split(None, 1)[0] if line else b'')
+        if field is not None:
+            totals[field] += int(line.split()[1]) * 1024
+    return totals
+
+
+class ProcessCollector:
+    def __init__(self, proc_root=DEFAULT_PROC_ROOT, max_workers=MAX_WORKERS,
+                 scan_budget=SCAN_BUDGET, cache_max_age=CACHE_MAX_AGE, page_size=None):
+        self.proc_root = proc_root
+        self.page_size = page_size or os.sysconf('SC_PAGE_SIZE')
+        self.scan_budget = scan_budget
+        self.cache_max_age = cache_max_age
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='process-collector')
+        self._cache = {}
+        self._in_flight = {}
+        self.cached = 0
+        self.timed_out = 0
+        self.stalled = 0
+
+    def scan(self, pids=None):
+        if pids is None:
+            pids = list_pids(self.proc_root)
+        now = time.monotonic()
+        futures = {}
+        self.stalled = 0
+        for pid in pids:
+            future = self._in_flight.get(pid)
+            if future is None:
+                future = self.executor.submit(self._read_process, pid, self._cache.get(pid), now)
+                self._in_flight[pid] = future
+            elif not future.done():
+                # Blocked since an earlier scan, e.g. a read stuck in D state: keep its last row
+                self.stalled += 1
+                continue
+            futures[future] = pid
+        wait(futures, timeout=self.scan_budget)
+
+        live = set(pids)
+        for table in (self._cache, self._in_flight):
+            for pid in list(table):
+                if pid not in live:
+                    del table[pid]
+        self.cached = self.timed_out = 0
+        for future, pid in futures.items():
+            if not future.done():
+                self.timed_out += 1
+                continue
+            del self._in_flight[pid]
+            entry = future.result()
+            if entry is None:
+                self._cache.pop(pid, None)
+            else:
+                self.cached += entry is self._cache.get(pid)
+                self._cache[pid] = entry
+
+        processes = np.zeros(len(self._cache), dtype=PROCESS_DTYPE)
+        for row, (pid, (_, _, name, totals)) in enumerate(sorted(self._cache.items())):
+            processes[row] = (pid, name, totals['rss'], totals['pss'], totals['uss'], totals['swap'])
+        return processes
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    def _read_process(self, pid, cached, now):
+        try:
+            name, fingerprint = parse_stat(read_bytes(proc_path(self.proc_root, pid, 'stat')))
+        except (FileNotFoundError, ProcessLookupError, PermissionError):
+            return None
+        if cached is not None and cached[0] == fingerprint and now - cached[1] < self.cache_max_age:
+            return cached
+        try:
+            try:
+                data = read_bytes(proc_path(self.proc_root, pid, 'smaps_rollup'))
+            except FileNotFoundError:
+                data = read_bytes(proc_path(self.proc_root, pid, 'smaps'))
+        except PermissionError:
+            # Another user's process: stat still has its RSS, the rest needs ptrace access
+            return fingerprint, now, name, {'rss': int(fingerprint[-1]) * self.page_size, 'pss': UNAVAILABLE,
+                                            'uss': UNAVAILABLE, 'swap': UNAVAILABLE}
+        except (FileNotFoundError, ProcessLookupError):
+            return None
+        return fingerprint, now, name, parse_rollup(data)
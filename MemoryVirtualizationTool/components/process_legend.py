@@ -0,0 +1,174 @@
+from PyQt5.QtWidgets import QAbstractScrollArea, QToolTip
+from PyQt5.QtGui import QPainter, QColor, QRegion
+from PyQt5.QtCore import Qt, QRect, QEvent
+import numpy as np
+
+LEGEND_DTYPE = np.dtype([('pid', np.int32), ('size', np.uint64)])
+LEGEND_LIMITS = (20, 100, 1000, 0)
+CELL_WIDTH = 150
+CELL_HEIGHT = 22
+SWATCH_SIZE = 12
+VISIBLE_ROWS = 3
+KB = 1024
+MB = 1024 ** 2
+GB = 1024 ** 3
+
+
+def format_size(size):
+    if size >= GB:
+        return f'{size / GB:.1f} GB'
+    if size >= MB:
+        return f'{size / MB:.1f} MB'
+    return f'{size / KB:.0f} KB'
+
+
+def legend_limit_label(limit):
+    return f"Top {limit} processes" if limit else "All processes"
+
+
+class ProcessLegend(QAbstractScrollArea):
+    def __init__(self, colors, limit=LEGEND_LIMITS[1], parent=None):
+        super().__init__(parent)
+        self.colors = [QColor(color) for color in colors]
+        self.processes = np.zeros(0, dtype=LEGEND_DTYPE)
+        self.pid_text = None
+        self.cells = np.zeros(0, dtype=LEGEND_DTYPE)
+        self.filter_text = ''
+        self.limit = limit
+        self.columns = 1
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.verticalScrollBar().setSingleStep(CELL_HEIGHT)
+        self.setFixedHeight(VISIBLE_ROWS * CELL_HEIGHT + 2 * self.frameWidth())
+        self.set_dark(False)
+
+    def set_dark(self, dark):
+        self.background = QColor('#2B2B2B' if dark else '#FFFFFF')
+        self.text_color = QColor('white' if dark else 'black')
+        self.muted_color = QColor('#888888')
+        self.viewport().update()
+
+    def set_processes(self, pids, sizes):
+        processes = np.empty(len(pids), dtype=LEGEND_DTYPE)
+        processes['pid'] = pids
+        processes['size'] = sizes
+        self.processes = processes
+        self.pid_text = None
+        self.refresh_cells()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip()
+        self.refresh_cells()
+
+    def set_limit(self, limit):
+        self.limit = limit
+        self.refresh_cells()
+
+    def refresh_cells(self):
+        processes = self.processes
+        if self.filter_text:
+            if self.pid_text is None:
+                self.pid_text = processes['pid'].astype(str)
+            processes = processes[np.char.startswith(self.pid_text, self.filter_text)]
+        order = np.lexsort((processes['pid'], -processes['size'].astype(np.int64)))
+        if self.limit:
+            order = order[:self.limit]
+        self.show_cells(processes[order])
+
+    def show_cells(self, cells):
+        previous = self.cells
+        self.cells = cells
+        if len(cells) != len(previous):
+            self.update_scroll_range()
+        if not len(cells) or not len(previous):
+            self.viewport().update()
+            return
+        common = min(len(cells), len(previous))
+        changed = np.concatenate([np.flatnonzero(cells[:common] != previous[:common]),
+                                  np.arange(common, max(len(cells), len(previous)))])
+        first, last = self.visible_range()
+        changed = changed[(changed >= first) & (changed < last)]
+        if not len(changed):
+            return
+        region = QRegion()
+        for index in changed.tolist():
+            region = region.united(self.cell_rect(index))
+        self.viewport().update(region)
+
+    def visible_range(self):
+        top = self.verticalScrollBar().value()
+        first = top // CELL_HEIGHT * self.columns
+        last = ((top + self.viewport().height()) // CELL_HEIGHT + 1) * self.columns
+        return first, last
+
+    def cell_rect(self, index):
+        row, column = divmod(index, self.columns)
+        return QRect(column * CELL_WIDTH, row * CELL_HEIGHT - self.verticalScrollBar().value(),
+                     CELL_WIDTH, CELL_HEIGHT)
+
+    def index_at(self, pos):
+        column = pos.x() // CELL_WIDTH
+        if column >= self.columns:
+            return None
+        index = (pos.y() + self.verticalScrollBar().value()) // CELL_HEIGHT * self.columns + column
+        return index if index < len(self.cells) else None
+
+    def update_scroll_range(self):
+        rows = -(-len(self.cells) // self.columns)
+        height = self.viewport().height()
+        bar = self.verticalScrollBar()
+        bar.setPageStep(height)
+        bar.setRange(0, max(rows * CELL_HEIGHT - height, 0))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.columns = max(self.viewport().width() // CELL_WIDTH, 1)
+        self.update_scroll_range()
+        self.viewport().update()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().scroll(dx, dy)
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        rect = event.rect()
+        painter.fillRect(rect, self.background)
+        if not len(self.cells):
+            painter.setPen(self.muted_color)
+            message = "No matching processes" if len(self.processes) else "No processes"
+            painter.drawText(self.viewport().rect(), Qt.AlignCenter, message)
+            return
+        top = self.verticalScrollBar().value()
+        first_row = (rect.top() + top) // CELL_HEIGHT
+        last_row = (rect.bottom() + top) // CELL_HEIGHT
+        first_column = rect.left() // CELL_WIDTH
+        last_column = min(rect.right() // CELL_WIDTH, self.columns - 1)
+        metrics = painter.fontMetrics()
+        painter.setPen(self.text_color)
+        for row in range(first_row, last_row + 1):
+            start = row * self.columns
+            for column in range(first_column, last_column + 1):
+                index = start + column
+                if index >= len(self.cells):
+                    return
+                pid, size = self.cells[index].item()
+                cell = self.cell_rect(index)
+                swatch = QRect(cell.left() + 6, cell.top() + (CELL_HEIGHT - SWATCH_SIZE) // 2,
+                               SWATCH_SIZE, SWATCH_SIZE)
+                painter.fillRect(swatch, self.colors[pid % len(self.colors)])
+                text_rect = cell.adjusted(SWATCH_SIZE + 12, 0, -4, 0)
+                painter.drawText(text_rect, Qt.AlignVCenter | Qt.AlignLeft,
+                                 metrics.elidedText(f"{pid}  {format_size(size)}", Qt.ElideRight,
+                                                    text_rect.width()))
+
+    def viewportEvent(self, event):
+        if event.type() == QEvent.ToolTip:
+            index = self.index_at(event.pos())
+            if index is None:
+                QToolTip.hideText()
+            else:
+                pid, size = self.cells[index].item()
+                QToolTip.showText(event.globalPos(),
+                                  f"Process {pid}: {format_size(size)} "
+                                  f"(#{index + 1} of {len(self.processes)})", self.viewport())
+            return True
+        return super().viewportEvent(event)
@@ -0,0 +1,28 @@
+import os
+
+DEFAULT_PROC_ROOT = '/proc'
+
+
+def proc_path(proc_root, pid, name):
+    return os.path.join(proc_root, str(pid), name)
+
+
+def read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def parse_maps(data):
+    regions = []
+    for line in data.splitlines():
+        fields = line.split(None, 5)
+        if len(fields) < 5:
+            continue
+        start, _, end = fields[0].partition(b'-')
+        path = fields[5].strip().decode(errors='replace') if len(fields) > 5 else ''
+        regions.append((int(start, 16), int(end, 16), fields[1].decode(), path))
+    return regions
+
+
+def read_maps(proc_root, pid):
+    return parse_maps(read_bytes(proc_path(proc_root, pid, 'maps')))
@@ -0,0 +1,485 @@
+import heapq
+import mmap
+import struct
+import threading
+import numpy as np
+from components.arrays import as_void
+from components.paging_collector import PAGE_DTYPE
+from components.process_collector import PROCESS_DTYPE
+from components.segmentation_collector import SEGMENT_DTYPE
+from components.fragmentation import ZONE_DTYPE, empty_zones
+from components.samples import (MEMORY_FIELDS, MemorySample, ProcessSnapshot, PagingSnapshot,
+                                SegmentationDelta, empty_segments)
+
+MAGIC = b'MVTREC\x00\x01'
+TRAILER_MAGIC = b'MVTRIDX\x00'
+FORMAT_VERSION = 1
+KEYFRAME_INTERVAL = 30
+MEMORY_CHUNK_ROWS = 60
+
+FILE_HEADER = struct.Struct('<8sI20x')
+CHUNK_HEADER = struct.Struct('<4sIddQ')
+TRAILER = struct.Struct('<Q8s')
+PAGING_HEADER = struct.Struct('<dQQQQ')
+SEGMENTATION_HEADER = struct.Struct('<dQdQQQ')
+PROCESS_HEADER = struct.Struct('<dQ')
+
+KIND_MEMORY = b'MEMS'
+KIND_PAGING_KEYFRAME = b'PAGK'
+KIND_PAGING_DELTA = b'PAGD'
+KIND_SEGMENTATION_KEYFRAME = b'SEGK'
+KIND_SEGMENTATION_DELTA = b'SEGD'
+KIND_PROCESS_KEYFRAME = b'PRCK'
+KIND_PROCESS_DELTA = b'PRCD'
+KIND_ZONES = b'ZONE'
+KIND_INDEX = b'INDX'
+
+MEMORY_FLOAT_FIELDS = ('timestamp', 'percent', 'swap_percent')
+
+INDEX_DTYPE = np.dtype([
+    ('kind', 'S4'),
+    ('count', '<u4'),
+    ('offset', '<u8'),
+    ('t_first', '<f8'),
+    ('t_last', '<f8'),
+])
+
+
+# Big-endian fields make the raw bytes of a key sort in (pid, vpn) order
+PAGE_KEY_FIELDS = np.dtype([('pid', '>u4'), ('vpn', '>u8')])
+PAGE_KEY_DTYPE = np.dtype((np.void, PAGE_KEY_FIELDS.itemsize))
+PROCESS_KEY_DTYPE = np.dtype('<u8')
+
+
+def pack_page_keys(pids, vpns):
+    keys = np.empty(len(pids), dtype=PAGE_KEY_FIELDS)
+    keys['pid'] = pids
+    keys['vpn'] = vpns
+    return keys.view(PAGE_KEY_DTYPE)
+
+
+def page_keys(pages):
+    return pack_page_keys(pages['pid'], pages['vpn'])
+
+
+def process_keys(processes):
+    return processes['pid'].astype(PROCESS_KEY_DTYPE)
+
+
+def diff_keyed(old_keys, old_records, keys, records):
+    removed = np.setdiff1d(old_keys, keys, assume_unique=True)
+    if not len(old_keys):
+        return removed, records
+    match = np.minimum(np.searchsorted(old_keys, keys), len(old_keys) - 1)
+    same = (old_keys[match] == keys) & (as_void(old_records[match]) == as_void(records))
+    return removed, records[~same]
+
+
+def apply_keyed_delta(keys, records, removed, changed, changed_keys):
+    keep = ~np.isin(keys, np.concatenate([removed, changed_keys]))
+    keys = np.concatenate([keys[keep], changed_keys])
+    records = np.concatenate([records[keep], changed])
+    order = np.argsort(keys, kind='stable')
+    return keys[order], records[order]
+
+
+def memory_sample(values):
+    return MemorySample(*(value if field in MEMORY_FLOAT_FIELDS else int(value)
+                          for field, value in zip(MEMORY_FIELDS, values)))
+
+
+def encode_chunk(kind, count, t_first, t_last, *parts):
+    buffers = [part if isinstance(part, bytes) else np.ascontiguousarray(part) for part in parts]
+    size = sum(len(part) if isinstance(part, bytes) else part.nbytes for part in buffers)
+    padding = -size % 8
+    header = CHUNK_HEADER.pack(kind, count, t_first, t_last, size + padding)
+    return kind, count, t_first, t_last, [header, *buffers, b'\0' * padding]
+
+
+def memory_row(memory_sample):
+    return tuple(float(getattr(memory_sample, field)) for field in MEMORY_FIELDS)
+
+
+def encode_memory(rows):
+    columns = np.array(rows, dtype='<f8').T
+    return encode_chunk(KIND_MEMORY, len(rows), columns[0, 0], columns[0, -1], columns)
+
+
+def decode_memory(buffer, offset, count):
+    return np.frombuffer(buffer, '<f8', len(MEMORY_FIELDS) * count, offset).reshape(len(MEMORY_FIELDS), -1)
+
+
+def decode_keyed(header, dtype, key_dtype, buffer, offset, count):
+    *scalars, n_removed = header.unpack_from(buffer, offset)
+    offset += header.size
+    removed = np.frombuffer(buffer, key_dtype, n_removed, offset)
+    offset += removed.nbytes
+    changed = np.frombuffer(buffer, dtype, count, offset)
+    return tuple(scalars), removed, changed
+
+
+def decode_segmentation(buffer, offset, count):
+    header = SEGMENTATION_HEADER.unpack_from(buffer, offset)
+    offset += SEGMENTATION_HEADER.size
+    upserts = np.frombuffer(buffer, SEGMENT_DTYPE, header[4], offset)
+    offset += upserts.nbytes
+    removed = np.frombuffer(buffer, '<i8', header[5], offset)
+    return header, upserts, removed
+
+
+def decode_zones(buffer, offset, count):
+    return np.frombuffer(buffer, ZONE_DTYPE, count, offset)
+
+
+def encode_zones(timestamp, zones):
+    return encode_chunk(KIND_ZONES, len(zones), timestamp, timestamp, zones)
+
+
+def paging_event(scalars, records):
+    timestamp, page_size, total_pages, used_pages = scalars
+    return timestamp, 'paging', PagingSnapshot(timestamp, page_size, total_pages, used_pages, records)
+
+
+def processes_event(scalars, records):
+    timestamp, = scalars
+    return timestamp, 'processes', ProcessSnapshot(timestamp, records)
+
+
+KEYED_STREAMS = {
+    'paging': (KIND_PAGING_KEYFRAME, KIND_PAGING_DELTA, PAGING_HEADER, PAGE_DTYPE, page_keys, PAGE_KEY_DTYPE,
+               paging_event),
+    'processes': (KIND_PROCESS_KEYFRAME, KIND_PROCESS_DELTA, PROCESS_HEADER, PROCESS_DTYPE,
+                  process_keys, PROCESS_KEY_DTYPE, processes_event),
+}
+
+
+def segmentation_snapshot(state, scalars, zones):
+    timestamp, total_memory, fragmentation = scalars
+    return timestamp, 'segmentation', SegmentationDelta(
+        timestamp, np.array(list(state.values()), dtype=SEGMENT_DTYPE), empty_segments(),
+        np.empty(0, dtype=np.int64), True, total_memory, fragmentation, zones)
+
+
+def apply_segmentation_delta(state, header, upserts, removed, zones):
+    timestamp, total_memory, fragmentation, reset = header[:4]
+    if reset:
+        state.clear()
+    added, resized = [], []
+    for record in upserts.tolist():
+        (resized if record[0] in state else added).append(record)
+        state[record[0]] = record
+    for segment_id in removed.tolist():
+        state.pop(segment_id, None)
+    return timestamp, 'segmentation', SegmentationDelta(
+        timestamp, np.array(added, dtype=SEGMENT_DTYPE), np.array(resized, dtype=SEGMENT_DTYPE),
+        removed.astype(np.int64), bool(reset), total_memory, fragmentation, zones)
+
+
+class _KeyedEncoder:
+    def __init__(self, stream, keyframe_interval):
+        self.keyframe_kind, self.delta_kind, self.header, _, self.key, self.key_dtype, _ = KEYED_STREAMS[stream]
+        self.keyframe_interval = keyframe_interval
+        self.keys = None
+        self.records = None
+        self.scalars = None
+        self.deltas = 0
+
+    def encode(self, scalars, records):
+        keys = self.key(records)
+        order = np.argsort(keys, kind='stable')
+        keys, records = keys[order], records[order]
+        self.scalars = scalars
+        if self.keys is None or self.deltas >= self.keyframe_interval:
+            self.keys, self.records = keys, records
+            self.deltas = 0
+            return self.keyframe()
+        removed, changed = diff_keyed(self.keys, self.records, keys, records)
+        self.keys, self.records = keys, records
+        self.deltas += 1
+        return encode_chunk(self.delta_kind, len(changed), scalars[0], scalars[0],
+                            self.header.pack(*scalars, len(removed)), removed.astype(self.key_dtype), changed)
+
+    def keyframe(self):
+        return encode_chunk(self.keyframe_kind, len(self.records), self.scalars[0], self.scalars[0],
+                            self.header.pack(*self.scalars, 0), self.records)
+
+
+class ChunkEncoder:
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL):
+        self.keyframe_interval = keyframe_interval
+        self.paging = _KeyedEncoder('paging', keyframe_interval)
+        self.processes = _KeyedEncoder('processes', keyframe_interval)
+        self.segments = {}
+        self.segmentation_scalars = None
+        self.zones = empty_zones()
+        self.segmentation_deltas = keyframe_interval
+
+    def encode_paging(self, snapshot):
+        scalars = (snapshot.timestamp, snapshot.page_size, snapshot.total_pages, snapshot.used_pages)
+        return [self.paging.encode(scalars, snapshot.pages)]
+
+    def encode_processes(self, snapshot):
+        return [self.processes.encode((snapshot.timestamp,), snapshot.processes)]
+
+    def encode_segmentation(self, delta):
+        if delta.reset:
+            self.segments.clear()
+        upserts = np.concatenate([delta.added, delta.resized])
+        for record in upserts.tolist():
+            self.segments[record[0]] = record
+        for segment_id in delta.removed.tolist():
+            self.segments.pop(segment_id, None)
+        timestamp = delta.timestamp
+        self.segmentation_scalars = (timestamp, delta.total_memory, delta.fragmentation)
+        header = SEGMENTATION_HEADER.pack(*self.segmentation_scalars, int(delta.reset),
+                                          len(upserts), len(delta.removed))
+        chunks = []
+        if len(delta.zones) != len(self.zones) or (as_void(delta.zones) != as_void(self.zones)).any():
+            self.zones = delta.zones
+            chunks.append(encode_zones(timestamp, self.zones))
+        chunks.append(encode_chunk(KIND_SEGMENTATION_DELTA, len(upserts), timestamp, timestamp,
+                               header, upserts, delta.removed.astype('<i8')))
+        self.segmentation_deltas += 1
+        if self.segmentation_deltas >= self.keyframe_interval:
+            chunks.append(self.segmentation_keyframe())
+            self.segmentation_deltas = 0
+        return chunks
+
+    def segmentation_keyframe(self):
+        state = np.array(list(self.segments.values()), dtype=SEGMENT_DTYPE)
+        timestamp = self.segmentation_scalars[0]
+        header = SEGMENTATION_HEADER.pack(*self.segmentation_scalars, 1, len(state), 0)
+        return encode_chunk(KIND_SEGMENTATION_KEYFRAME, len(state), timestamp, timestamp, header, state)
+
+    def keyframes(self):
+        chunks = [stream.keyframe() for stream in (self.paging, self.processes) if stream.records is not None]
+        if self.segmentation_scalars is not None:
+            if len(self.zones):
+                chunks.append(encode_zones(self.segmentation_scalars[0], self.zones))
+            chunks.append(self.segmentation_keyframe())
+        return chunks
+
+
+class StreamDecoder:
+    def __init__(self):
+        self.keyed = {}
+        self.segments = None
+        self.zones = empty_zones()
+
+    def decode(self, kind, count, buffer, offset=0):
+        if kind == KIND_MEMORY:
+            columns = decode_memory(buffer, offset, count)
+            return [(sample.timestamp, 'memory', sample)
+                    for sample in map(memory_sample, columns.T.tolist())]
+        for stream, (keyframe_kind, delta_kind, header, dtype, key, key_dtype, event) in KEYED_STREAMS.items():
+            if kind == keyframe_kind or (kind == delta_kind and stream in self.keyed):
+                scalars, removed, changed = decode_keyed(header, dtype, key_dtype, buffer, offset, count)
+                if kind == keyframe_kind:
+                    self.keyed[stream] = key(changed), changed
+                else:
+                    self.keyed[stream] = apply_keyed_delta(*self.keyed[stream], removed, changed, key(changed))
+                return [event(scalars, self.keyed[stream][1])]
+        if kind == KIND_ZONES:
+            self.zones = decode_zones(buffer, offset, count).copy()
+            return []
+        if kind == KIND_SEGMENTATION_KEYFRAME and self.segments is None:
+            header, upserts, _ = decode_segmentation(buffer, offset, count)
+            self.segments = {record[0]: record for record in upserts.tolist()}
+            return [segmentation_snapshot(self.segments, header[:3], self.zones)]
+        if kind == KIND_SEGMENTATION_DELTA and self.segments is not None:
+            header, upserts, removed = decode_segmentation(buffer, offset, count)
+            return [apply_segmentation_delta(self.segments, header, upserts, removed, self.zones)]
+        return []
+
+
+class SessionRecorder:
+    def __init__(self, path, keyframe_interval=KEYFRAME_INTERVAL):
+        self.file = open(path, 'wb')
+        self.file.write(FILE_HEADER.pack(MAGIC, FORMAT_VERSION))
+        self.encoder = ChunkEncoder(keyframe_interval)
+        self.index = []
+        self.memory_rows = []
+        self.closed = False
+        self.lock = threading.Lock()
+
+    def record(self, kind, sample):
+        if kind != 'working_set':
+            getattr(self, f'record_{kind}')(sample)
+
+    def record_memory(self, sample):
+        with self.lock:
+            if self.closed:
+                return
+            self.memory_rows.append(memory_row(sample))
+            if len(self.memory_rows) >= MEMORY_CHUNK_ROWS:
+                self._flush_memory()
+
+    def record_paging(self, snapshot):
+        with self.lock:
+            if not self.closed:
+                self._write_chunks(self.encoder.encode_paging(snapshot))
+
+    def record_processes(self, snapshot):
+        with self.lock:
+            if not self.closed:
+                self._write_chunks(self.encoder.encode_processes(snapshot))
+
+    def record_segmentation(self, delta):
+        with self.lock:
+            if not self.closed:
+                self._write_chunks(self.encoder.encode_segmentation(delta))
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self._flush_memory()
+            index = np.array(self.index, dtype=INDEX_DTYPE)
+            offset = self.file.tell()
+            self._write_chunks([encode_chunk(KIND_INDEX, len(index), 0.0, 0.0, index)])
+            self.file.write(TRAILER.pack(offset, TRAILER_MAGIC))
+            self.file.close()
+            self.closed = True
+
+    def _flush_memory(self):
+        if self.memory_rows:
+            self._write_chunks([encode_memory(self.memory_rows)])
+            self.memory_rows = []
+
+    def _write_chunks(self, chunks):
+        for kind, count, t_first, t_last, buffers in chunks:
+            self.index.append((kind, count, self.file.tell(), t_first, t_last))
+            for buffer in buffers:
+                self.file.write(buffer)
+        self.file.flush()
+
+
+class SessionReader:
+    def __init__(self, path):
+        self.file = open(path, 'rb')
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version = FILE_HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a memory recording")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"{path} uses unsupported recording format version {version}")
+        self.index = self._load_index()
+        if len(self.index):
+            self.start_time = float(self.index['t_first'].min())
+            self.end_time = float(self.index['t_last'].max())
+        else:
+            self.start_time = self.end_time = 0.0
+
+    def close(self):
+        try:
+            self.data.close()
+        except BufferError:
+            pass
+        self.file.close()
+
+    def events(self, start_time=None):
+        if start_time is None:
+            start_time = self.start_time
+        return heapq.merge(self.memory_samples(start_time), self.keyed_samples('paging', start_time),
+                           self.keyed_samples('processes', start_time),
+                           self.segmentation_samples(start_time), key=lambda event: event[0])
+
+    def memory_samples(self, start_time):
+        entries = self.index[self.index['kind'] == KIND_MEMORY]
+        first = np.searchsorted(entries['t_last'], start_time, side='left')
+        for entry in entries[first:]:
+            columns = decode_memory(self.data, self._payload_offset(entry), int(entry['count']))
+            for row in range(np.searchsorted(columns[0], start_time, side='left'), columns.shape[1]):
+                sample = memory_sample(columns[:, row].tolist())
+                yield sample.timestamp, 'memory', sample
+
+    def keyed_samples(self, stream, start_time):
+        keyframe_kind, delta_kind, header, dtype, key, key_dtype, make_event = KEYED_STREAMS[stream]
+        entries = self.index[np.isin(self.index['kind'], [keyframe_kind, delta_kind])]
+        keyframes = np.flatnonzero(entries['kind'] == keyframe_kind)
+        if not len(keyframes):
+            return
+        k = np.searchsorted(entries['t_first'][keyframes], start_time, side='right') - 1
+        keys = records = pending = None
+        for entry in entries[keyframes[max(k, 0)]:]:
+            scalars, removed, changed = decode_keyed(header, dtype, key_dtype, self.data,
+                                                     self._payload_offset(entry), int(entry['count']))
+            if entry['kind'] == keyframe_kind:
+                keys, records = key(changed), changed
+            else:
+                keys, records = apply_keyed_delta(keys, records, removed, changed, key(changed))
+            event = make_event(scalars, records)
+            timestamp = event[0]
+            if timestamp < start_time:
+                pending = event
+                continue
+            if pending is not None and timestamp > start_time:
+                yield pending
+            pending = None
+            yield event
+        if pending is not None:
+            yield pending
+
+    def segmentation_samples(self, start_time):
+        entries = self.index[np.isin(self.index['kind'],
+                                     [KIND_SEGMENTATION_KEYFRAME, KIND_SEGMENTATION_DELTA, KIND_ZONES])]
+        keyframes = np.flatnonzero(entries['kind'] == KIND_SEGMENTATION_KEYFRAME)
+        k = np.searchsorted(entries['t_first'][keyframes], start_time, side='right') - 1
+        position = keyframes[k] if k >= 0 else 0
+        zone_entries = np.flatnonzero(entries['kind'] == KIND_ZONES)
+        z = np.searchsorted(zone_entries, position) - 1
+        zones = self._zones(entries[zone_entries[z]]) if z >= 0 else empty_zones()
+        state = {}
+        scalars = None
+        syncing = True
+        for entry in entries[position:]:
+            if entry['kind'] == KIND_ZONES:
+                zones = self._zones(entry)
+                continue
+            header, upserts, removed = decode_segmentation(self.data, self._payload_offset(entry),
+                                                           int(entry['count']))
+            timestamp = header[0]
+            if entry['kind'] == KIND_SEGMENTATION_KEYFRAME:
+                if syncing:
+                    state = {record[0]: record for record in upserts.tolist()}
+                    scalars = header[:3]
+                continue
+            if syncing and timestamp >= start_time and scalars is not None:
+                yield segmentation_snapshot(state, scalars, zones)
+            if timestamp >= start_time:
+                syncing = False
+            event = apply_segmentation_delta(state, header, upserts, removed, zones)
+            scalars = header[:3]
+            if not syncing:
+                yield event
+        if syncing and scalars is not None:
+            yield segmentation_snapshot(state, scalars, zones)
+
+    def _zones(self, entry):
+        return decode_zones(self.data, self._payload_offset(entry), int(entry['count'])).copy()
+
+    def _payload_offset(self, entry):
+        return int(entry['offset']) + CHUNK_HEADER.size
+
+    def _load_index(self):
+        size = len(self.data)
+        if size >= FILE_HEADER.size + CHUNK_HEADER.size + TRAILER.size:
+            offset, magic = TRAILER.unpack_from(self.data, size - TRAILER.size)
+            if magic == TRAILER_MAGIC and offset + CHUNK_HEADER.size <= size:
+                kind, count, _, _, _ = CHUNK_HEADER.unpack_from(self.data, offset)
+                if kind == KIND_INDEX:
+                    return np.frombuffer(self.data, INDEX_DTYPE, count, offset + CHUNK_HEADER.size)
+        return self._scan_index()
+
+    def _scan_index(self):
+        entries = []
+        offset = FILE_HEADER.size
+        size = len(self.data)
+        while offset + CHUNK_HEADER.size <= size:
+            kind, count, t_first, t_last, payload_size = CHUNK_HEADER.unpack_from(self.data, offset)
+            end = offset + CHUNK_HEADER.size + payload_size
+            if end > size or kind == KIND_INDEX:
+                break
+            entries.append((kind, count, offset, t_first, t_last))
+            offset = end
+        return np.array(entries, dtype=INDEX_DTYPE)
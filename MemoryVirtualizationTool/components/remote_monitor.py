@@ -0,0 +1,64 @@
+import socket
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal
+from components.mailbox import SampleMailbox
+from components.samples import merge_segment_deltas
+from components.recording import StreamDecoder
+from components.stream import DEFAULT_ADDRESS, connect, read_frames
+
+RECONNECT_DELAY = 2.0
+
+
+class RemoteMonitor(QThread):
+    memory_updated = pyqtSignal(object)
+    processes_updated = pyqtSignal(object)
+    paging_updated = pyqtSignal(object)
+    segmentation_updated = pyqtSignal(object)
+    sample_collected = pyqtSignal(str, object)
+
+    def __init__(self, address=DEFAULT_ADDRESS):
+        super().__init__()
+        self.address = address
+        self._running = False
+        self._socket = None
+        self._wake = threading.Event()
+        self.mailbox = SampleMailbox({
+            'memory': self.memory_updated,
+            'processes': self.processes_updated,
+            'paging': self.paging_updated,
+            'segmentation': self.segmentation_updated
+        }, {'segmentation': merge_segment_deltas}, self)
+
+    def start(self):
+        self._running = True
+        super().start()
+
+    def run(self):
+        while self._running:
+            try:
+                self._socket = connect(self.address)
+                decoder = StreamDecoder()
+                for kind, count, payload in read_frames(self._socket):
+                    for _, event_kind, info in decoder.decode(kind, count, payload):
+                        self.sample_collected.emit(event_kind, info)
+                        self.mailbox.post(event_kind, info)
+            except (OSError, ValueError):
+                pass
+            finally:
+                if self._socket is not None:
+                    self._socket.close()
+                    self._socket = None
+            if self._running:
+                self._wake.wait(RECONNECT_DELAY)
+                self._wake.clear()
+
+    def stop(self):
+        self._running = False
+        sock = self._socket
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._wake.set()
+        self.wait()
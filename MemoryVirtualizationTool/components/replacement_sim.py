@@ -0,0 +1,368 @@
+import heapq
+from collections import OrderedDict, deque
+import numpy as np
+from components.paging_collector import PAGE_DTYPE, PAGE_PRESENT
+from components.samples import PagingSnapshot
+
+POLICIES = ('FIFO', 'LRU', 'CLOCK', 'LFU', 'ARC', 'OPT')
+SIMULATED_PAGE_SIZE = 4096
+MAX_FRAMES = 200
+MAX_TIMELINE_POINTS = 2000
+
+
+def synthetic_references(count, pages=4096, seed=0, scan_fraction=0.2, scan_block=1024):
+    rng = np.random.default_rng(seed)
+    references = (rng.zipf(1.2, count) - 1) % pages
+    blocks = -(-count // scan_block)
+    scans = np.flatnonzero(rng.random(blocks) < scan_fraction)
+    for block in scans.tolist():
+        start = block * scan_block
+        end = min(start + scan_block, count)
+        references[start:end] = pages + (start + np.arange(end - start)) % (4 * pages)
+    return references.astype(np.int64)
+
+
+def load_references(path):
+    references = np.load(path)
+    if references.dtype.kind not in 'iu' or references.ndim != 1:
+        raise ValueError(f"{path} is not a one-dimensional array of page numbers")
+    return references.astype(np.int64)
+
+
+def previous_occurrence(references):
+    order = np.argsort(references, kind='stable')
+    ordered = references[order]
+    previous = np.full(len(references), -1, dtype=np.int64)
+    same = ordered[1:] == ordered[:-1]
+    previous[order[1:][same]] = order[:-1][same]
+    return previous
+
+
+def next_occurrence(references):
+    count = len(references)
+    previous = previous_occurrence(references)
+    following = np.full(count, count, dtype=np.int64)
+    reused = np.flatnonzero(previous >= 0)
+    following[previous[reused]] = reused
+    return following
+
+
+def greater_before(values):
+    count = len(values)
+    size = 1 << max(count - 1, 0).bit_length()
+    padded = np.full(size, -1, dtype=np.int64)
+    padded[:count] = values
+    ordered = padded.copy()
+    counts = np.zeros(size, dtype=np.int64)
+    span = np.int64(padded.max() + 2)
+    width = 1
+    while width < size:
+        rows = size // (2 * width)
+        blocks = ordered.reshape(rows, 2 * width)
+        offsets = (np.arange(rows, dtype=np.int64) * span)[:, None]
+        keys = (blocks[:, :width] + offsets).ravel()
+        queries = (padded.reshape(rows, 2 * width)[:, width:] + offsets).ravel()
+        ends = np.repeat(np.arange(1, rows + 1, dtype=np.int64) * width, width)
+        counts.reshape(rows, 2 * width)[:, width:] += \
+            (ends - np.searchsorted(keys, queries, side='right')).reshape(rows, width)
+        ordered = np.sort(blocks, axis=1, kind='stable').ravel()
+        width *= 2
+    return counts[:count]
+
+
+def stack_distances(references):
+    previous = previous_occurrence(references)
+    reused = np.flatnonzero(previous >= 0)
+    distances = np.full(len(references), -1, dtype=np.int64)
+    distances[reused] = reused - previous[reused] - 1 - greater_before(previous[reused])
+    return distances
+
+
+def miss_ratio_curve(distances):
+    if not len(distances):
+        return np.ones(1)
+    distinct = int(np.count_nonzero(distances < 0))
+    hits = np.cumsum(np.bincount(distances[distances >= 0], minlength=distinct))
+    return np.concatenate([[1.0], 1.0 - hits / len(distances)])
+
+
+class FIFOPolicy:
+    def __init__(self, frames):
+        self.frames = frames
+        self.slots = {}
+        self.queue = deque()
+
+    def run(self, pages, hits):
+        slots, queue, frames = self.slots, self.queue, self.frames
+        for page in pages:
+            if page in slots:
+                hits.append(1)
+                continue
+            hits.append(0)
+            slot = slots.pop(queue.popleft()) if len(queue) == frames else len(queue)
+            slots[page] = slot
+            queue.append(page)
+
+    def resident(self):
+        return self.slots
+
+
+class LRUPolicy:
+    def __init__(self, frames):
+        self.frames = frames
+        self.slots = OrderedDict()
+
+    def run(self, pages, hits):
+        slots, frames = self.slots, self.frames
+        move_to_end = slots.move_to_end
+        for page in pages:
+            if page in slots:
+                move_to_end(page)
+                hits.append(1)
+                continue
+            hits.append(0)
+            slot = slots.popitem(last=False)[1] if len(slots) == frames else len(slots)
+            slots[page] = slot
+
+    def resident(self):
+        return self.slots
+
+
+class ClockPolicy:
+    def __init__(self, frames):
+        self.frames = frames
+        self.slots = {}
+        self.pages = [None] * frames
+        self.referenced = bytearray(frames)
+        self.hand = 0
+
+    def run(self, pages, hits):
+        slots, frame_pages, referenced, frames = self.slots, self.pages, self.referenced, self.frames
+        hand = self.hand
+        for page in pages:
+            slot = slots.get(page)
+            if slot is not None:
+                referenced[slot] = 1
+                hits.append(1)
+                continue
+            hits.append(0)
+            while referenced[hand]:
+                referenced[hand] = 0
+                hand = hand + 1 if hand + 1 < frames else 0
+            victim = frame_pages[hand]
+            if victim is not None:
+                del slots[victim]
+            frame_pages[hand] = page
+            slots[page] = hand
+            referenced[hand] = 1
+            hand = hand + 1 if hand + 1 < frames else 0
+        self.hand = hand
+
+    def resident(self):
+        return self.slots
+
+
+class LFUPolicy:
+    def __init__(self, frames):
+        self.frames = frames
+        self.slots = {}
+        self.counts = {}
+        self.buckets = {}
+        self.min_count = 0
+
+    def run(self, pages, hits):
+        slots, counts, buckets, frames = self.slots, self.counts, self.buckets, self.frames
+        for page in pages:
+            count = counts.get(page)
+            if count is not None:
+                hits.append(1)
+                bucket = buckets[count]
+                del bucket[page]
+                if not bucket:
+                    del buckets[count]
+                    if self.min_count == count:
+                        self.min_count = count + 1
+                counts[page] = count + 1
+                buckets.setdefault(count + 1, OrderedDict())[page] = None
+                continue
+            hits.append(0)
+            if len(slots) == frames:
+                bucket = buckets[self.min_count]
+                victim = bucket.popitem(last=False)[0]
+                if not bucket:
+                    del buckets[self.min_count]
+                del counts[victim]
+                slot = slots.pop(victim)
+            else:
+                slot = len(slots)
+            slots[page] = slot
+            counts[page] = 1
+            buckets.setdefault(1, OrderedDict())[page] = None
+            self.min_count = 1
+
+    def resident(self):
+        return self.slots
+
+
+class ARCPolicy:
+    def __init__(self, frames):
+        self.frames = frames
+        self.target = 0
+        self.t1, self.t2 = OrderedDict(), OrderedDict()
+        self.b1, self.b2 = OrderedDict(), OrderedDict()
+        self.free_slots = list(range(frames - 1, -1, -1))
+
+    def run(self, pages, hits):
+        t1, t2, b1, b2, frames = self.t1, self.t2, self.b1, self.b2, self.frames
+        for page in pages:
+            if page in t1:
+                t2[page] = t1.pop(page)
+                hits.append(1)
+                continue
+            if page in t2:
+                t2.move_to_end(page)
+                hits.append(1)
+                continue
+            hits.append(0)
+            if page in b1:
+                self.target = min(frames, self.target + max(len(b2) // len(b1), 1))
+                del b1[page]
+                self._replace(False)
+                t2[page] = self.free_slots.pop()
+                continue
+            if page in b2:
+                self.target = max(0, self.target - max(len(b1) // len(b2), 1))
+                del b2[page]
+                self._replace(True)
+                t2[page] = self.free_slots.pop()
+                continue
+            if len(t1) + len(b1) == frames:
+                if len(t1) < frames:
+                    b1.popitem(last=False)
+                    self._replace(False)
+                else:
+                    self.free_slots.append(t1.popitem(last=False)[1])
+            elif len(t1) + len(t2) + len(b1) + len(b2) >= frames:
+                if len(t1) + len(t2) + len(b1) + len(b2) == 2 * frames:
+                    b2.popitem(last=False)
+                if len(t1) + len(t2) == frames:
+                    self._replace(False)
+            t1[page] = self.free_slots.pop()
+
+    def _replace(self, in_b2):
+        t1, t2 = self.t1, self.t2
+        if t1 and (len(t1) > self.target or (in_b2 and len(t1) == self.target)):
+            page, slot = t1.popitem(last=False)
+            self.b1[page] = None
+        elif t2:
+            page, slot = t2.popitem(last=False)
+            self.b2[page] = None
+        else:
+            return
+        self.free_slots.append(slot)
+
+    def resident(self):
+        return {**self.t1, **self.t2}
+
+
+class OPTPolicy:
+    def __init__(self, frames):
+        self.frames = frames
+        self.slots = {}
+        self.next_use = {}
+        self.heap = []
+
+    def run(self, pages, hits, following):
+        slots, next_use, heap, frames = self.slots, self.next_use, self.heap, self.frames
+        for page, upcoming in zip(pages, following):
+            if page in slots:
+                hits.append(1)
+            else:
+                hits.append(0)
+                if len(slots) == frames:
+                    while True:
+                        due, victim = heapq.heappop(heap)
+                        if next_use.get(victim) == -due:
+                            break
+                    del next_use[victim]
+                    slot = slots.pop(victim)
+                else:
+                    slot = len(slots)
+                slots[page] = slot
+            next_use[page] = upcoming
+            heapq.heappush(heap, (-upcoming, page))
+            if len(heap) > 4 * frames + 64:
+                self.heap = heap = [(-due, resident) for resident, due in next_use.items()]
+                heapq.heapify(heap)
+
+    def resident(self):
+        return self.slots
+
+
+POLICY_CLASSES = {
+    'FIFO': FIFOPolicy,
+    'LRU': LRUPolicy,
+    'CLOCK': ClockPolicy,
+    'LFU': LFUPolicy,
+    'ARC': ARCPolicy,
+    'OPT': OPTPolicy,
+}
+
+
+def resident_snapshot(timestamp, frames, resident):
+    pages = np.zeros(len(resident), dtype=PAGE_DTYPE)
+    pages['vpn'] = np.fromiter(resident.keys(), dtype=np.int64, count=len(resident))
+    pages['pfn'] = np.fromiter(resident.values(), dtype=np.int64, count=len(resident)) + 1
+    pages['flags'] = PAGE_PRESENT
+    return PagingSnapshot(timestamp, SIMULATED_PAGE_SIZE, frames, len(resident), pages)
+
+
+def hit_timeline(hits):
+    window = max(1, -(-len(hits) // MAX_TIMELINE_POINTS))
+    starts = np.arange(0, len(hits), window)
+    if not len(starts):
+        return starts, np.empty(0)
+    ends = np.minimum(starts + window, len(hits))
+    return ends, np.add.reduceat(hits.astype(np.int64), starts) / (ends - starts)
+
+
+class ReplacementResult:
+    __slots__ = ('policy', 'frames', 'accesses', 'distinct_pages', 'hits', 'snapshots',
+                 'miss_ratio_curve', 'timeline')
+
+    def __init__(self, policy, frames, accesses, distinct_pages, hits, snapshots, miss_ratio_curve, timeline):
+        self.policy = policy
+        self.frames = frames
+        self.accesses = accesses
+        self.distinct_pages = distinct_pages
+        self.hits = hits
+        self.snapshots = snapshots
+        self.miss_ratio_curve = miss_ratio_curve
+        self.timeline = timeline
+
+    @property
+    def miss_ratio(self):
+        return 1.0 - self.hits.mean() if len(self.hits) else 0.0
+
+
+def simulate(references, policy, frames, curve=None):
+    if curve is None:
+        curve = miss_ratio_curve(stack_distances(references))
+    frames = max(1, frames)
+    model = POLICY_CLASSES[policy](frames)
+    count = len(references)
+    frame_ops = max(1, -(-count // MAX_FRAMES))
+    pages = references.tolist()
+    following = next_occurrence(references).tolist() if policy == 'OPT' else None
+    hits = bytearray()
+    snapshots = []
+    for start in range(0, count, frame_ops):
+        end = min(start + frame_ops, count)
+        if following is None:
+            model.run(pages[start:end], hits)
+        else:
+            model.run(pages[start:end], hits, following[start:end])
+        snapshots.append(resident_snapshot(float(end), frames, model.resident()))
+    hits = np.frombuffer(hits, dtype=np.uint8).astype(bool)
+    return ReplacementResult(policy, frames, count, len(curve) - 1, hits, snapshots, curve,
+                             hit_timeline(hits))
@@ -0,0 +1,143 @@
+import functools
+from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QComboBox, QSpinBox, QFileDialog
+from PyQt5.QtCore import QObject, pyqtSignal
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from components.replacement_sim import (POLICIES, synthetic_references, load_references, stack_distances,
+                                        miss_ratio_curve, simulate)
+from components.paging_view import PagingView
+from components.simulation_view import PlaybackView
+
+TRACE_SOURCES = ('Synthetic', 'Trace file (.npy)')
+
+
+class ReplacementFeed(QObject):
+    paging_updated = pyqtSignal(object)
+
+
+class ReplacementView(PlaybackView):
+    def __init__(self):
+        super().__init__()
+        self.feed = ReplacementFeed(self)
+        self.result = None
+        self.trace_cache = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QVBoxLayout()
+
+        self.controls_layout = QHBoxLayout()
+        self.policy_combo = QComboBox()
+        self.policy_combo.addItems(POLICIES)
+        self.policy_combo.setCurrentText('LRU')
+        self.controls_layout.addWidget(self.policy_combo)
+        self.trace_combo = QComboBox()
+        self.trace_combo.addItems(TRACE_SOURCES)
+        self.controls_layout.addWidget(self.trace_combo)
+        self.accesses_spin = QSpinBox()
+        self.accesses_spin.setRange(1000, 100000000)
+        self.accesses_spin.setSingleStep(1000000)
+        self.accesses_spin.setValue(1000000)
+        self.accesses_spin.setSuffix(" accesses")
+        self.controls_layout.addWidget(self.accesses_spin)
+        self.frames_spin = QSpinBox()
+        self.frames_spin.setRange(1, 1 << 24)
+        self.frames_spin.setValue(1024)
+        self.frames_spin.setSuffix(" frames")
+        self.controls_layout.addWidget(self.frames_spin)
+        self.add_run_button(self.controls_layout)
+        self.add_play_button(self.controls_layout)
+        self.layout.addLayout(self.controls_layout)
+
+        self.add_status_label(self.layout, "Choose a policy, trace and frame count, then run the simulation")
+        self.add_frame_slider(self.layout)
+
+        self.figure, self.axes = plt.subplots(1, 2, figsize=(10, 2.5))
+        self.curve_ax, self.timeline_ax = self.axes
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setMaximumHeight(240)
+        self.layout.addWidget(self.canvas)
+        self.curve_line, = self.curve_ax.plot([], [], label='LRU', color='#2196F3')
+        self.policy_marker, = self.curve_ax.plot([], [], 'o', label='Policy', color='#F44336')
+        self.frames_line = self.curve_ax.axvline(1, color='gray', linestyle='--', linewidth=1)
+        self.curve_ax.set_xscale('log')
+        self.curve_ax.set_ylim(0, 1.05)
+        self.curve_ax.set_xlabel('Frames', fontsize=10)
+        self.curve_ax.set_title('Miss Ratio Curve', fontsize=12)
+        self.curve_ax.legend(fontsize=9, loc='upper right')
+        self.timeline_line, = self.timeline_ax.plot([], [], color='#4CAF50')
+        self.cursor_line = self.timeline_ax.axvline(0, color='gray', linestyle='--', linewidth=1)
+        self.timeline_ax.set_ylim(0, 1.05)
+        self.timeline_ax.set_xlabel('Accesses', fontsize=10)
+        self.timeline_ax.set_title('Hit Ratio Over Time', fontsize=12)
+        self.figure.tight_layout()
+
+        self.paging_view = PagingView(self.feed)
+        self.paging_view.title_label.setText("Simulated Resident Set")
+        self.paging_view.dirty.connect(self.dirty)
+        self.layout.addWidget(self.paging_view)
+
+        self.setLayout(self.layout)
+
+    def update_theme(self, style):
+        self.paging_view.update_theme(style)
+        super().update_theme(style)
+
+    def render(self):
+        self.paging_view.render()
+        super().render()
+
+    def trace_loader(self):
+        if self.trace_combo.currentText() == 'Synthetic':
+            count = self.accesses_spin.value()
+            return ('synthetic', count), functools.partial(synthetic_references, count)
+        path, _ = QFileDialog.getOpenFileName(self, "Open page reference trace", filter="NumPy arrays (*.npy)")
+        return ('file', path), path and functools.partial(load_references, path)
+
+    def simulation_job(self):
+        key, load = self.trace_loader()
+        if not load:
+            return None
+        cache = self.trace_cache if self.trace_cache is not None and self.trace_cache[0] == key else None
+        policy, frames = self.policy_combo.currentText(), self.frames_spin.value()
+
+        def job():
+            if cache is None:
+                references = load()
+                curve = miss_ratio_curve(stack_distances(references))
+            else:
+                _, references, curve = cache
+            return (key, references, curve), simulate(references, policy, frames, curve)
+
+        return f"Simulating {policy}...", job
+
+    def show_result(self, outcome):
+        self.trace_cache, result = outcome
+        self.result = result
+        curve = result.miss_ratio_curve
+        lru_miss_ratio = curve[min(result.frames, len(curve) - 1)]
+        self.status_label.setText(
+            f"{result.policy}: {result.accesses:,} accesses over {result.distinct_pages:,} pages | "
+            f"miss ratio {result.miss_ratio:.3f} (LRU {lru_miss_ratio:.3f}) with {result.frames:,} frames")
+        sizes = range(1, len(curve))
+        self.curve_line.set_data(sizes, curve[1:])
+        self.policy_marker.set_data([result.frames], [result.miss_ratio])
+        self.policy_marker.set_label(result.policy)
+        self.frames_line.set_xdata([result.frames] * 2)
+        self.curve_ax.set_xlim(1, max(len(curve) - 1, result.frames, 2))
+        self.curve_ax.legend(fontsize=9, loc='upper right')
+        self.update_theme(self.current_style)
+        ends, ratios = result.timeline
+        self.timeline_line.set_data(ends, ratios)
+        self.timeline_ax.set_xlim(0, max(result.accesses, 1))
+        self.set_frame_count(len(result.snapshots))
+
+    def show_frame(self, index):
+        snapshots = self.result.snapshots if self.result is not None else []
+        if not 0 <= index < len(snapshots) or index == self.frame_index:
+            return
+        self.frame_index = index
+        self.feed.paging_updated.emit(snapshots[index])
+        self.cursor_line.set_xdata([snapshots[index].timestamp] * 2)
+        self.plot_stale = True
+        self.dirty.emit()
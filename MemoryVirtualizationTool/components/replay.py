@@ -0,0 +1,82 @@
+import threading
+import time
+from PyQt5.QtCore import QThread, pyqtSignal
+from components.mailbox import SampleMailbox
+from components.samples import merge_segment_deltas
+from components.recording import SessionReader
+
+
+class ReplaySource(QThread):
+    memory_updated = pyqtSignal(object)
+    processes_updated = pyqtSignal(object)
+    paging_updated = pyqtSignal(object)
+    segmentation_updated = pyqtSignal(object)
+    sample_collected = pyqtSignal(str, object)
+    position_changed = pyqtSignal(float)
+
+    def __init__(self, path, speed=1.0):
+        super().__init__()
+        self.reader = SessionReader(path)
+        self.start_time = self.reader.start_time
+        self.end_time = self.reader.end_time
+        self.speed = speed
+        self._running = False
+        self._seek_to = None
+        self._anchor = None
+        self._wake = threading.Event()
+        self.mailbox = SampleMailbox({
+            'memory': self.memory_updated,
+            'processes': self.processes_updated,
+            'paging': self.paging_updated,
+            'segmentation': self.segmentation_updated
+        }, {'segmentation': merge_segment_deltas}, self)
+
+    def start(self):
+        self._running = True
+        super().start()
+
+    def run(self):
+        position = self.start_time
+        while self._running:
+            self._seek_to = None
+            self._anchor = None
+            for timestamp, kind, payload in self.reader.events(position):
+                if not self._wait_for(timestamp):
+                    break
+                self.sample_collected.emit(kind, payload)
+                self.mailbox.post(kind, payload)
+                if kind == 'memory':
+                    self.position_changed.emit(timestamp)
+            else:
+                while self._running and self._seek_to is None:
+                    self._wake.wait()
+                    self._wake.clear()
+            position = self._seek_to if self._seek_to is not None else position
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        self.wait()
+        self.reader.close()
+
+    def seek(self, timestamp):
+        self._seek_to = min(max(timestamp, self.start_time), self.end_time)
+        self._wake.set()
+
+    def set_speed(self, speed):
+        self.speed = speed
+        self._wake.set()
+
+    def _wait_for(self, timestamp):
+        while self._running and self._seek_to is None:
+            speed = self.speed
+            if speed <= 0:
+                return True
+            if self._anchor is None or self._anchor[2] != speed:
+                self._anchor = (time.monotonic(), timestamp, speed)
+            delay = self._anchor[0] + (timestamp - self._anchor[1]) / speed - time.monotonic()
+            if delay <= 0:
+                return True
+            self._wake.wait(delay)
+            self._wake.clear()
+        return False
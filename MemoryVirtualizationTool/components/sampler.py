@@ -0,0 +1,61 @@
+import os
+import time
+import numpy as np
+import psutil
+from components.procfs import DEFAULT_PROC_ROOT
+from components.paging_collector import PagingCollector, PAGE_PRESENT
+from components.segmentation_collector import SegmentationCollector
+from components.process_collector import ProcessCollector
+from components.fragmentation import FragmentationEngine, system_fragmentation
+from components.working_set import WorkingSetCollector, DEFAULT_SYS_ROOT
+from components.samples import MemorySample, ProcessSnapshot, PagingSnapshot, SegmentationDelta
+
+
+class Sampler:
+    def __init__(self, proc_root=DEFAULT_PROC_ROOT, sys_root=DEFAULT_SYS_ROOT):
+        self.paging_collector = PagingCollector(proc_root)
+        self.paging_pids = [os.getpid()]
+        self.segmentation_collector = SegmentationCollector(proc_root)
+        self.segmentation_pids = [os.getpid()]
+        self.process_collector = ProcessCollector(proc_root)
+        self.fragmentation_engine = FragmentationEngine(proc_root)
+        self.working_set_collector = WorkingSetCollector(proc_root, sys_root)
+
+    def set_paging_pids(self, pids):
+        self.paging_pids = list(pids)
+
+    def set_segmentation_pids(self, pids):
+        self.segmentation_pids = list(pids)
+
+    def sources(self):
+        return {
+            'memory': self.get_memory_info,
+            'processes': self.get_process_info,
+            'paging': self.get_paging_info,
+            'segmentation': self.get_segmentation_info
+        }
+
+    def get_memory_info(self):
+        virtual_mem = psutil.virtual_memory()
+        swap_mem = psutil.swap_memory()
+        return MemorySample(time.time(), virtual_mem.total, virtual_mem.available, virtual_mem.used,
+                            virtual_mem.free, virtual_mem.percent, swap_mem.total, swap_mem.used,
+                            swap_mem.free, swap_mem.percent)
+
+    def get_process_info(self):
+        return ProcessSnapshot(time.time(), self.process_collector.scan())
+
+    def get_paging_info(self):
+        pages = self.paging_collector.scan_processes(self.paging_pids)
+        page_size = self.paging_collector.page_size
+        return PagingSnapshot(time.time(), page_size, psutil.virtual_memory().total // page_size,
+                              int(np.count_nonzero(pages['flags'] & PAGE_PRESENT)), pages)
+
+    def get_segmentation_info(self):
+        added, resized, removed = self.segmentation_collector.collect(self.segmentation_pids)
+        zones = self.fragmentation_engine.zones()
+        return SegmentationDelta(time.time(), added, resized, removed, False,
+                                 psutil.virtual_memory().total // 1024, system_fragmentation(zones), zones)
+
+    def get_working_set_info(self):
+        return self.working_set_collector.collect(self.paging_pids)
@@ -0,0 +1,104 @@
+import numpy as np
+from components.segmentation_collector import SEGMENT_DTYPE
+from components.fragmentation import empty_zones
+
+MEMORY_FIELDS = ('timestamp', 'total', 'available', 'used', 'free', 'percent',
+                 'swap_total', 'swap_used', 'swap_free', 'swap_percent')
+
+
+def frozen(array):
+    array.flags.writeable = False
+    return array
+
+
+class MemorySample:
+    __slots__ = MEMORY_FIELDS
+
+    def __init__(self, timestamp, total, available, used, free, percent,
+                 swap_total, swap_used, swap_free, swap_percent):
+        self.timestamp = timestamp
+        self.total = total
+        self.available = available
+        self.used = used
+        self.free = free
+        self.percent = percent
+        self.swap_total = swap_total
+        self.swap_used = swap_used
+        self.swap_free = swap_free
+        self.swap_percent = swap_percent
+
+
+class ProcessSnapshot:
+    __slots__ = ('timestamp', 'processes')
+
+    def __init__(self, timestamp, processes):
+        self.timestamp = timestamp
+        self.processes = frozen(processes)
+
+
+class PagingSnapshot:
+    __slots__ = ('timestamp', 'page_size', 'total_pages', 'used_pages', 'pages')
+
+    def __init__(self, timestamp, page_size, total_pages, used_pages, pages):
+        self.timestamp = timestamp
+        self.page_size = page_size
+        self.total_pages = total_pages
+        self.used_pages = used_pages
+        self.pages = frozen(pages)
+
+
+class WorkingSetSnapshot:
+    __slots__ = ('timestamp', 'interval', 'page_size', 'pages', 'accessed')
+
+    def __init__(self, timestamp, interval, page_size, pages, accessed):
+        self.timestamp = timestamp
+        self.interval = interval
+        self.page_size = page_size
+        self.pages = frozen(pages)
+        self.accessed = frozen(accessed)
+
+
+class SegmentationDelta:
+    __slots__ = ('timestamp', 'added', 'resized', 'removed', 'reset', 'total_memory', 'fragmentation', 'zones')
+
+    def __init__(self, timestamp, added, resized, removed, reset, total_memory, fragmentation, zones=None):
+        self.timestamp = timestamp
+        self.added = frozen(added)
+        self.resized = frozen(resized)
+        self.removed = frozen(removed)
+        self.reset = reset
+        self.total_memory = total_memory
+        self.fragmentation = fragmentation
+        self.zones = frozen(zones if zones is not None else empty_zones())
+
+    def is_empty(self):
+        return not (self.reset or len(self.added) or len(self.resized) or len(self.removed))
+
+
+def latest_segments(segments):
+    _, index = np.unique(segments['segment_id'][::-1], return_index=True)
+    return segments[::-1][index]
+
+
+def merge_segment_deltas(older, newer):
+    if newer.reset:
+        return newer
+    added = np.concatenate([older.added, newer.added])
+    grows = np.isin(newer.resized['segment_id'], added['segment_id'])
+    added = latest_segments(np.concatenate([added, newer.resized[grows]]))
+    resized = latest_segments(np.concatenate([older.resized, newer.resized[~grows]]))
+    vanished = np.isin(newer.removed, added['segment_id'])
+    return SegmentationDelta(
+        newer.timestamp,
+        added[~np.isin(added['segment_id'], newer.removed)],
+        resized[~np.isin(resized['segment_id'], newer.removed)],
+        np.concatenate([older.removed, newer.removed[~vanished]]),
+        older.reset,
+        newer.total_memory,
+        newer.fragmentation,
+        newer.zones
+    )
+
+
+def empty_segments():
+    return np.empty(0, dtype=SEGMENT_DTYPE)
@@ -0,0 +1,95 @@
+import time
+from components.metrics import REGISTRY
+
+DEFAULT_INTERVALS = {'memory': 1.0, 'processes': 2.0, 'paging': 1.0, 'segmentation': 1.0, 'working_set': 5.0}
+START_DELAYS = {'memory': 0.0, 'paging': 0.25, 'segmentation': 0.25, 'processes': 0.5}
+MAX_DUTY = 0.25
+MAX_BACKOFF = 30.0
+COST_SMOOTHING = 0.3
+
+
+class _Source:
+    def __init__(self, name, collect, interval, start, metrics):
+        self.name = name
+        self.collect = collect
+        self.base_interval = interval
+        self.interval = interval
+        self.deadline = start
+        self.scale = 1.0
+        self.burst_interval = None
+        self.cost = 0.0
+        self.runs = 0
+        self.histogram = metrics.histogram('collector_seconds', "Time spent in each collector call", source=name)
+        metrics.gauge('collector_interval_seconds', "Current sampling interval after backoff",
+                      lambda: self.interval, source=name)
+
+
+class SampleScheduler:
+    def __init__(self, sources, intervals=DEFAULT_INTERVALS, max_duty=MAX_DUTY, max_backoff=MAX_BACKOFF,
+                 metrics=REGISTRY, start_delays=START_DELAYS):
+        self.intervals = intervals
+        self.metrics = metrics
+        self.max_duty = max_duty
+        self.max_backoff = max_backoff
+        self.start_delays = start_delays
+        self.sources = [_Source(name, collect, intervals.get(name, 1.0), 0.0, metrics)
+                        for name, collect in sources.items()]
+        self.restart()
+
+    def restart(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        for source in self.sources:
+            source.deadline = now + self.start_delays.get(source.name, 0.0)
+
+    def wait_time(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        return max(min(source.deadline for source in self.sources) - now, 0.0)
+
+    def run_due(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        for source in sorted(self.sources, key=lambda source: source.deadline):
+            if source.deadline > now:
+                break
+            start = time.monotonic()
+            result = source.collect()
+            finished = time.monotonic()
+            self._reschedule(source, finished - start, finished)
+            yield source.name, result
+
+    def add_source(self, name, collect, interval=None):
+        self.sources.append(_Source(name, collect, interval or self.intervals.get(name, 1.0), time.monotonic(),
+                                    self.metrics))
+
+    def set_scale(self, scale):
+        for source in self.sources:
+            source.scale = scale
+
+    def set_burst(self, names, interval):
+        now = time.monotonic()
+        for source in self.sources:
+            if source.name in names:
+                source.burst_interval = interval
+                source.deadline = min(source.deadline, now)
+
+    def clear_burst(self):
+        for source in self.sources:
+            source.burst_interval = None
+
+    def stats(self):
+        return {source.name: {'interval': source.interval, 'cost': source.cost, 'runs': source.runs}
+                for source in self.sources}
+
+    def _reschedule(self, source, cost, now):
+        source.histogram.observe(cost)
+        source.cost = cost if not source.runs else \
+            COST_SMOOTHING * cost + (1 - COST_SMOOTHING) * source.cost
+        source.runs += 1
+        base = source.burst_interval or source.base_interval * source.scale
+        source.interval = min(max(base, source.cost / self.max_duty), base * self.max_backoff)
+        source.deadline += source.interval
+        if source.deadline <= now:
+            missed = (now - source.deadline) // source.interval + 1
+            source.deadline += missed * source.interval
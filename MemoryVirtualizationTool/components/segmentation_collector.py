@@ -0,0 +1,114 @@
+import itertools
+import numpy as np
+from components.procfs import DEFAULT_PROC_ROOT, proc_path, read_bytes
+
+SEGMENT_TYPES = ('code', 'data', 'heap', 'stack', 'anon', 'file')
+
+SEGMENT_DTYPE = np.dtype([
+    ('segment_id', np.int64),
+    ('base', np.uint64),
+    ('limit', np.uint64),
+    ('type', 'U5'),
+    ('process_id', np.int32),
+])
+
+
+def segments_to_array(segments):
+    return np.array([(s['segment_id'], s['base'], s['limit'], s['type'], s['process_id'])
+                     for s in segments], dtype=SEGMENT_DTYPE)
+
+
+def classify_region(perms, path):
+    if path == '[heap]':
+        return 'heap'
+    if path.startswith('[stack'):
+        return 'stack'
+    if path in ('[vdso]', '[vsyscall]'):
+        return 'code'
+    if not path or path.startswith('['):
+        return 'anon'
+    if 'x' in perms:
+        return 'code'
+    if 'w' in perms:
+        return 'data'
+    return 'file'
+
+
+def parse_maps_line(line):
+    fields = line.split(None, 5)
+    start, _, end = fields[0].partition(b'-')
+    perms = fields[1].decode()
+    path = fields[5].strip().decode(errors='replace') if len(fields) > 5 else ''
+    return int(start, 16), int(end, 16), perms, path
+
+
+class _ProcessMaps:
+    def __init__(self):
+        self.raw = b''
+        self.lines = {}
+        self.segments = {}
+
+
+class SegmentationCollector:
+    def __init__(self, proc_root=DEFAULT_PROC_ROOT):
+        self.proc_root = proc_root
+        self._processes = {}
+        self._ids = itertools.count()
+
+    def collect(self, pids):
+        added, resized, removed = {}, {}, []
+        pids = set(pids)
+        for pid in list(self._processes):
+            if pid not in pids:
+                removed.extend(s['segment_id'] for s in self._processes.pop(pid).segments.values())
+        for pid in pids:
+            try:
+                raw = read_bytes(proc_path(self.proc_root, pid, 'maps'))
+            except (FileNotFoundError, ProcessLookupError, PermissionError):
+                state = self._processes.pop(pid, None)
+                if state is not None:
+                    removed.extend(s['segment_id'] for s in state.segments.values())
+                continue
+            self._diff_process(pid, raw, added, resized, removed)
+        return (segments_to_array(added.values()), segments_to_array(resized.values()),
+                np.array(removed, dtype=np.int64))
+
+    def snapshot(self):
+        return segments_to_array(segment for state in self._processes.values()
+                                 for segment in state.segments.values())
+
+    def _diff_process(self, pid, raw, added, resized, removed):
+        state = self._processes.get(pid)
+        if state is None:
+            state = self._processes[pid] = _ProcessMaps()
+        elif state.raw == raw:
+            return
+        new_lines = set(raw.splitlines())
+        old_lines = state.lines.keys()
+        gone = {state.lines.pop(line) for line in old_lines - new_lines}
+        for line in new_lines - state.lines.keys():
+            if not line.strip():
+                continue
+            start, end, perms, path = parse_maps_line(line)
+            state.lines[line] = start
+            segment = state.segments.get(start)
+            if segment is None:
+                segment = {
+                    'segment_id': next(self._ids),
+                    'base': start // 1024,
+                    'limit': (end - start) // 1024,
+                    'type': classify_region(perms, path),
+                    'process_id': pid
+                }
+                state.segments[start] = segment
+                added[segment['segment_id']] = segment
+            else:
+                segment['limit'] = (end - start) // 1024
+                segment['type'] = classify_region(perms, path)
+                gone.discard(start)
+                if segment['segment_id'] not in added:
+                    resized[segment['segment_id']] = segment
+        for start in gone:
+            segment = state.segments.pop(start)
+            removed.append(segment['segment_id'])
+        state.raw = raw
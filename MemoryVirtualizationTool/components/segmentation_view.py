@@ -1,18 +1,40 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QFrame
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableView, QLineEdit, QComboBox
+from PyQt5.QtCore import Qt, pyqtSignal
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.patches import Rectangle
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+import numpy as np
+from components.segmentation_collector import SEGMENT_DTYPE
+from components.interval_index import IntervalIndex, HOLE_BUCKETS
+from components.fragmentation import ZONE_ORDERS
+from components.table_model import StructuredTableModel
+from components.process_legend import ProcessLegend, LEGEND_LIMITS, legend_limit_label
+
+SEGMENT_COLORS = {'code': '#4CAF50', 'data': '#2196F3', 'stack': '#F44336', 'heap': '#FF9800',
+                  'anon': '#9C27B0', 'file': '#607D8B'}
+SIZE_UNITS = {'B': 1, 'KB': 1024}
 
 class SegmentationView(QWidget):
-    def __init__(self, system_monitor):
+    dirty = pyqtSignal()
+
+    def __init__(self, system_monitor, unit='KB'):
         super().__init__()
         self.system_monitor = system_monitor
+        self.unit = unit
         self.current_style = 'default'
-        self.process_cards = {}
+        self.segment_array = np.zeros(64, dtype=SEGMENT_DTYPE)
+        self.segment_count = 0
+        self.segment_slots = {}
+        self.pid_rows = {}
+        self.interval_index = IntervalIndex()
+        self.segmentation_info = None
+        self.segments_changed = False
+        self.plot_stale = True
+        self.shown_zones = None
         self.init_ui()
-        self.system_monitor.segmentation_updated.connect(self.update_segmentation_info)
+        self.system_monitor.segmentation_updated.connect(self.ingest_segmentation_info)
 
     def init_ui(self):
         self.layout = QVBoxLayout()
@@ -26,99 +48,233 @@ class SegmentationView(QWidget):
         self.info_label.setAlignment(Qt.AlignCenter)
         self.layout.addWidget(self.info_label)
         
-        self.process_container = QWidget()
-        self.process_layout = QHBoxLayout()
-        self.process_container.setLayout(self.process_layout)
-        self.layout.addWidget(self.process_container)
+        self.process_legend = ProcessLegend([SEGMENT_COLORS['code']])
+        self.layout.addWidget(self.process_legend)
         
-        self.segment_table = QTableWidget()
-        self.segment_table.setColumnCount(5)
-        self.segment_table.setHorizontalHeaderLabels(['Segment ID', 'Base', 'Limit', 'Type', 'Process ID'])
+        self.filter_layout = QHBoxLayout()
+        self.pid_filter = QLineEdit()
+        self.pid_filter.setPlaceholderText("Filter by PID")
+        self.pid_filter.textChanged.connect(self.apply_pid_filter)
+        self.filter_layout.addWidget(self.pid_filter)
+        self.legend_limit = QComboBox()
+        self.legend_limit.addItems([legend_limit_label(limit) for limit in LEGEND_LIMITS])
+        self.legend_limit.setCurrentIndex(LEGEND_LIMITS.index(self.process_legend.limit))
+        self.legend_limit.currentIndexChanged.connect(self.change_legend_limit)
+        self.filter_layout.addWidget(self.legend_limit)
+        self.type_filter = QComboBox()
+        self.type_filter.addItems(['All types'] + list(SEGMENT_COLORS))
+        self.type_filter.currentIndexChanged.connect(self.apply_type_filter)
+        self.filter_layout.addWidget(self.type_filter)
+        self.layout.addLayout(self.filter_layout)
+        
+        self.segment_model = StructuredTableModel([
+            ('Segment ID', 'segment_id', lambda segment: str(segment['segment_id'])),
+            ('Base', 'base', lambda segment: str(segment['base'])),
+            ('Limit', 'limit', lambda segment: str(segment['limit'])),
+            ('Type', 'type', lambda segment: str(segment['type'])),
+            ('Process ID', 'process_id', lambda segment: str(segment['process_id'])),
+        ], self)
+        self.segment_table = QTableView()
+        self.segment_table.setModel(self.segment_model)
+        self.segment_table.setSortingEnabled(True)
+        self.segment_table.sortByColumn(-1, Qt.AscendingOrder)
         self.layout.addWidget(self.segment_table)
         
-        self.figure, self.ax = plt.subplots(figsize=(10, 6))
+        self.zone_model = StructuredTableModel([
+            ('Node', 'node', lambda zone: str(zone['node'])),
+            ('Zone', 'zone', lambda zone: str(zone['zone'])),
+            ('Migrate Type', 'migrate_type', lambda zone: str(zone['migrate_type']) or 'All'),
+        ] + [(f'Order {order}', 'fragmentation_index',
+              lambda zone, order=order: f"{zone['fragmentation_index'][order]:.3f}" if order < zone['orders'] else '')
+             for order in range(ZONE_ORDERS)], self)
+        self.zone_table = QTableView()
+        self.zone_table.setModel(self.zone_model)
+        self.zone_table.setToolTip("External fragmentation index per zone and order. -1 means a free block of "
+                                   "that order exists; towards 1 a request fails from fragmentation, towards 0 "
+                                   "from lack of free memory.")
+        self.zone_table.setMaximumHeight(160)
+        self.zone_table.hide()
+        self.layout.addWidget(self.zone_table)
+        
+        self.figure, (self.ax, self.hole_ax) = plt.subplots(
+            2, 1, figsize=(10, 7), gridspec_kw={'height_ratios': [4, 1]})
         self.canvas = FigureCanvas(self.figure)
         self.layout.addWidget(self.canvas)
         
+        self.segment_colors = np.array([to_rgba(color, 0.8)
+                                       for color in list(SEGMENT_COLORS.values()) + ['gray']])
+        self.segment_collection = PolyCollection(np.empty((0, 4, 2)), edgecolor='black', linewidth=0.5)
+        self.ax.add_collection(self.segment_collection)
+        self.ax.set_title('Memory Segmentation', fontsize=14, pad=15)
+        self.ax.axis('off')
+        legend_patches = [Rectangle((0, 0), 1, 1, facecolor=color, label=seg_type)
+                         for seg_type, color in SEGMENT_COLORS.items()]
+        self.ax.legend(handles=legend_patches, loc='upper right', fontsize=10)
+        
+        self.hole_bars = self.hole_ax.bar(np.arange(HOLE_BUCKETS), np.zeros(HOLE_BUCKETS), color='#607D8B')
+        self.hole_ax.set_title('Hole Size Histogram', fontsize=11)
+        self.hole_ax.set_xticks(np.arange(1, HOLE_BUCKETS, 8))
+        self.hole_ax.set_xticklabels([f"2^{bucket - 1}" for bucket in range(1, HOLE_BUCKETS, 8)], fontsize=8)
+        self.hole_ax.tick_params(labelsize=8)
+        
         self.setLayout(self.layout)
 
     def update_theme(self, style):
         self.current_style = style
-        self.update_segmentation_info(self.system_monitor.get_segmentation_info())
+        dark = style == 'dark_background'
+        edge_color = '#FFFFFF' if dark else 'black'
+        text_color = 'white' if dark else 'black'
+        self.figure.patch.set_facecolor('#2B2B2B' if dark else '#FFFFFF')
+        self.ax.title.set_color(text_color)
+        self.hole_ax.set_facecolor('#2B2B2B' if dark else '#FFFFFF')
+        self.hole_ax.title.set_color(text_color)
+        self.hole_ax.tick_params(colors=text_color)
+        for spine in self.hole_ax.spines.values():
+            spine.set_color(text_color)
+        legend = self.ax.get_legend()
+        legend.get_frame().set_facecolor('#3C3C3C' if dark else '#FFFFFF')
+        for text in legend.get_texts():
+            text.set_color(text_color)
+        self.segment_collection.set_edgecolor(edge_color)
+        self.process_legend.set_dark(dark)
+        self.plot_stale = True
+        self.dirty.emit()
+
+    def ingest_segmentation_info(self, segmentation_info):
+        self.apply_segment_deltas(segmentation_info)
+        self.dirty.emit()
 
     def update_segmentation_info(self, segmentation_info):
-        self.info_label.setText(
-            f"Total Memory: {segmentation_info['total_memory']} KB | "
-            f"Fragmentation: {segmentation_info['fragmentation']:.2f}"
-        )
-        
-        unique_processes = set(segment['process_id'] for segment in segmentation_info['segments'])
-        current_pids = set(self.process_cards.keys())
-        
-        for pid in current_pids - unique_processes:
-            card = self.process_cards.pop(pid)
-            self.process_layout.removeWidget(card)
-            card.deleteLater()
-        
-        colors = {'code': '#4CAF50', 'data': '#2196F3', 'stack': '#F44336', 'heap': '#FF9800'}
-        for pid in unique_processes - current_pids:
-            card = QFrame()
-            card.setObjectName("processCard")
-            card_layout = QVBoxLayout()
-            card_label = QLabel(f"Process {pid}")
-            card_label.setAlignment(Qt.AlignCenter)
-            card_color = QWidget()
-            card_color.setFixedSize(20, 20)
-            card_color.setStyleSheet(f"background-color: #4CAF50;")
-            card_layout.addWidget(card_label)
-            card_layout.addWidget(card_color)
-            card.setLayout(card_layout)
-            card.setFixedSize(100, 80)
-            self.process_cards[pid] = card
-            self.process_layout.addWidget(card)
-        self.process_layout.addStretch()
-        
-        self.segment_table.setRowCount(len(segmentation_info['segments']))
-        bg_color = QColor('#333333') if self.current_style == 'dark_background' else QColor('#FFFFFF')
-        for row, segment in enumerate(segmentation_info['segments']):
-            for col, value in enumerate([str(segment['segment_id']), str(segment['base']),
-                                       str(segment['limit']), segment['type'], str(segment['process_id'])]):
-                item = QTableWidgetItem(value)
-                item.setBackground(bg_color)
-                self.segment_table.setItem(row, col, item)
-        
-        plt.style.use(self.current_style)
-        self.figure.patch.set_facecolor('#2B2B2B' if self.current_style == 'dark_background' else '#FFFFFF')
-        self.ax.clear()
-        
-        total_memory = segmentation_info['total_memory']
-        bg_color = '#333333' if self.current_style == 'dark_background' else 'lightgray'
-        edge_color = '#FFFFFF' if self.current_style == 'dark_background' else 'black'
-        text_color = 'white' if self.current_style == 'dark_background' else 'black'
-        
-        self.ax.add_patch(Rectangle((0, 0), total_memory, 1, facecolor=bg_color, edgecolor=edge_color))
-        
-        for segment in segmentation_info['segments']:
-            segment_rect = Rectangle(
-                (segment['base'], 0), segment['limit'], 0.8,
-                facecolor=colors.get(segment['type'], 'gray'),
-                edgecolor=edge_color, alpha=0.8
-            )
-            self.ax.add_patch(segment_rect)
-            self.ax.text(
-                segment['base'] + segment['limit']/2, 0.4,
-                f"PID:{segment['process_id']}\n{segment['type']}\n{segment['limit']}K",
-                ha='center', va='center', fontsize=8, color=text_color
+        self.apply_segment_deltas(segmentation_info)
+        self.render()
+
+    def apply_segment_deltas(self, segmentation_info):
+        self.segmentation_info = segmentation_info
+        if segmentation_info.reset:
+            self.segment_count = 0
+            self.segment_slots.clear()
+            self.pid_rows.clear()
+            self.interval_index.clear()
+        for segment_id in segmentation_info.removed.tolist():
+            self.remove_segment(segment_id)
+        self.add_segments(segmentation_info.added)
+        self.resize_segments(segmentation_info.resized)
+        if not segmentation_info.is_empty():
+            self.segments_changed = True
+
+    def render(self):
+        if self.segmentation_info is not None:
+            self.info_label.setText(
+                f"Total Memory: {self.segmentation_info.total_memory} {self.unit} | "
+                f"Fragmentation: {self.segmentation_info.fragmentation:.2f} | "
+                f"Holes: {self.interval_index.hole_count} | "
+                f"Largest Hole: {self.interval_index.largest_hole()} {self.unit}"
             )
+            self.update_zone_table(self.segmentation_info.zones)
         
-        self.ax.set_xlim(0, total_memory)
-        self.ax.set_ylim(0, 1)
-        self.ax.set_title('Memory Segmentation', fontsize=14, pad=15)
-        self.ax.axis('off')
+        if self.segments_changed:
+            self.segments_changed = False
+            self.segment_model.set_array(self.segment_array[:self.segment_count].copy())
+            self.refresh_plot()
+            self.plot_stale = True
         
-        legend_patches = [Rectangle((0, 0), 1, 1, facecolor=color, label=seg_type) 
-                         for seg_type, color in colors.items()]
-        if legend_patches:
-            self.ax.legend(handles=legend_patches, loc='upper right', fontsize=10)
+        if self.plot_stale:
+            self.plot_stale = False
+            self.canvas.draw()
+
+    def update_zone_table(self, zones):
+        if zones is self.shown_zones:
+            return
+        self.shown_zones = zones
+        self.zone_table.setVisible(bool(len(zones)))
+        if not len(zones):
+            return
+        self.zone_model.set_array(zones)
+        orders = int(zones['orders'].max())
+        for order in range(ZONE_ORDERS):
+            self.zone_table.setColumnHidden(3 + order, order >= orders)
+
+    def apply_pid_filter(self, text):
+        text = text.strip()
+        self.segment_model.set_filter('process_id', int(text) if text.isdigit() else None)
+        self.process_legend.set_filter(text)
+
+    def change_legend_limit(self, index):
+        self.process_legend.set_limit(LEGEND_LIMITS[index])
+
+    def apply_type_filter(self, index):
+        self.segment_model.set_filter('type', self.type_filter.itemText(index) if index else None)
+
+    def add_segments(self, segments):
+        known = np.array([segment_id in self.segment_slots
+                          for segment_id in segments['segment_id'].tolist()], dtype=bool)
+        if known.any():
+            self.resize_segments(segments[known])
+            segments = segments[~known]
+        if not len(segments):
+            return
+        start, end = self.segment_count, self.segment_count + len(segments)
+        if end > len(self.segment_array):
+            self.segment_array = np.resize(self.segment_array, max(2 * len(self.segment_array), end))
+        self.segment_array[start:end] = segments
+        for pid, base, limit in zip(segments['process_id'].tolist(), segments['base'].tolist(),
+                                    segments['limit'].tolist()):
+            self.interval_index.insert(pid, base, base + limit)
+        self.segment_slots.update(zip(segments['segment_id'].tolist(), range(start, end)))
+        for pid in segments['process_id'].tolist():
+            self.pid_rows.setdefault(pid, len(self.pid_rows))
+        self.segment_count = end
+
+    def resize_segments(self, segments):
+        slots = [self.segment_slots.get(segment_id) for segment_id in segments['segment_id'].tolist()]
+        missing = np.array([slot is None for slot in slots], dtype=bool)
+        if missing.any():
+            self.add_segments(segments[missing])
+            segments = segments[~missing]
+            slots = [slot for slot in slots if slot is not None]
+        self.segment_array['limit'][slots] = segments['limit']
+        for slot, limit in zip(slots, segments['limit'].tolist()):
+            base = int(self.segment_array['base'][slot])
+            self.interval_index.resize(int(self.segment_array['process_id'][slot]), base, base + limit)
+        self.segment_array['type'][slots] = segments['type']
+
+    def remove_segment(self, segment_id):
+        slot = self.segment_slots.pop(segment_id, None)
+        if slot is None:
+            return
+        pid = int(self.segment_array['process_id'][slot])
+        self.interval_index.remove(pid, int(self.segment_array['base'][slot]))
         
-        self.canvas.draw()
+        last = self.segment_count - 1
+        if slot != last:
+            self.segment_array[slot] = self.segment_array[last]
+            self.segment_slots[int(self.segment_array['segment_id'][slot])] = slot
+        self.segment_count = last
+
+    def refresh_plot(self):
+        segments = self.segment_array[:self.segment_count]
+        pids, pid_index = np.unique(segments['process_id'], return_inverse=True)
+        live = sorted(pids.tolist(), key=self.pid_rows.__getitem__)
+        self.pid_rows = dict(zip(live, range(len(live))))
+        lanes = np.array([self.pid_rows[pid] for pid in pids.tolist()], dtype=float)[pid_index]
+        sizes = np.bincount(pid_index, weights=segments['limit'], minlength=len(pids))
+        self.process_legend.set_processes(pids, sizes.astype(np.uint64) * SIZE_UNITS[self.unit])
+        x0 = segments['base'].astype(float)
+        x1 = x0 + segments['limit']
+        y0 = lanes + 0.1
+        y1 = y0 + 0.8
+        verts = np.stack([np.column_stack([x0, y0]), np.column_stack([x0, y1]),
+                          np.column_stack([x1, y1]), np.column_stack([x1, y0])], axis=1)
+        color_index = np.full(len(segments), len(SEGMENT_COLORS))
+        for i, seg_type in enumerate(SEGMENT_COLORS):
+            color_index[segments['type'] == seg_type] = i
+        self.segment_collection.set_verts(verts)
+        self.segment_collection.set_facecolor(self.segment_colors[color_index])
+        if len(segments):
+            start, end = x0.min(), x1.max()
+            self.ax.set_xlim(start, max(end, start + 1))
+        self.ax.set_ylim(0, max(len(self.pid_rows), 1))
+        histogram = self.interval_index.histogram
+        for bar, count in zip(self.hole_bars, histogram.tolist()):
+            bar.set_height(count)
+        self.hole_ax.set_ylim(0, max(int(histogram.max()), 1))
@@ -0,0 +1,18 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class SimulationRunner(QThread):
+    completed = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+        self.job = job
+
+    def run(self):
+        try:
+            result = self.job()
+        except (OSError, ValueError, KeyError) as error:
+            self.failed.emit(str(error))
+            return
+        self.completed.emit(result)
@@ -0,0 +1,137 @@
+from PyQt5.QtWidgets import QWidget, QLabel, QPushButton, QSlider
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from components.simulation_runner import SimulationRunner
+
+PLAYBACK_INTERVAL_MS = 50
+
+
+class SimulationView(QWidget):
+    dirty = pyqtSignal()
+
+    def __init__(self):
+        super().__init__()
+        self.current_style = 'default'
+        self.runner = None
+        self.figure = None
+        self.axes = ()
+        self.plot_stale = True
+
+    def add_run_button(self, layout):
+        self.run_button = QPushButton("Run")
+        self.run_button.clicked.connect(self.run_simulation)
+        layout.addWidget(self.run_button)
+
+    def add_status_label(self, layout, text):
+        self.status_label = QLabel(text)
+        self.status_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.status_label)
+
+    def update_theme(self, style):
+        self.current_style = style
+        dark = style == 'dark_background'
+        text_color = 'white' if dark else 'black'
+        face_color = '#2B2B2B' if dark else '#FFFFFF'
+        self.figure.patch.set_facecolor(face_color)
+        for ax in self.axes:
+            ax.set_facecolor(face_color)
+            ax.title.set_color(text_color)
+            ax.xaxis.label.set_color(text_color)
+            ax.tick_params(colors=text_color)
+            for spine in ax.spines.values():
+                spine.set_color(text_color)
+            legend = ax.get_legend()
+            if legend is not None:
+                legend.get_frame().set_facecolor('#3C3C3C' if dark else '#FFFFFF')
+                for text in legend.get_texts():
+                    text.set_color(text_color)
+        self.plot_stale = True
+        self.dirty.emit()
+
+    def render(self):
+        if self.plot_stale:
+            self.plot_stale = False
+            self.canvas.draw()
+
+    def run_simulation(self):
+        if self.runner is not None:
+            return
+        job = self.simulation_job()
+        if job is not None:
+            self.start_simulation(*job)
+
+    def start_simulation(self, message, job):
+        self.run_button.setEnabled(False)
+        self.status_label.setText(message)
+        self.runner = SimulationRunner(job, self)
+        self.runner.completed.connect(self.show_result)
+        self.runner.failed.connect(self.show_error)
+        self.runner.finished.connect(self.runner_finished)
+        self.runner.start()
+
+    def runner_finished(self):
+        self.runner.deleteLater()
+        self.runner = None
+        self.run_button.setEnabled(True)
+
+    def show_error(self, message):
+        self.status_label.setText(f"Simulation failed: {message}")
+
+    def stop(self):
+        if self.runner is not None:
+            self.runner.wait()
+
+
+class PlaybackView(SimulationView):
+    def __init__(self):
+        super().__init__()
+        self.frame_index = -1
+
+    def add_play_button(self, layout):
+        self.play_button = QPushButton("Play")
+        self.play_button.setEnabled(False)
+        self.play_button.clicked.connect(self.toggle_playback)
+        layout.addWidget(self.play_button)
+        self.playback_timer = QTimer(self)
+        self.playback_timer.setInterval(PLAYBACK_INTERVAL_MS)
+        self.playback_timer.timeout.connect(self.step_playback)
+
+    def add_frame_slider(self, layout):
+        self.frame_slider = QSlider(Qt.Horizontal)
+        self.frame_slider.setEnabled(False)
+        self.frame_slider.valueChanged.connect(self.show_frame)
+        layout.addWidget(self.frame_slider)
+
+    def set_frame_count(self, count):
+        self.frame_index = -1
+        self.frame_slider.blockSignals(True)
+        self.frame_slider.setRange(0, max(count - 1, 0))
+        self.frame_slider.setValue(count - 1)
+        self.frame_slider.blockSignals(False)
+        self.frame_slider.setEnabled(bool(count))
+        self.play_button.setEnabled(bool(count))
+        self.show_frame(self.frame_slider.value())
+
+    def start_simulation(self, message, job):
+        self.playback_timer.stop()
+        self.play_button.setText("Play")
+        super().start_simulation(message, job)
+
+    def toggle_playback(self):
+        if self.playback_timer.isActive():
+            self.playback_timer.stop()
+            self.play_button.setText("Play")
+            return
+        if self.frame_slider.value() == self.frame_slider.maximum():
+            self.frame_slider.setValue(0)
+        self.playback_timer.start()
+        self.play_button.setText("Pause")
+
+    def step_playback(self):
+        if self.frame_slider.value() >= self.frame_slider.maximum():
+            self.toggle_playback()
+            return
+        self.frame_slider.setValue(self.frame_slider.value() + 1)
+
+    def stop(self):
+        self.playback_timer.stop()
+        super().stop()
@@ -0,0 +1,51 @@
+import time
+from PyQt5.QtWidgets import QStatusBar, QLabel
+from PyQt5.QtCore import QTimer
+from components.metrics import REGISTRY
+
+PROBE_INTERVAL = 0.25
+REFRESH_INTERVAL = 1.0
+
+
+class StatsBar(QStatusBar):
+    def __init__(self, registry=REGISTRY, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.loop_lag = registry.histogram('event_loop_lag_seconds',
+                                           "How late a periodic GUI timer fires, a proxy for Qt event backlog")
+        self.stats_label = QLabel()
+        self.addPermanentWidget(self.stats_label, 1)
+        self.last_probe = time.monotonic()
+        self.last_cpu = (self.last_probe, time.process_time())
+        self.cpu_usage = 0.0
+
+        self.probe_timer = QTimer(self)
+        self.probe_timer.setInterval(int(PROBE_INTERVAL * 1000))
+        self.probe_timer.timeout.connect(self.probe)
+        self.probe_timer.start()
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(int(REFRESH_INTERVAL * 1000))
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start()
+
+    def probe(self):
+        now = time.monotonic()
+        self.loop_lag.observe(max(now - self.last_probe - PROBE_INTERVAL, 0.0))
+        self.last_probe = now
+
+    def p99_ms(self, name):
+        return self.registry.merged(name).quantile(0.99) * 1000
+
+    def refresh(self):
+        now, cpu = time.monotonic(), time.process_time()
+        self.cpu_usage = (cpu - self.last_cpu[1]) / max(now - self.last_cpu[0], 1e-6)
+        self.last_cpu = (now, cpu)
+        if not self.isVisible():
+            return
+        dropped = sum(value for _, value in self.registry.read_gauges('mailbox_dropped_total'))
+        self.stats_label.setText(
+            f"Collect p99 {self.p99_ms('collector_seconds'):.1f} ms | "
+            f"Render p99 {self.p99_ms('render_seconds'):.1f} ms | "
+            f"Sample to paint p99 {self.p99_ms('delivery_latency_seconds'):.0f} ms | "
+            f"Event loop lag p99 {self.p99_ms('event_loop_lag_seconds'):.1f} ms | "
+            f"Dropped samples {dropped:.0f} | CPU {self.cpu_usage:.0%}")
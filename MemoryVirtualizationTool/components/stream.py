@@ -0,0 +1,178 @@
+import collections
+import os
+import selectors
+import socket
+import tempfile
+from components.recording import CHUNK_HEADER, FILE_HEADER, FORMAT_VERSION, MAGIC
+
+DEFAULT_ADDRESS = os.path.join(tempfile.gettempdir(), 'memory-visualization.sock')
+MAX_PENDING_BYTES = 256 << 20
+
+
+def parse_address(address):
+    host, separator, port = address.rpartition(':')
+    if separator and port.isdigit() and '/' not in address:
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_UNIX, address
+
+
+def connect(address):
+    family, target = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    try:
+        sock.connect(target)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def recv_exactly(sock, size):
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:])
+        if not n:
+            raise ConnectionError("collector closed the connection")
+        received += n
+    return buffer
+
+
+def read_frames(sock):
+    magic, version = FILE_HEADER.unpack(recv_exactly(sock, FILE_HEADER.size))
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("peer is not a compatible memory collector")
+    while True:
+        kind, count, _, _, payload_size = CHUNK_HEADER.unpack(recv_exactly(sock, CHUNK_HEADER.size))
+        yield kind, count, recv_exactly(sock, payload_size)
+
+
+class _Client:
+    def __init__(self, sock):
+        self.socket = sock
+        self.pending = collections.deque()
+        self.pending_bytes = 0
+
+
+class StreamServer:
+    def __init__(self, address=DEFAULT_ADDRESS, keyframes=None, max_pending=MAX_PENDING_BYTES):
+        family, target = parse_address(address)
+        if family == socket.AF_UNIX and os.path.exists(target):
+            try:
+                connect(address).close()
+            except OSError:
+                os.unlink(target)
+            else:
+                raise OSError(f"a collector is already listening on {address}")
+        self.address = address
+        self.keyframes = keyframes
+        self.max_pending = max_pending
+        self.listener = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_INET:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(target)
+        self.listener.listen()
+        self.listener.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.clients = {}
+
+    def add_reader(self, fileobj, callback):
+        self.selector.register(fileobj, selectors.EVENT_READ, callback)
+
+    def poll(self, timeout):
+        for key, mask in self.selector.select(max(timeout, 0)):
+            if key.fileobj is self.listener:
+                self._accept()
+                continue
+            if key.data is not None:
+                key.data()
+                continue
+            client = self.clients.get(key.fileobj)
+            if client is None:
+                continue
+            if mask & selectors.EVENT_READ:
+                try:
+                    alive = bool(client.socket.recv(4096))
+                except OSError:
+                    alive = False
+                if not alive:
+                    self._drop(client)
+                    continue
+            if mask & selectors.EVENT_WRITE:
+                self._flush(client)
+
+    def broadcast(self, chunks):
+        frames = [b''.join(buffers) for *_, buffers in chunks]
+        for client in list(self.clients.values()):
+            for frame in frames:
+                if not self._send(client, frame):
+                    break
+
+    def close(self):
+        for client in list(self.clients.values()):
+            self._drop(client)
+        self.selector.close()
+        self.listener.close()
+        family, target = parse_address(self.address)
+        if family == socket.AF_UNIX and os.path.exists(target):
+            os.unlink(target)
+
+    def _accept(self):
+        try:
+            sock, _ = self.listener.accept()
+        except BlockingIOError:
+            return
+        sock.setblocking(False)
+        client = self.clients[sock] = _Client(sock)
+        self.selector.register(sock, selectors.EVENT_READ)
+        if self._send(client, FILE_HEADER.pack(MAGIC, FORMAT_VERSION)) and self.keyframes is not None:
+            for *_, buffers in self.keyframes():
+                if not self._send(client, b''.join(buffers)):
+                    break
+
+    def _send(self, client, frame):
+        if client.socket not in self.clients:
+            return False
+        view = memoryview(frame)
+        if not client.pending:
+            try:
+                view = view[client.socket.send(view):]
+            except BlockingIOError:
+                pass
+            except OSError:
+                self._drop(client)
+                return False
+            if not view:
+                return True
+            self.selector.modify(client.socket, selectors.EVENT_READ | selectors.EVENT_WRITE)
+        client.pending.append(view)
+        client.pending_bytes += len(view)
+        if client.pending_bytes > self.max_pending:
+            self._drop(client)
+            return False
+        return True
+
+    def _flush(self, client):
+        while client.pending:
+            view = client.pending[0]
+            try:
+                sent = client.socket.send(view)
+            except BlockingIOError:
+                return
+            except OSError:
+                self._drop(client)
+                return
+            client.pending_bytes -= sent
+            if sent < len(view):
+                client.pending[0] = view[sent:]
+                return
+            client.pending.popleft()
+        self.selector.modify(client.socket, selectors.EVENT_READ)
+
+    def _drop(self, client):
+        if self.clients.pop(client.socket, None) is None:
+            return
+        self.selector.unregister(client.socket)
+        client.socket.close()
@@ -1,76 +1,70 @@
-import psutil
 from PyQt5.QtCore import QThread, pyqtSignal
-import time
+import threading
+from components.procfs import DEFAULT_PROC_ROOT
+from components.sampler import Sampler
+from components.scheduler import SampleScheduler
+from components.mailbox import SampleMailbox
+from components.samples import merge_segment_deltas
+from components.pressure import PressureWatcher, open_pressure_triggers
 
 class SystemMonitor(QThread):
-    memory_updated = pyqtSignal(dict)
-    paging_updated = pyqtSignal(dict)
-    segmentation_updated = pyqtSignal(dict)
+    memory_updated = pyqtSignal(object)
+    processes_updated = pyqtSignal(object)
+    paging_updated = pyqtSignal(object)
+    segmentation_updated = pyqtSignal(object)
+    working_set_updated = pyqtSignal(object)
+    sample_collected = pyqtSignal(str, object)
 
-    def __init__(self):
+    def __init__(self, proc_root=DEFAULT_PROC_ROOT):
         super().__init__()
         self._running = False
+        self._wake = threading.Event()
+        self.sampler = Sampler(proc_root)
+        self.scheduler = SampleScheduler(self.sampler.sources())
+        self.pressure = None
+        self.mailbox = SampleMailbox({
+            'memory': self.memory_updated,
+            'processes': self.processes_updated,
+            'paging': self.paging_updated,
+            'segmentation': self.segmentation_updated,
+            'working_set': self.working_set_updated
+        }, {'segmentation': merge_segment_deltas}, self)
 
-    def run(self):
+    def start(self):
         self._running = True
+        super().start()
+
+    def run(self):
+        self.scheduler.restart()
         while self._running:
-            memory_info = self.get_memory_info()
-            self.memory_updated.emit(memory_info)
-            paging_info = self.get_paging_info()
-            self.paging_updated.emit(paging_info)
-            segmentation_info = self.get_segmentation_info()
-            self.segmentation_updated.emit(segmentation_info)
-            time.sleep(1)
+            for kind, payload in self.scheduler.run_due():
+                self.sample_collected.emit(kind, payload)
+                self.mailbox.post(kind, payload)
+            if self.pressure is not None:
+                self.pressure.wait(self.scheduler.wait_time())
+            else:
+                self._wake.wait(self.scheduler.wait_time())
+                self._wake.clear()
 
     def stop(self):
         self._running = False
+        self._wake.set()
+        if self.pressure is not None:
+            self.pressure.wake()
         self.wait()
+        self.sampler.process_collector.shutdown()
+        if self.pressure is not None:
+            self.pressure.close()
+
+    def enable_pressure(self, cgroups=()):
+        self.pressure = PressureWatcher(self.scheduler, open_pressure_triggers(cgroups))
 
-    def get_memory_info(self):
-        virtual_mem = psutil.virtual_memory()
-        swap_mem = psutil.swap_memory()
-        return {
-            'total': virtual_mem.total,
-            'available': virtual_mem.available,
-            'used': virtual_mem.used,
-            'free': virtual_mem.free,
-            'percent': virtual_mem.percent,
-            'swap_total': swap_mem.total,
-            'swap_used': swap_mem.used,
-            'swap_free': swap_mem.free,
-            'swap_percent': swap_mem.percent
-        }
+    def enable_working_set(self):
+        self.sampler.working_set_collector.check_available()
+        self.scheduler.add_source('working_set', self.sampler.get_working_set_info)
 
-    def get_paging_info(self):
-        import random
-        pages = []
-        for i in range(10):
-            pages.append({
-                'page_id': i,
-                'in_physical': random.random() > 0.3,
-                'physical_address': random.randint(0, 1000) if random.random() > 0.3 else None,
-                'process_id': random.randint(1, 5)
-            })
-        return {
-            'page_size': 4096,
-            'total_pages': 100,
-            'used_pages': random.randint(30, 70),
-            'pages': pages
-        }
+    def set_paging_pids(self, pids):
+        self.sampler.set_paging_pids(pids)
 
-    def get_segmentation_info(self):
-        import random
-        segments = []
-        for i in range(5):
-            segments.append({
-                'segment_id': i,
-                'base': random.randint(0, 10000),
-                'limit': random.randint(100, 1000),
-                'type': random.choice(['code', 'data', 'stack', 'heap']),
-                'process_id': random.randint(1, 5)
-            })
-        return {
-            'segments': segments,
-            'total_memory': 16384,
-            'fragmentation': random.random()
-        }
+    def set_segmentation_pids(self, pids):
+        self.sampler.set_segmentation_pids(pids)
@@ -0,0 +1,107 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+import numpy as np
+from components.arrays import as_void
+
+MAX_CHANGED_RUNS = 64
+
+
+class StructuredTableModel(QAbstractTableModel):
+    def __init__(self, columns, parent=None):
+        super().__init__(parent)
+        self.columns = columns
+        self._array = None
+        self._order = np.empty(0, dtype=np.intp)
+        self._filters = {}
+        self._sort_column = None
+        self._sort_order = Qt.AscendingOrder
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        _, _, formatter = self.columns[index.column()]
+        return formatter(self._array[self._order[index.row()]])
+
+    def record(self, row):
+        return self._array[self._order[row]]
+
+    def set_array(self, array):
+        old_rows = self._array[self._order] if self._array is not None else None
+        self._array = array
+        order = self._compute_order()
+        if old_rows is None or old_rows.dtype != array.dtype:
+            self.beginResetModel()
+            self._order = order
+            self.endResetModel()
+            return
+
+        old_count, new_count = len(old_rows), len(order)
+        common = min(old_count, new_count)
+        if new_count < old_count:
+            self.beginRemoveRows(QModelIndex(), new_count, old_count - 1)
+            self._order = order
+            self.endRemoveRows()
+        elif new_count > old_count:
+            self.beginInsertRows(QModelIndex(), old_count, new_count - 1)
+            self._order = order
+            self.endInsertRows()
+        else:
+            self._order = order
+
+        if common:
+            changed = np.flatnonzero(as_void(array[order[:common]]) != as_void(old_rows[:common]))
+            self._emit_changed_runs(changed)
+
+    def set_filter(self, field, value):
+        if value is None:
+            self._filters.pop(field, None)
+        else:
+            self._filters[field] = value
+        self._relayout()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self._sort_column = column if column >= 0 else None
+        self._sort_order = order
+        self._relayout()
+
+    def _relayout(self):
+        if self._array is None:
+            return
+        self.beginResetModel()
+        self._order = self._compute_order()
+        self.endResetModel()
+
+    def _compute_order(self):
+        array = self._array
+        mask = None
+        for field, value in self._filters.items():
+            match = array[field] == value
+            mask = match if mask is None else mask & match
+        order = np.flatnonzero(mask) if mask is not None else np.arange(len(array))
+        if self._sort_column is not None:
+            field = self.columns[self._sort_column][1]
+            order = order[np.argsort(array[field][order], kind='stable')]
+            if self._sort_order == Qt.DescendingOrder:
+                order = order[::-1]
+        return order
+
+    def _emit_changed_runs(self, rows):
+        if not rows.size:
+            return
+        last_column = len(self.columns) - 1
+        breaks = np.flatnonzero(np.diff(rows) != 1) + 1
+        if len(breaks) >= MAX_CHANGED_RUNS:
+            self.dataChanged.emit(self.index(int(rows[0]), 0), self.index(int(rows[-1]), last_column))
+            return
+        for run in np.split(rows, breaks):
+            self.dataChanged.emit(self.index(int(run[0]), 0), self.index(int(run[-1]), last_column))
@@ -0,0 +1,139 @@
+import numpy as np
+from components.paging_collector import PagingCollector, PAGE_PRESENT
+from components.replacement_sim import stack_distances
+
+PAGE_SHIFTS = {'4K': 12, '2M': 21, '1G': 30}
+MODES = ('4K', 'THP', '2M', '1G')
+LEVEL_BITS = 9
+TABLE_SIZE = 4096
+DEFAULT_LEVELS = 4
+DEFAULT_TLB_ENTRIES = 1536
+DEFAULT_TLB_WAYS = 12
+THP_MIN_PAGES = 256
+BATCH_ACCESSES = 1 << 20
+
+TRANSLATION_DTYPE = np.dtype([
+    ('mode', 'U4'),
+    ('accesses', np.int64),
+    ('hits', np.int64),
+    ('hit_rate', np.float64),
+    ('walks', np.int64),
+    ('walk_references', np.int64),
+    ('table_pages', np.int64),
+    ('table_bytes', np.int64),
+    ('mapped_bytes', np.int64),
+])
+
+
+def synthetic_addresses(count, working_set=256 << 20, seed=0, stream_fraction=0.3):
+    rng = np.random.default_rng(seed)
+    base = np.uint64(0x7f0000000000)
+    pages = working_set >> 12
+    addresses = ((rng.zipf(1.1, count) - 1) % pages).astype(np.uint64) << np.uint64(12)
+    addresses |= rng.integers(0, 4096, count, dtype=np.uint64)
+    streaming = rng.random(count) < stream_fraction
+    addresses[streaming] = (np.arange(count, dtype=np.uint64)[streaming] * np.uint64(64)) % np.uint64(working_set)
+    return addresses + base
+
+
+def process_addresses(pid, count, seed=0, proc_root=None):
+    collector = PagingCollector(proc_root) if proc_root else PagingCollector()
+    pages = collector.scan(pid)
+    vpns = pages['vpn'][(pages['flags'] & PAGE_PRESENT) != 0]
+    if not vpns.size:
+        raise ValueError(f"no resident pages readable for PID {pid}")
+    rng = np.random.default_rng(seed)
+    page_size = np.uint64(collector.page_size)
+    return rng.choice(vpns, count) * page_size + rng.integers(0, int(page_size), count, dtype=np.uint64)
+
+
+def load_addresses(path):
+    addresses = np.load(path)
+    if addresses.dtype.kind not in 'iu' or addresses.ndim != 1:
+        raise ValueError(f"{path} is not a one-dimensional array of addresses")
+    return addresses.astype(np.uint64)
+
+
+def page_shifts(addresses, mode, thp_min_pages=THP_MIN_PAGES):
+    if mode in PAGE_SHIFTS:
+        return np.full(len(addresses), PAGE_SHIFTS[mode], dtype=np.uint64)
+    regions, inverse = np.unique(addresses >> np.uint64(21), return_inverse=True)
+    small_pages = np.unique(addresses >> np.uint64(12))
+    touched = np.bincount(np.searchsorted(regions, small_pages >> np.uint64(LEVEL_BITS)), minlength=len(regions))
+    return np.where(touched[inverse] >= thp_min_pages, 21, 12).astype(np.uint64)
+
+
+def translation_keys(addresses, shifts):
+    return ((addresses >> shifts) << np.uint64(2) | (shifts - np.uint64(12)) // np.uint64(LEVEL_BITS)).astype(np.int64)
+
+
+def walk_references(levels, shifts):
+    return levels - ((shifts.astype(np.int64) - 12) // LEVEL_BITS)
+
+
+def page_table_pages(addresses, shifts, levels):
+    tables = 1
+    if levels == 5:
+        tables += len(np.unique(addresses >> np.uint64(48)))
+    tables += len(np.unique(addresses >> np.uint64(39)))
+    tables += len(np.unique(addresses[shifts < 30] >> np.uint64(30)))
+    tables += len(np.unique(addresses[shifts < 21] >> np.uint64(21)))
+    return tables
+
+
+def mapped_bytes(addresses, shifts):
+    total = 0
+    for shift in np.unique(shifts).tolist():
+        total += len(np.unique(addresses[shifts == shift] >> np.uint64(shift))) << shift
+    return total
+
+
+class TLB:
+    def __init__(self, entries=DEFAULT_TLB_ENTRIES, ways=DEFAULT_TLB_WAYS):
+        self.ways = max(1, min(ways, entries))
+        self.sets = max(1, entries // self.ways)
+        self.resident = np.empty(0, dtype=np.int64)
+
+    def set_index(self, keys):
+        return (keys >> 2) % self.sets
+
+    def lookup(self, keys):
+        warm = len(self.resident)
+        sequence = np.concatenate([self.resident, keys])
+        sets = self.set_index(sequence)
+        order = np.argsort(sets, kind='stable')
+        distances = stack_distances(sequence[order])
+        hits = np.empty(len(sequence), dtype=bool)
+        hits[order] = (distances >= 0) & (distances < self.ways)
+        self._retain(sequence)
+        return hits[warm:]
+
+    def _retain(self, sequence):
+        unique, reversed_last = np.unique(sequence[::-1], return_index=True)
+        last = len(sequence) - 1 - reversed_last
+        unique_sets = self.set_index(unique)
+        order = np.lexsort((-last, unique_sets))
+        ordered_sets = unique_sets[order]
+        first = np.searchsorted(ordered_sets, ordered_sets, side='left')
+        kept = order[np.arange(len(order)) - first < self.ways]
+        self.resident = unique[kept[np.lexsort((last[kept], unique_sets[kept]))]]
+
+
+def simulate(addresses, mode, levels=DEFAULT_LEVELS, entries=DEFAULT_TLB_ENTRIES, ways=DEFAULT_TLB_WAYS,
+             thp_min_pages=THP_MIN_PAGES, batch=BATCH_ACCESSES):
+    shifts = page_shifts(addresses, mode, thp_min_pages)
+    tlb = TLB(entries, ways)
+    hits = walks = references = 0
+    for start in range(0, len(addresses), batch):
+        batch_shifts = shifts[start:start + batch]
+        batch_hits = tlb.lookup(translation_keys(addresses[start:start + batch], batch_shifts))
+        hits += int(np.count_nonzero(batch_hits))
+        walks += int(len(batch_hits) - np.count_nonzero(batch_hits))
+        references += int(walk_references(levels, batch_shifts[~batch_hits]).sum())
+    tables = page_table_pages(addresses, shifts, levels)
+    return (mode, len(addresses), hits, hits / len(addresses) if len(addresses) else 0.0, walks, references,
+            tables, tables * TABLE_SIZE, mapped_bytes(addresses, shifts))
+
+
+def compare_modes(addresses, modes=MODES, **options):
+    return np.array([simulate(addresses, mode, **options) for mode in modes], dtype=TRANSLATION_DTYPE)
@@ -0,0 +1,139 @@
+import functools
+import os
+from PyQt5.QtWidgets import QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QSpinBox, QTableView, QFileDialog
+from PyQt5.QtCore import Qt
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+import numpy as np
+from components.translation_sim import (MODES, DEFAULT_TLB_ENTRIES, DEFAULT_TLB_WAYS, THP_MIN_PAGES,
+                                        synthetic_addresses, process_addresses, load_addresses, compare_modes)
+from components.simulation_view import SimulationView
+from components.table_model import StructuredTableModel
+
+TRACE_SOURCES = ('Synthetic', 'Process resident set', 'Trace file (.npy)')
+MODE_COLORS = {'4K': '#607D8B', 'THP': '#4CAF50', '2M': '#2196F3', '1G': '#9C27B0'}
+
+
+def format_kb(value):
+    return f"{value / 1024:,.0f} KB"
+
+
+class TranslationView(SimulationView):
+    def __init__(self):
+        super().__init__()
+        self.results = None
+        self.init_ui()
+
+    def init_ui(self):
+        self.layout = QVBoxLayout()
+
+        self.title_label = QLabel("Address Translation")
+        self.title_label.setAlignment(Qt.AlignCenter)
+        self.title_label.setStyleSheet("font-size: 16px; font-weight: bold; margin: 10px;")
+        self.layout.addWidget(self.title_label)
+
+        self.controls_layout = QHBoxLayout()
+        self.trace_combo = QComboBox()
+        self.trace_combo.addItems(TRACE_SOURCES)
+        self.controls_layout.addWidget(self.trace_combo)
+        self.pid_spin = QSpinBox()
+        self.pid_spin.setRange(1, 1 << 22)
+        self.pid_spin.setValue(os.getpid())
+        self.pid_spin.setPrefix("PID ")
+        self.controls_layout.addWidget(self.pid_spin)
+        self.accesses_spin = QSpinBox()
+        self.accesses_spin.setRange(1000, 100000000)
+        self.accesses_spin.setSingleStep(1000000)
+        self.accesses_spin.setValue(1000000)
+        self.accesses_spin.setSuffix(" accesses")
+        self.controls_layout.addWidget(self.accesses_spin)
+        self.levels_combo = QComboBox()
+        self.levels_combo.addItem("4-level", 4)
+        self.levels_combo.addItem("5-level", 5)
+        self.controls_layout.addWidget(self.levels_combo)
+        self.entries_spin = QSpinBox()
+        self.entries_spin.setRange(1, 1 << 16)
+        self.entries_spin.setValue(DEFAULT_TLB_ENTRIES)
+        self.entries_spin.setSuffix(" entries")
+        self.controls_layout.addWidget(self.entries_spin)
+        self.ways_spin = QSpinBox()
+        self.ways_spin.setRange(1, 1 << 16)
+        self.ways_spin.setValue(DEFAULT_TLB_WAYS)
+        self.ways_spin.setSuffix("-way")
+        self.controls_layout.addWidget(self.ways_spin)
+        self.thp_spin = QSpinBox()
+        self.thp_spin.setRange(1, 512)
+        self.thp_spin.setValue(THP_MIN_PAGES)
+        self.thp_spin.setPrefix("THP at ")
+        self.thp_spin.setSuffix("/512")
+        self.controls_layout.addWidget(self.thp_spin)
+        self.add_run_button(self.controls_layout)
+        self.layout.addLayout(self.controls_layout)
+
+        self.add_status_label(self.layout, "Compare TLB reach and page walk cost across page sizes")
+
+        self.result_model = StructuredTableModel([
+            ('Pages', 'mode', lambda row: str(row['mode'])),
+            ('TLB Hit Rate', 'hit_rate', lambda row: f"{row['hit_rate']:.2%}"),
+            ('Walks', 'walks', lambda row: f"{row['walks']:,}"),
+            ('Walk References', 'walk_references', lambda row: f"{row['walk_references']:,}"),
+            ('Page Tables', 'table_bytes', lambda row: format_kb(row['table_bytes'])),
+            ('Mapped', 'mapped_bytes', lambda row: format_kb(row['mapped_bytes'])),
+        ], self)
+        self.result_table = QTableView()
+        self.result_table.setModel(self.result_model)
+        self.result_table.setMaximumHeight(180)
+        self.layout.addWidget(self.result_table)
+
+        self.figure, self.axes = plt.subplots(1, 2, figsize=(10, 4))
+        self.hit_ax, self.walk_ax = self.axes
+        self.canvas = FigureCanvas(self.figure)
+        self.layout.addWidget(self.canvas)
+        positions = np.arange(len(MODES))
+        colors = [MODE_COLORS[mode] for mode in MODES]
+        self.hit_bars = self.hit_ax.bar(positions, np.zeros(len(MODES)), color=colors)
+        self.walk_bars = self.walk_ax.bar(positions, np.zeros(len(MODES)), color=colors)
+        for ax, title in ((self.hit_ax, 'TLB Hit Rate'), (self.walk_ax, 'Walk References per Access')):
+            ax.set_xticks(positions)
+            ax.set_xticklabels(MODES)
+            ax.set_title(title, fontsize=12)
+        self.hit_ax.set_ylim(0, 1.05)
+        self.figure.tight_layout()
+
+        self.setLayout(self.layout)
+
+    def trace_loader(self):
+        source = self.trace_combo.currentText()
+        count = self.accesses_spin.value()
+        if source == 'Synthetic':
+            return functools.partial(synthetic_addresses, count)
+        if source == 'Process resident set':
+            return functools.partial(process_addresses, self.pid_spin.value(), count)
+        path, _ = QFileDialog.getOpenFileName(self, "Open address trace", filter="NumPy arrays (*.npy)")
+        return path and functools.partial(load_addresses, path)
+
+    def simulation_job(self):
+        load = self.trace_loader()
+        if not load:
+            return None
+        options = dict(levels=self.levels_combo.currentData(), entries=self.entries_spin.value(),
+                       ways=self.ways_spin.value(), thp_min_pages=self.thp_spin.value())
+        return "Simulating address translation...", lambda: compare_modes(load(), **options)
+
+    def show_result(self, results):
+        self.results = results
+        self.result_model.set_array(results)
+        base, thp = results[0], results[list(MODES).index('THP')]
+        saved = base['walk_references'] - thp['walk_references']
+        self.status_label.setText(
+            f"{base['accesses']:,} accesses | THP removes {saved:,} walk references "
+            f"({saved / max(base['walk_references'], 1):.1%}) and "
+            f"{format_kb(base['table_bytes'] - thp['table_bytes'])} of page tables")
+        per_access = results['walk_references'] / np.maximum(results['accesses'], 1)
+        for bar, value in zip(self.hit_bars, results['hit_rate'].tolist()):
+            bar.set_height(value)
+        for bar, value in zip(self.walk_bars, per_access.tolist()):
+            bar.set_height(value)
+        self.walk_ax.set_ylim(0, max(float(per_access.max()), 0.01) * 1.1)
+        self.plot_stale = True
+        self.dirty.emit()
@@ -0,0 +1,97 @@
+import os
+import time
+import numpy as np
+from components.procfs import DEFAULT_PROC_ROOT
+from components.paging_collector import PagingCollector, PAGE_DTYPE, PAGE_PRESENT
+from components.samples import WorkingSetSnapshot
+
+DEFAULT_SYS_ROOT = '/sys'
+IDLE_BITMAP_PATH = os.path.join('kernel', 'mm', 'page_idle', 'bitmap')
+BITMAP_WORD_SIZE = 8
+BITMAP_CHUNK_WORDS = 1 << 16
+BITMAP_GAP_WORDS = 64
+
+
+def bitmap_words(pfns):
+    words, inverse = np.unique(pfns >> np.uint64(6), return_inverse=True)
+    bits = np.uint64(1) << (pfns & np.uint64(63))
+    return words, inverse, bits
+
+
+def word_runs(words):
+    gaps = np.flatnonzero(np.diff(words) > BITMAP_GAP_WORDS)
+    i = 0
+    while i < words.size:
+        j = int(np.searchsorted(words, words[i] + np.uint64(BITMAP_CHUNK_WORDS), side='left'))
+        k = np.searchsorted(gaps, i, side='left')
+        if k < gaps.size:
+            j = min(j, int(gaps[k]) + 1)
+        yield i, j
+        i = j
+
+
+class WorkingSetCollector:
+    def __init__(self, proc_root=DEFAULT_PROC_ROOT, sys_root=DEFAULT_SYS_ROOT, page_size=None):
+        self.paging_collector = PagingCollector(proc_root, page_size)
+        self.bitmap_path = os.path.join(sys_root, IDLE_BITMAP_PATH)
+        self._buffer = np.empty(BITMAP_CHUNK_WORDS, dtype=np.uint64)
+        self.marked = np.empty(0, dtype=PAGE_DTYPE)
+        self.marked_at = None
+
+    def check_available(self):
+        fd = os.open(self.bitmap_path, os.O_RDWR)
+        os.close(fd)
+
+    def collect(self, pids):
+        now = time.time()
+        if self.marked_at is None:
+            accessed = np.zeros(0, dtype=bool)
+        else:
+            accessed = ~self.read_idle(self.marked['pfn'])
+        sample = WorkingSetSnapshot(now, now - self.marked_at if self.marked_at is not None else 0.0,
+                                    self.paging_collector.page_size, self.marked, accessed)
+        self.marked = self.resident_pages(pids)
+        self.mark_idle(self.marked['pfn'])
+        self.marked_at = now
+        return sample
+
+    def resident_pages(self, pids):
+        scans = [self.paging_collector.scan(pid) for pid in pids]
+        pages = np.concatenate(scans) if scans else np.empty(0, dtype=PAGE_DTYPE)
+        return pages[((pages['flags'] & PAGE_PRESENT) != 0) & (pages['pfn'] != 0)]
+
+    def mark_idle(self, pfns):
+        if not pfns.size:
+            return
+        words, inverse, bits = bitmap_words(pfns)
+        values = np.zeros(words.size, dtype=np.uint64)
+        np.bitwise_or.at(values, inverse, bits)
+        fd = os.open(self.bitmap_path, os.O_WRONLY)
+        try:
+            for i, j in word_runs(words):
+                first = int(words[i])
+                count = int(words[j - 1]) - first + 1
+                buffer = self._buffer[:count]
+                buffer[:] = 0
+                buffer[(words[i:j] - np.uint64(first)).astype(np.intp)] = values[i:j]
+                os.pwrite(fd, buffer, first * BITMAP_WORD_SIZE)
+        finally:
+            os.close(fd)
+
+    def read_idle(self, pfns):
+        if not pfns.size:
+            return np.zeros(0, dtype=bool)
+        words, inverse, bits = bitmap_words(pfns)
+        values = np.zeros(words.size, dtype=np.uint64)
+        fd = os.open(self.bitmap_path, os.O_RDONLY)
+        try:
+            for i, j in word_runs(words):
+                first = int(words[i])
+                count = int(words[j - 1]) - first + 1
+                nread = os.preadv(fd, [self._buffer[:count]], first * BITMAP_WORD_SIZE)
+                offsets = (words[i:j] - np.uint64(first)).astype(np.intp)
+                valid = offsets < nread // BITMAP_WORD_SIZE
+                values[i:j][valid] = self._buffer[offsets[valid]]
+        finally:
+            os.close(fd)
+        return (values[inverse] & bits) != 0
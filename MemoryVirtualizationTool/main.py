@@ -1,17 +1,107 @@
 import sys
+import time
+import argparse
+import functools
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QTabWidget, QVBoxLayout, 
-                            QWidget, QToolBar, QAction)
-from PyQt5.QtCore import Qt
+                            QWidget, QToolBar, QAction, QComboBox, QSlider, QLabel)
+from PyQt5.QtCore import Qt, QObject, QTimer, QEvent, pyqtSignal
 from PyQt5.QtGui import QIcon
-from components.memory_view import MemoryView
-from components.paging_view import PagingView
-from components.segmentation_view import SegmentationView
+import psutil
+from components.lazy_tab import LazyTab
+from components.samples import merge_segment_deltas
 from components.system_monitor import SystemMonitor
+from components.recording import SessionRecorder
+from components.replay import ReplaySource
+from components.remote_monitor import RemoteMonitor
+from components.stream import DEFAULT_ADDRESS
+from components.metrics import REGISTRY
+from components.metrics_server import DEFAULT_METRICS_ADDRESS, MetricsServer
+from components.stats_bar import StatsBar
+
+REPLAY_SPEEDS = [('0.5x', 0.5), ('1x', 1.0), ('2x', 2.0), ('5x', 5.0), ('10x', 10.0), ('20x', 20.0), ('Max', 0.0)]
+SEEK_STEPS = 1000
+
+class RenderScheduler(QObject):
+    rendered = pyqtSignal(object, object)
+
+    def __init__(self, tabs):
+        super().__init__(tabs)
+        self.tabs = tabs
+        self.dirty_views = set()
+        self.arrivals = {}
+        self.track_latency = True
+        self.frame_timer = QTimer(self)
+        self.frame_timer.setSingleShot(True)
+        self.frame_timer.setInterval(0)
+        self.frame_timer.timeout.connect(self.render_visible)
+        self.tabs.currentChanged.connect(self.tab_changed)
+
+    def add_group(self, tabs):
+        tabs.currentChanged.connect(self.tab_changed)
+
+    def current_tab(self):
+        view = self.tabs.currentWidget()
+        while isinstance(view, QTabWidget):
+            view = view.currentWidget()
+        return view
+
+    def current_view(self):
+        view = self.current_tab()
+        if isinstance(view, LazyTab):
+            view = view.ensure()
+        return view
+
+    def is_current(self, view):
+        tab = self.current_tab()
+        return view is (tab.view if isinstance(tab, LazyTab) else tab)
+
+    def register(self, view):
+        view.dirty.connect(lambda: self.mark_dirty(view))
+        self.dirty_views.add(view)
+
+    def mark_dirty(self, view):
+        self.dirty_views.add(view)
+        if view is self.current_view():
+            self.schedule_frame()
+
+    def sample_arrived(self, view, sample):
+        if self.is_current(view):
+            self.arrivals.setdefault(view, sample.timestamp)
+
+    def tab_changed(self, *args):
+        self.arrivals = {view: arrived for view, arrived in self.arrivals.items() if self.is_current(view)}
+        self.schedule_frame()
+
+    def schedule_frame(self, *args):
+        if not self.frame_timer.isActive():
+            self.frame_timer.start()
+
+    def render_visible(self):
+        view = self.current_view()
+        if view in self.dirty_views:
+            self.dirty_views.discard(view)
+            name = type(view).__name__
+            start = time.perf_counter()
+            view.render()
+            REGISTRY.histogram('render_seconds', "Time spent rendering a view", view=name).observe(
+                time.perf_counter() - start)
+            arrived = self.arrivals.pop(view, None)
+            if arrived is not None and self.track_latency:
+                REGISTRY.histogram('delivery_latency_seconds', "Sample timestamp to rendered view",
+                                   view=name).observe(time.time() - arrived)
+            self.rendered.emit(view, arrived)
 
 class MemoryVisualizationApp(QMainWindow):
-    def __init__(self):
+    def __init__(self, source=None, record_path=None, show_stats=False, startup_report=False):
         super().__init__()
         self.is_dark_mode = False
+        self.matplotlib_style = 'default'
+        self.show_stats = show_stats
+        self.startup_report = startup_report
+        self.process_start = psutil.Process().create_time()
+        self.startup_times = {}
+        self.system_monitor = source if source is not None else SystemMonitor()
+        self.recorder = SessionRecorder(record_path) if record_path else None
         self.init_ui()
         
     def init_ui(self):
@@ -26,6 +116,18 @@ class MemoryVisualizationApp(QMainWindow):
         self.theme_action.triggered.connect(self.toggle_theme)
         self.toolbar.addAction(self.theme_action)
         
+        self.stats_action = QAction("Show Stats", self)
+        self.stats_action.setCheckable(True)
+        self.stats_action.setChecked(self.show_stats)
+        self.toolbar.addAction(self.stats_action)
+        self.stats_bar = StatsBar(parent=self)
+        self.stats_bar.setVisible(self.show_stats)
+        self.stats_action.toggled.connect(self.stats_bar.setVisible)
+        self.setStatusBar(self.stats_bar)
+        
+        if isinstance(self.system_monitor, ReplaySource):
+            self.init_replay_toolbar()
+        
         self.main_widget = QWidget()
         self.main_layout = QVBoxLayout()
         self.main_widget.setLayout(self.main_layout)
@@ -34,19 +136,121 @@ class MemoryVisualizationApp(QMainWindow):
         self.tabs.setTabPosition(QTabWidget.North)
         self.main_layout.addWidget(self.tabs)
         
-        self.system_monitor = SystemMonitor()
-        self.memory_tab = MemoryView(self.system_monitor)
-        self.paging_tab = PagingView(self.system_monitor)
-        self.segmentation_tab = SegmentationView(self.system_monitor)
+        monitor = self.system_monitor
+        paging_feeds = [(monitor.paging_updated, 'ingest_paging_info', None)]
+        if hasattr(monitor, 'working_set_updated'):
+            paging_feeds.append((monitor.working_set_updated, 'ingest_working_set', None))
+        self.memory_tab = LazyTab('components.memory_view', 'MemoryView', (monitor,),
+                                  [(monitor.memory_updated, 'ingest_memory_info', None),
+                                   (monitor.processes_updated, 'ingest_process_info', None)])
+        self.paging_tab = LazyTab('components.paging_view', 'PagingView', (monitor,), paging_feeds)
+        self.replacement_tab = LazyTab('components.replacement_view', 'ReplacementView')
+        self.translation_tab = LazyTab('components.translation_view', 'TranslationView')
+        self.paging_tabs = QTabWidget()
+        self.paging_tabs.addTab(self.paging_tab, "Live")
+        self.paging_tabs.addTab(self.replacement_tab, "Replacement Simulation")
+        self.paging_tabs.addTab(self.translation_tab, "Address Translation")
+        self.segmentation_tab = LazyTab('components.segmentation_view', 'SegmentationView', (monitor,),
+                                        [(monitor.segmentation_updated, 'ingest_segmentation_info',
+                                          merge_segment_deltas)])
+        self.allocation_tab = LazyTab('components.allocation_view', 'AllocationView')
+        self.lazy_tabs = (self.memory_tab, self.paging_tab, self.replacement_tab, self.translation_tab,
+                          self.segmentation_tab, self.allocation_tab)
+        self.segmentation_tabs = QTabWidget()
+        self.segmentation_tabs.addTab(self.segmentation_tab, "Live")
+        self.segmentation_tabs.addTab(self.allocation_tab, "Allocator Simulation")
         
         self.tabs.addTab(self.memory_tab, "Memory Allocation")
-        self.tabs.addTab(self.paging_tab, "Paging Visualization")
-        self.tabs.addTab(self.segmentation_tab, "Segmentation Visualization")
+        self.tabs.addTab(self.paging_tabs, "Paging Visualization")
+        self.tabs.addTab(self.segmentation_tabs, "Segmentation Visualization")
+        
+        self.render_scheduler = RenderScheduler(self.tabs)
+        self.render_scheduler.add_group(self.paging_tabs)
+        self.render_scheduler.add_group(self.segmentation_tabs)
+        self.render_scheduler.rendered.connect(self.view_rendered)
+        for tab in self.lazy_tabs:
+            tab.built.connect(functools.partial(self.view_built, tab))
+        self.init_metrics()
         
         self.setCentralWidget(self.main_widget)
         
         self.apply_theme()
+        if self.recorder is not None:
+            self.system_monitor.sample_collected.connect(self.recorder.record, Qt.DirectConnection)
+
+    def event(self, event):
+        if event.type() == QEvent.Paint and 'window' not in self.startup_times:
+            self.startup_times['window'] = time.time() - self.process_start
+            QTimer.singleShot(0, self.first_frame_painted)
+        return super().event(event)
+
+    def first_frame_painted(self):
+        REGISTRY.gauge('startup_seconds', "Process start to the first painted window",
+                       lambda: self.startup_times['window'])
         self.system_monitor.start()
+        self.render_scheduler.schedule_frame()
+
+    def view_built(self, tab, view):
+        view.update_theme(self.matplotlib_style)
+        self.render_scheduler.register(view)
+        for signal, _, _ in tab.feeds:
+            signal.connect(functools.partial(self.render_scheduler.sample_arrived, view))
+
+    def view_rendered(self, view, arrived):
+        if arrived is None or 'first_data' in self.startup_times:
+            return
+        self.startup_times['first_data'] = time.time() - self.process_start
+        REGISTRY.gauge('first_data_seconds', "Process start to the first rendered sample",
+                       lambda: self.startup_times['first_data'])
+        if self.startup_report:
+            print(f"window painted {self.startup_times['window']:.3f} s, "
+                  f"first data frame {self.startup_times['first_data']:.3f} s after process start")
+            QTimer.singleShot(0, self.close)
+
+    def init_metrics(self):
+        mailbox = getattr(self.system_monitor, 'mailbox', None)
+        if mailbox is not None:
+            REGISTRY.gauge('mailbox_pending', "Samples waiting for delivery to the GUI thread",
+                           lambda: len(mailbox.pending))
+            REGISTRY.gauge('mailbox_dropped_total', "Samples superseded before the GUI thread took them",
+                           lambda: mailbox.dropped, kind='counter')
+        self.render_scheduler.track_latency = not isinstance(self.system_monitor, ReplaySource)
+
+    def init_replay_toolbar(self):
+        source = self.system_monitor
+        self.toolbar.addSeparator()
+        self.speed_combo = QComboBox()
+        for label, speed in REPLAY_SPEEDS:
+            self.speed_combo.addItem(label, speed)
+        index = self.speed_combo.findData(source.speed)
+        if index < 0:
+            index = sum(0 < speed < source.speed for _, speed in REPLAY_SPEEDS)
+            self.speed_combo.insertItem(index, f"{source.speed:g}x", source.speed)
+        self.speed_combo.setCurrentIndex(index)
+        self.speed_combo.currentIndexChanged.connect(
+            lambda index: source.set_speed(self.speed_combo.itemData(index)))
+        self.toolbar.addWidget(self.speed_combo)
+        
+        self.seek_slider = QSlider(Qt.Horizontal)
+        self.seek_slider.setRange(0, SEEK_STEPS)
+        self.seek_slider.sliderReleased.connect(self.seek_replay)
+        self.toolbar.addWidget(self.seek_slider)
+        
+        self.position_label = QLabel()
+        self.toolbar.addWidget(self.position_label)
+        source.position_changed.connect(self.update_replay_position)
+
+    def seek_replay(self):
+        source = self.system_monitor
+        fraction = self.seek_slider.value() / SEEK_STEPS
+        source.seek(source.start_time + fraction * (source.end_time - source.start_time))
+
+    def update_replay_position(self, timestamp):
+        source = self.system_monitor
+        self.position_label.setText(time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp)))
+        if not self.seek_slider.isSliderDown():
+            span = source.end_time - source.start_time
+            self.seek_slider.setValue(int(SEEK_STEPS * (timestamp - source.start_time) / span) if span else 0)
 
     def toggle_theme(self):
         self.is_dark_mode = not self.is_dark_mode
@@ -86,7 +290,7 @@ class MemoryVisualizationApp(QMainWindow):
             QProgressBar::chunk {
                 background-color: #4CAF50;
             }
-            QTableWidget { 
+            QTableView { 
                 background-color: #333333; 
                 color: #FFFFFF; 
                 gridline-color: #444444;
@@ -98,7 +302,7 @@ class MemoryVisualizationApp(QMainWindow):
                 padding: 4px;
                 border: 1px solid #444444;
             }
-            QTableWidget::item {
+            QTableView::item {
                 background-color: #333333;
                 color: #FFFFFF;
             }
@@ -109,11 +313,6 @@ class MemoryVisualizationApp(QMainWindow):
             QLabel {
                 color: #FFFFFF;
             }
-            QFrame#processCard {
-                background-color: #3C3C3C;
-                border: 1px solid #444444;
-                border-radius: 4px;
-            }
             """
             self.theme_action.setIcon(QIcon.fromTheme("weather-clear"))
             matplotlib_style = 'dark_background'
@@ -150,7 +349,7 @@ class MemoryVisualizationApp(QMainWindow):
             QProgressBar::chunk {
                 background-color: #4CAF50;
             }
-            QTableWidget { 
+            QTableView { 
                 background-color: #FFFFFF; 
                 color: #000000; 
                 gridline-color: #CCCCCC;
@@ -162,7 +361,7 @@ class MemoryVisualizationApp(QMainWindow):
                 padding: 4px;
                 border: 1px solid #CCCCCC;
             }
-            QTableWidget::item {
+            QTableView::item {
                 background-color: #FFFFFF;
                 color: #000000;
             }
@@ -173,26 +372,66 @@ class MemoryVisualizationApp(QMainWindow):
             QLabel {
                 color: #000000;
             }
-            QFrame#processCard {
-                background-color: #F0F0F0;
-                border: 1px solid #CCCCCC;
-                border-radius: 4px;
-            }
             """
             self.theme_action.setIcon(QIcon.fromTheme("weather-clear-night"))
             matplotlib_style = 'default'
 
         QApplication.instance().setStyleSheet(style_sheet)
-        self.memory_tab.update_theme(matplotlib_style)
-        self.paging_tab.update_theme(matplotlib_style)
-        self.segmentation_tab.update_theme(matplotlib_style)
+        self.matplotlib_style = matplotlib_style
+        for tab in self.lazy_tabs:
+            if tab.view is not None:
+                tab.view.update_theme(matplotlib_style)
 
     def closeEvent(self, event):
         self.system_monitor.stop()
+        for tab in (self.replacement_tab, self.translation_tab, self.allocation_tab):
+            if tab.view is not None:
+                tab.view.stop()
+        if self.recorder is not None:
+            self.recorder.close()
         super().closeEvent(event)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    window = MemoryVisualizationApp()
+    parser = argparse.ArgumentParser(description="Memory Visualization Tool")
+    parser.add_argument('--record', metavar='PATH', help="record the session to a file")
+    parser.add_argument('--replay', metavar='PATH', help="replay a recorded session instead of sampling")
+    parser.add_argument('--connect', metavar='ADDRESS', nargs='?', const=DEFAULT_ADDRESS,
+                        help="show data from a running collector instead of sampling locally")
+    parser.add_argument('--pressure', action='store_true',
+                        help="sample slowly and burst while PSI memory stall triggers fire")
+    parser.add_argument('--cgroup', action='append', default=[],
+                        help="also watch this cgroup v2 memory.pressure, may be repeated")
+    parser.add_argument('--working-set', action='store_true',
+                        help="estimate working sets of the paging view's processes via idle page tracking")
+    parser.add_argument('--metrics', metavar='ADDRESS', nargs='?', const=DEFAULT_METRICS_ADDRESS,
+                        help="serve self-monitoring metrics as Prometheus text and JSON on host:port")
+    parser.add_argument('--stats', action='store_true', help="show the self-monitoring status bar")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="print startup timings and exit once the first sample is on screen")
+    parser.add_argument('--speed', type=float, default=1.0, help="replay speed multiplier, 0 for unpaced")
+    args, qt_args = parser.parse_known_args()
+    app = QApplication(sys.argv[:1] + qt_args)
+    if args.replay:
+        source = ReplaySource(args.replay, args.speed)
+    elif args.connect:
+        source = RemoteMonitor(args.connect)
+    else:
+        source = SystemMonitor()
+        if args.pressure:
+            try:
+                source.enable_pressure(args.cgroup)
+            except OSError as error:
+                print(f"PSI triggers unavailable, polling instead: {error}", file=sys.stderr)
+        if args.working_set:
+            try:
+                source.enable_working_set()
+            except OSError as error:
+                print(f"Idle page tracking unavailable: {error}", file=sys.stderr)
+    if args.metrics:
+        try:
+            metrics_server = MetricsServer(args.metrics)
+        except OSError as error:
+            print(f"Metrics endpoint unavailable: {error}", file=sys.stderr)
+    window = MemoryVisualizationApp(source, args.record, args.stats, args.startup_report)
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,20 @@
+import os
+import pytest
+from tests.fake_procfs import FakeProcfs, FakeSysfs
+
+
+@pytest.fixture
+def procfs(tmp_path):
+    return FakeProcfs(str(tmp_path / 'proc'), page_size=4096)
+
+
+@pytest.fixture
+def sysfs(tmp_path):
+    return FakeSysfs(str(tmp_path / 'sys'))
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
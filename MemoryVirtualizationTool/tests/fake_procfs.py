@@ -0,0 +1,96 @@
+import os
+import numpy as np
+from components.paging_collector import (PAGEMAP_ENTRY_SIZE, PM_EXCLUSIVE, PM_FILE, PM_PFN_MASK,
+                                         PM_PRESENT, PM_SOFT_DIRTY, PM_SWAP)
+
+
+def pagemap_entries(pfns, present=True, swapped=False, file=False, exclusive=False, soft_dirty=False):
+    entries = np.asarray(pfns, dtype=np.uint64) & PM_PFN_MASK
+    for enabled, bit in ((present, PM_PRESENT), (swapped, PM_SWAP), (file, PM_FILE),
+                         (exclusive, PM_EXCLUSIVE), (soft_dirty, PM_SOFT_DIRTY)):
+        entries = np.where(enabled, entries | bit, entries)
+    return entries.astype(np.uint64)
+
+
+def write_sparse_words(path, indices, words):
+    indices = np.asarray(indices, dtype=np.uint64)
+    words = np.asarray(words, dtype=np.uint64)
+    order = np.argsort(indices, kind='stable')
+    indices, words = indices[order], words[order]
+    breaks = np.flatnonzero(np.diff(indices) != 1) + 1
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        for run_idx, run in zip(np.split(indices, breaks), np.split(words, breaks)):
+            if run_idx.size:
+                os.pwrite(fd, run.tobytes(), int(run_idx[0]) * PAGEMAP_ENTRY_SIZE)
+    finally:
+        os.close(fd)
+
+
+class FakeProcfs:
+    def __init__(self, root, page_size=4096):
+        self.root = root
+        self.page_size = page_size
+        os.makedirs(root, exist_ok=True)
+
+    def add_process(self, pid, regions, vpns=(), entries=()):
+        pid_dir = os.path.join(self.root, str(pid))
+        os.makedirs(pid_dir, exist_ok=True)
+        self.write_maps(pid, regions)
+        open(os.path.join(pid_dir, 'pagemap'), 'wb').close()
+        if len(vpns):
+            write_sparse_words(os.path.join(pid_dir, 'pagemap'), vpns, entries)
+
+    def write_maps(self, pid, regions):
+        lines = []
+        for start, end, perms, path in regions:
+            lines.append(f"{start:012x}-{end:012x} {perms} 00000000 00:00 0"
+                         + (f"                          {path}" if path else ""))
+        with open(os.path.join(self.root, str(pid), 'maps'), 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def write_stat(self, pid, name, rss_pages, minflt=0):
+        os.makedirs(os.path.join(self.root, str(pid)), exist_ok=True)
+        fields = ['S', '1', str(pid), str(pid), '0', '-1', '0', str(minflt), *['0'] * 11, '100', '0', str(rss_pages)]
+        with open(os.path.join(self.root, str(pid), 'stat'), 'w') as f:
+            f.write(f"{pid} ({name}) {' '.join(fields)}\n")
+
+    def write_smaps_rollup(self, pid, rss_kb, pss_kb, private_kb, swap_kb):
+        with open(os.path.join(self.root, str(pid), 'smaps_rollup'), 'w') as f:
+            f.write(f"00400000-7fff00000000 ---p 00000000 00:00 0    [rollup]\nRss: {rss_kb} kB\n"
+                    f"Pss: {pss_kb} kB\nPrivate_Clean: {private_kb // 2} kB\n"
+                    f"Private_Dirty: {private_kb - private_kb // 2} kB\nSwap: {swap_kb} kB\n")
+
+    def set_kpageflags(self, pfns, flags):
+        write_sparse_words(os.path.join(self.root, 'kpageflags'), pfns, flags)
+
+    def remove_process(self, pid):
+        pid_dir = os.path.join(self.root, str(pid))
+        for name in os.listdir(pid_dir):
+            os.remove(os.path.join(pid_dir, name))
+        os.rmdir(pid_dir)
+
+
+class FakeSysfs:
+    def __init__(self, root):
+        self.root = root
+        self.idle_bitmap_path = os.path.join(root, 'kernel', 'mm', 'page_idle', 'bitmap')
+        os.makedirs(os.path.dirname(self.idle_bitmap_path), exist_ok=True)
+        open(self.idle_bitmap_path, 'ab').close()
+
+    def idle_bits(self, pfns):
+        pfns = np.asarray(pfns, dtype=np.uint64)
+        words = np.fromfile(self.idle_bitmap_path, dtype=np.uint64)
+        index = (pfns >> np.uint64(6)).astype(np.intp)
+        bits = np.zeros(pfns.size, dtype=bool)
+        inside = index < words.size
+        bits[inside] = (words[index[inside]] >> (pfns[inside] & np.uint64(63))) & np.uint64(1) != 0
+        return bits
+
+    def touch(self, pfns):
+        pfns = np.asarray(pfns, dtype=np.uint64)
+        words = np.fromfile(self.idle_bitmap_path, dtype=np.uint64)
+        index = (pfns >> np.uint64(6)).astype(np.intp)
+        inside = index < words.size
+        np.bitwise_and.at(words, index[inside], ~(np.uint64(1) << (pfns[inside] & np.uint64(63))))
+        words.tofile(self.idle_bitmap_path)
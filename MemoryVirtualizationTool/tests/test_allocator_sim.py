@@ -0,0 +1,89 @@
+import numpy as np
+from components.allocator_sim import (OP_ALLOC, FreeListAllocator, load_session_trace, simulate,
+                                      synthetic_trace)
+from components.interval_index import IntervalIndex
+from components.recording import SessionRecorder
+from components.samples import SegmentationDelta, empty_segments
+from components.segmentation_collector import SEGMENT_DTYPE
+
+
+def segments(rows):
+    return np.array(rows, dtype=SEGMENT_DTYPE)
+
+
+def replay_frames(frames):
+    index = IntervalIndex()
+    live = {}
+    for frame in frames:
+        for segment_id in frame.removed.tolist():
+            pid, base = live.pop(segment_id)
+            index.remove(pid, base)
+        for segment_id, base, limit, _, pid in frame.added.tolist():
+            live[segment_id] = (pid, base)
+            index.insert(pid, base, base + limit)
+    return index
+
+
+def brute_force_holes(index):
+    holes = []
+    for pid, starts in index.starts.items():
+        ends = np.array([index.ends[pid][start] for start in starts], dtype=np.int64)
+        gaps = np.array(starts[1:], dtype=np.int64) - ends[:-1]
+        holes.extend(gaps[gaps > 0].tolist())
+    return holes
+
+
+def test_recorded_session_keeps_segment_sizes(tmp_path):
+    path = tmp_path / 'session.mvr'
+    recorder = SessionRecorder(path)
+    recorder.record('segmentation', SegmentationDelta(
+        0.0, segments([(1, 0, 4, 'code', 10), (2, 64, 132, 'heap', 10), (3, 0, 8, 'stack', 11)]),
+        empty_segments(), np.empty(0, dtype=np.int64), True, 144, 0.0))
+    recorder.record('segmentation', SegmentationDelta(
+        1.0, empty_segments(), segments([(2, 64, 260, 'heap', 10)]), np.array([3], dtype=np.int64),
+        False, 264, 0.0))
+    recorder.close()
+
+    trace = load_session_trace(path)
+    allocations = trace[trace['op'] == OP_ALLOC]
+    assert dict(zip(allocations['id'].tolist(), allocations['size'].tolist())) == {
+        1: 4 * 1024, 2: 260 * 1024, 3: 8 * 1024}
+
+    frames = simulate(trace, 'first-fit').frames
+    live = {}
+    for frame in frames:
+        for segment_id in frame.removed.tolist():
+            live.pop(segment_id)
+        live.update((segment_id, limit) for segment_id, _, limit, _, _ in frame.added.tolist())
+    assert sorted(live.values()) == [4 * 1024, 260 * 1024]
+
+
+def test_simulated_frames_never_overlap():
+    result = simulate(synthetic_trace(20000, seed=3), 'first-fit', arena=1 << 20)
+    index = replay_frames(result.frames)
+    holes = brute_force_holes(index)
+    assert index.hole_count == len(holes)
+    assert index.hole_total == sum(holes)
+    for pid, starts in index.starts.items():
+        ends = [index.ends[pid][start] for start in starts]
+        assert all(end <= following for end, following in zip(ends, starts[1:]))
+
+
+def test_address_ordered_policies_pick_the_lowest_fitting_block():
+    rng = np.random.default_rng(5)
+    for policy in ('first-fit', 'next-fit'):
+        allocator = FreeListAllocator(1 << 20, policy)
+        live = []
+        for _ in range(3000):
+            if live and rng.random() < 0.45:
+                allocator.free(*live.pop(rng.integers(len(live))))
+                continue
+            size = int(rng.choice([16, 48, 64, 112, 1000]))
+            floor = allocator.rover if policy == 'next-fit' else 0
+            fits = [start for start, block in allocator.by_start.items() if block >= size]
+            expected = min([start for start in fits if start >= floor] or fits, default=None)
+            allocation = allocator.allocate(size)
+            assert (allocation and allocation[0]) == expected
+            if allocation:
+                live.append(allocation)
+        assert allocator.largest_free() == max(allocator.by_start.values())
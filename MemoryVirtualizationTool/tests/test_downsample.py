@@ -0,0 +1,23 @@
+import numpy as np
+from components.downsample import downsample
+
+
+def test_keeps_min_and_max_of_every_pixel_column():
+    x = np.arange(10000, dtype=np.float64)
+    y = np.sin(x / 7.0) + np.random.default_rng(0).normal(0, 0.1, x.size)
+    width = 100
+    xs, ys = downsample(x, y, width)
+
+    assert len(xs) <= 2 * width
+    columns = y.reshape(width, -1)
+    kept = set(xs.astype(int).tolist())
+    for column, values in enumerate(columns):
+        offset = column * values.size
+        assert offset + int(np.argmin(values)) in kept
+        assert offset + int(np.argmax(values)) in kept
+
+
+def test_short_series_is_returned_unchanged():
+    x = np.arange(150, dtype=np.float64)
+    xs, ys = downsample(x, x * 2, 100)
+    assert xs is x
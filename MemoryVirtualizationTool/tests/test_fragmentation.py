@@ -0,0 +1,88 @@
+import os
+import numpy as np
+from components.fragmentation import (FragmentationEngine, fragmentation_index, parse_buddyinfo,
+                                      system_fragmentation, unusable_index)
+from components.recording import ChunkEncoder, SessionReader, SessionRecorder, StreamDecoder
+from components.samples import SegmentationDelta, empty_segments
+
+BUDDYINFO = b"""Node 0, zone      DMA      0      0      0      0      0      0      0      0      1      1      3
+Node 0, zone   Normal   2514   1304    425   1387    633    335    167    106     94     46    221
+"""
+PAGETYPEINFO = b"""Page block order: 9
+Pages per block:  512
+
+Free pages count per migrate type at order       0      1      2      3      4      5      6      7      8      9     10
+Node    0, zone      DMA, type    Unmovable      0      0      0      0      0      0      0      0      1      0      0
+Node    0, zone      DMA, type      Isolate      0      0      0      0      0      0      0      0      0      0      0
+Node    0, zone   Normal, type      Movable   2513   1283    415   1383    624    271    111     69     63     46    221
+
+Number of blocks type     Unmovable      Movable  Reclaimable   HighAtomic      Isolate
+"""
+
+
+def write_proc_files(root):
+    os.makedirs(root, exist_ok=True)
+    for name, data in (('buddyinfo', BUDDYINFO), ('pagetypeinfo', PAGETYPEINFO)):
+        with open(os.path.join(root, name), 'wb') as f:
+            f.write(data)
+
+
+def test_fragmentation_index_follows_kernel_formula():
+    counts = np.array([0, 0, 0, 4, 0], dtype=np.int64)
+    index = fragmentation_index(counts)
+    assert (index[:4] == -1.0).all()
+    assert index[4] == 0.25
+
+
+def test_unusable_index_counts_free_pages_below_order():
+    counts = np.array([4, 2, 1], dtype=np.int64)
+    assert np.allclose(unusable_index(counts), [0.0, 4 / 12, 8 / 12])
+
+
+def test_engine_reports_every_zone_and_nonempty_migrate_type(procfs):
+    write_proc_files(procfs.root)
+    zones = FragmentationEngine(procfs.root).zones()
+
+    assert list(zip(zones['zone'].tolist(), zones['migrate_type'].tolist())) == [
+        ('DMA', ''), ('Normal', ''), ('DMA', 'Unmovable'), ('Normal', 'Movable')]
+    assert (zones['orders'] == 11).all()
+    assert zones['free_blocks'][1, 3] == 1387
+    expected = fragmentation_index(parse_buddyinfo(BUDDYINFO)[0][3])
+    assert np.array_equal(zones['fragmentation_index'][0, :11], expected)
+    combined = sum(counts for _, _, _, counts in parse_buddyinfo(BUDDYINFO))
+    assert system_fragmentation(zones) == unusable_index(combined)[3]
+
+
+def test_engine_without_buddyinfo_reports_nothing(procfs):
+    zones = FragmentationEngine(procfs.root).zones()
+    assert len(zones) == 0
+    assert system_fragmentation(zones) == 0.0
+
+
+def test_zones_survive_recording_and_streaming(procfs, tmp_path):
+    write_proc_files(procfs.root)
+    zones = FragmentationEngine(procfs.root).zones()
+    deltas = [SegmentationDelta(float(t), empty_segments(), empty_segments(), np.empty(0, dtype=np.int64),
+                                t == 0, 1024, 0.0, zones) for t in range(3)]
+
+    path = tmp_path / 'session.mvr'
+    recorder = SessionRecorder(path)
+    for delta in deltas:
+        recorder.record('segmentation', delta)
+    recorder.close()
+    reader = SessionReader(path)
+    try:
+        replayed = [sample for _, _, sample in reader.segmentation_samples(1.5)]
+    finally:
+        reader.close()
+    assert replayed and all(np.array_equal(sample.zones, zones) for sample in replayed)
+
+    encoder, decoder = ChunkEncoder(), StreamDecoder()
+    chunks = [chunk for delta in deltas for chunk in encoder.encode_segmentation(delta)]
+    assert sum(chunk[0] == b'ZONE' for chunk in chunks) == 1
+    late_decoder = StreamDecoder()
+    for decoder_chunks, target in ((chunks, decoder), (encoder.keyframes(), late_decoder)):
+        events = []
+        for kind, count, _, _, buffers in decoder_chunks:
+            events += target.decode(kind, count, b''.join(bytes(buffer) for buffer in buffers[1:]))
+        assert events and np.array_equal(events[-1][2].zones, zones)
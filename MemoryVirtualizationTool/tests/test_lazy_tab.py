@@ -0,0 +1,69 @@
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import QObject, pyqtSignal
+from components.lazy_tab import LazyTab
+
+
+class Feed(QObject):
+    memory_updated = pyqtSignal(object)
+    segments_updated = pyqtSignal(object)
+
+
+class RecordingView(QWidget):
+    created = 0
+
+    def __init__(self, label):
+        super().__init__()
+        RecordingView.created += 1
+        self.label = label
+        self.received = []
+
+    def ingest_memory(self, payload):
+        self.received.append(('memory', payload))
+
+    def ingest_segments(self, payload):
+        self.received.append(('segments', payload))
+
+
+def lazy_recording_tab(feed):
+    return LazyTab('tests.test_lazy_tab', 'RecordingView', ('live',),
+                   [(feed.memory_updated, 'ingest_memory', None),
+                    (feed.segments_updated, 'ingest_segments', lambda previous, payload: previous + payload)])
+
+
+def test_view_is_built_once_on_first_ensure(qapp):
+    RecordingView.created = 0
+    feed = Feed()
+    tab = lazy_recording_tab(feed)
+    built = []
+    tab.built.connect(built.append)
+    assert tab.view is None and RecordingView.created == 0
+
+    view = tab.ensure()
+    assert isinstance(view, RecordingView) and view.label == 'live'
+    assert tab.ensure() is view
+    assert RecordingView.created == 1
+    assert built == [view]
+    assert tab.layout.indexOf(view) == 0
+
+
+def test_held_signals_are_replayed_into_the_new_view(qapp):
+    feed = Feed()
+    tab = lazy_recording_tab(feed)
+    feed.memory_updated.emit('first')
+    feed.memory_updated.emit('second')
+    feed.segments_updated.emit([1])
+    feed.segments_updated.emit([2, 3])
+
+    view = tab.ensure()
+    assert view.received == [('memory', 'second'), ('segments', [1, 2, 3])]
+    assert tab.backlog == {}
+
+    feed.memory_updated.emit('after')
+    feed.segments_updated.emit([4])
+    assert tab.backlog == {}
+    assert view.received == [('memory', 'second'), ('segments', [1, 2, 3])]
+
+
+def test_tab_without_feeds_builds_an_empty_backlog(qapp):
+    tab = LazyTab('tests.test_lazy_tab', 'RecordingView', ('idle',))
+    assert tab.ensure().received == []
@@ -0,0 +1,102 @@
+import json
+import urllib.error
+import urllib.request
+import pytest
+from components.metrics import Histogram, MetricsRegistry
+from components.metrics_server import PROMETHEUS_CONTENT_TYPE, MetricsServer, parse_metrics_address
+
+
+def exposition(registry):
+    return registry.prometheus_text().splitlines()
+
+
+def test_buckets_count_values_less_than_or_equal_to_their_bound():
+    registry = MetricsRegistry()
+    histogram = registry.histogram('scan_seconds', "Scan time", buckets=(1.0, 2.0, 5.0), source='paging')
+    for value in (0.5, 1.0, 1.5, 2.0, 5.0, 7.0):
+        histogram.observe(value)
+    assert exposition(registry) == [
+        '# HELP memviz_scan_seconds Scan time',
+        '# TYPE memviz_scan_seconds histogram',
+        'memviz_scan_seconds_bucket{source="paging",le="1.0"} 2',
+        'memviz_scan_seconds_bucket{source="paging",le="2.0"} 4',
+        'memviz_scan_seconds_bucket{source="paging",le="5.0"} 5',
+        'memviz_scan_seconds_bucket{source="paging",le="+Inf"} 6',
+        'memviz_scan_seconds_sum{source="paging"} 17',
+        'memviz_scan_seconds_count{source="paging"} 6',
+    ]
+
+
+def test_exposition_lists_gauges_and_skips_vanished_sources():
+    registry = MetricsRegistry()
+
+    def vanished():
+        raise ProcessLookupError(42)
+
+    registry.gauge('resident_bytes', "Resident memory", lambda: 4096, pid=1)
+    registry.gauge('resident_bytes', "Resident memory", vanished, pid=42)
+    registry.gauge('samples_total', "Samples taken", lambda: 3, kind='counter')
+    assert exposition(registry) == [
+        '# HELP memviz_resident_bytes Resident memory',
+        '# TYPE memviz_resident_bytes gauge',
+        'memviz_resident_bytes{pid="1"} 4096',
+        '# HELP memviz_samples_total Samples taken',
+        '# TYPE memviz_samples_total counter',
+        'memviz_samples_total 3',
+    ]
+
+
+def test_quantiles_interpolate_within_buckets():
+    histogram = Histogram((1.0, 2.0, 4.0))
+    assert histogram.quantile(0.5) == 0.0
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.quantile(0.25) == pytest.approx(1.0)
+    assert histogram.quantile(0.5) == pytest.approx(1.5)
+    assert histogram.quantile(1.0) == pytest.approx(4.0)
+    histogram.observe(100.0)
+    assert histogram.quantile(1.0) == 4.0
+
+
+def test_merged_combines_every_label_set():
+    registry = MetricsRegistry()
+    registry.histogram('scan_seconds', "Scan time", source='paging').observe(0.001)
+    registry.histogram('scan_seconds', "Scan time", source='memory').observe(0.002)
+    registry.histogram('other_seconds', "Other").observe(1.0)
+    merged = registry.merged('scan_seconds')
+    assert (merged.count, merged.total) == (2, pytest.approx(0.003))
+    assert registry.merged('missing').count == 0
+
+
+def test_json_reports_histograms_and_gauges():
+    registry = MetricsRegistry()
+    registry.histogram('scan_seconds', "Scan time", buckets=(1.0,), source='paging').observe(0.5)
+    registry.gauge('threads', "Threads", lambda: 2)
+    report = json.loads(registry.to_json())
+    assert report['histograms']['scan_seconds'] == [{
+        'labels': {'source': 'paging'}, 'count': 1, 'sum': 0.5, 'p50': 0.5, 'p99': 0.99,
+        'buckets': [[1.0, 1], ['+Inf', 0]]}]
+    assert report['gauges'] == {'threads': [{'labels': {}, 'value': 2.0}]}
+
+
+def test_parse_metrics_address_defaults_to_loopback():
+    assert parse_metrics_address(':9000') == ('127.0.0.1', 9000)
+    assert parse_metrics_address('0.0.0.0:9464') == ('0.0.0.0', 9464)
+
+
+def test_server_exposes_text_and_json():
+    registry = MetricsRegistry()
+    registry.histogram('scan_seconds', "Scan time", source='paging').observe(0.003)
+    server = MetricsServer('127.0.0.1:0', registry)
+    try:
+        base = f'http://{server.address}'
+        with urllib.request.urlopen(f'{base}/metrics', timeout=5) as response:
+            assert response.headers['Content-Type'] == PROMETHEUS_CONTENT_TYPE
+            assert response.read().decode() == registry.prometheus_text()
+        with urllib.request.urlopen(f'{base}/metrics.json?pretty', timeout=5) as response:
+            assert json.load(response)['histograms']['scan_seconds'][0]['count'] == 1
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(f'{base}/missing', timeout=5)
+        assert error.value.code == 404
+    finally:
+        server.close()
@@ -0,0 +1,61 @@
+import numpy as np
+from components.page_pyramid import STATE_CHANNELS, STATE_DIRTY, STATE_PRESENT, STATE_SWAPPED, PagePyramid
+
+SLOTS = 4
+
+
+def random_pages(rng, count, max_key):
+    keys = rng.integers(0, max_key, count)
+    slots = rng.integers(0, SLOTS, count)
+    states = rng.choice([STATE_PRESENT, STATE_PRESENT | STATE_DIRTY, STATE_SWAPPED, 0], count)
+    return keys, slots, states
+
+
+def brute_force_levels(keys, slots, states, levels, shift):
+    width = max(int(keys.max()) + 1 if len(keys) else 1, 1 << (shift * (levels - 1)))
+    dense = np.zeros((width, len(STATE_CHANNELS) + SLOTS), dtype=np.int64)
+    for key, slot, state in zip(keys.tolist(), slots.tolist(), states.tolist()):
+        dense[key, len(STATE_CHANNELS) + slot] += 1
+        for channel, bit in enumerate((STATE_PRESENT, STATE_SWAPPED, STATE_DIRTY)):
+            dense[key, channel] += bool(state & bit)
+    reduced = []
+    for level in range(levels):
+        group = 1 << (shift * level)
+        cells = -(-width // group)
+        padded = np.zeros((cells * group, dense.shape[1]), dtype=np.int64)
+        padded[:width] = dense
+        reduced.append(padded.reshape(cells, group, -1).sum(axis=1))
+    return reduced
+
+
+def test_levels_match_a_brute_force_reduction():
+    rng = np.random.default_rng(0)
+    updates = [random_pages(rng, count, max_key)
+               for count, max_key in [(500, 300), (800, 300), (200, 5000), (3000, 40000), (0, 1), (50, 70)]]
+    updates.append(tuple(np.concatenate([values, values[:10]]) for values in updates[-1]))
+    pyramid = PagePyramid(SLOTS)
+    for step, pages in enumerate(updates):
+        pyramid.update(*pages)
+        expected = brute_force_levels(*pages, len(pyramid.levels), pyramid.shift)
+        for level, cells in enumerate(expected):
+            assert (pyramid.window(level, 0, len(cells)) == cells).all(), (step, level)
+            if level:
+                assert (pyramid.levels[level][1][:, len(STATE_CHANNELS):].sum(axis=1) > 0).all()
+
+
+def test_unchanged_update_is_skipped():
+    keys, slots, states = random_pages(np.random.default_rng(1), 100, 1000)
+    pyramid = PagePyramid(SLOTS)
+    assert pyramid.update(keys, slots, states)
+    order = np.random.default_rng(2).permutation(len(keys))
+    assert not pyramid.update(keys[order], slots[order], states[order])
+
+
+def test_level_for_picks_the_finest_level_within_budget():
+    pyramid = PagePyramid(SLOTS)
+    pyramid.update(np.array([1 << 15]), np.array([0]), np.array([STATE_PRESENT]))
+    assert pyramid.level_for(1000, 1000) == 0
+    assert pyramid.level_for(1001, 1000) == 1
+    assert pyramid.level_for(8000, 1000) == 1
+    assert pyramid.level_for(8001, 1000) == 2
+    assert pyramid.level_for(1 << 40, 1) == len(pyramid.levels) - 1
@@ -0,0 +1,82 @@
+import os
+import numpy as np
+from components.paging_collector import (KPF_ACTIVE, KPF_DIRTY, PAGE_ACTIVE, PAGE_DIRTY, PAGE_PRESENT,
+                                         PAGE_SOFT_DIRTY, PAGE_SWAPPED, PagingCollector)
+from tests.fake_procfs import pagemap_entries
+
+REGIONS = [(0x1000, 0x9000, 'rw-p', '[heap]'), (0x9000, 0xa000, '---p', '')]
+
+
+def add_sample_process(procfs, pid=42):
+    vpns = [1, 2, 3, 4, 9]
+    entries = np.concatenate([
+        pagemap_entries([100], soft_dirty=True),
+        pagemap_entries([0x1234], present=False, swapped=True),
+        pagemap_entries([0]),
+        pagemap_entries([0], present=False),
+        pagemap_entries([200]),
+    ])
+    procfs.add_process(pid, REGIONS, vpns, entries)
+
+
+def by_vpn(pages):
+    return {int(page['vpn']): page for page in pages}
+
+
+def test_scan_decodes_present_swapped_and_zero_pfn_entries(procfs):
+    add_sample_process(procfs)
+    pages = by_vpn(PagingCollector(procfs.root, procfs.page_size).scan(42))
+
+    assert sorted(pages) == [1, 2, 3]
+    assert pages[1]['pfn'] == 100
+    assert pages[1]['flags'] == PAGE_PRESENT | PAGE_SOFT_DIRTY
+    assert pages[2]['pfn'] == 0
+    assert pages[2]['flags'] == PAGE_SWAPPED
+    assert pages[3]['pfn'] == 0
+    assert pages[3]['flags'] == PAGE_PRESENT
+    assert all(page['pid'] == 42 for page in pages.values())
+
+
+def test_scan_of_vanished_process_is_empty(procfs):
+    assert PagingCollector(procfs.root, procfs.page_size).scan(7).size == 0
+
+
+def test_kpageflags_annotate_known_frames(procfs):
+    add_sample_process(procfs)
+    procfs.set_kpageflags([100], [KPF_DIRTY | KPF_ACTIVE])
+    collector = PagingCollector(procfs.root, procfs.page_size)
+    pages = by_vpn(collector.scan_processes([42]))
+
+    assert collector.kpageflags_available
+    assert pages[1]['flags'] == PAGE_PRESENT | PAGE_SOFT_DIRTY | PAGE_DIRTY | PAGE_ACTIVE
+    assert pages[2]['flags'] == PAGE_SWAPPED
+    assert pages[3]['flags'] == PAGE_PRESENT
+
+
+def test_missing_kpageflags_disables_annotation(procfs):
+    add_sample_process(procfs)
+    collector = PagingCollector(procfs.root, procfs.page_size)
+    pages = by_vpn(collector.scan_processes([42]))
+
+    assert not collector.kpageflags_available
+    assert pages[1]['flags'] == PAGE_PRESENT | PAGE_SOFT_DIRTY
+
+
+def test_unreadable_kpageflags_disables_annotation(procfs, monkeypatch):
+    add_sample_process(procfs)
+    procfs.set_kpageflags([100], [KPF_DIRTY])
+    kpageflags = os.path.join(procfs.root, 'kpageflags')
+    real_open = os.open
+
+    def deny_kpageflags(path, *args, **kwargs):
+        if path == kpageflags:
+            raise PermissionError(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(os, 'open', deny_kpageflags)
+    collector = PagingCollector(procfs.root, procfs.page_size)
+    pages = by_vpn(collector.scan_processes([42]))
+
+    assert not collector.kpageflags_available
+    assert pages[1]['flags'] == PAGE_PRESENT | PAGE_SOFT_DIRTY
+    assert collector.scan_processes([42]).size == 3
@@ -0,0 +1,110 @@
+import errno
+import os
+import select
+import time
+import pytest
+import components.pressure as pressure
+from components.metrics import MetricsRegistry
+from components.pressure import PressureWatcher, cgroup_pressure_path, open_pressure_triggers, read_pressure
+from components.scheduler import SampleScheduler
+from components.system_monitor import SystemMonitor
+
+
+class PipeTrigger:
+    events = select.EPOLLIN
+
+    def __init__(self):
+        self.read_fd, self.write_fd = os.pipe2(os.O_NONBLOCK)
+
+    def fire(self):
+        os.write(self.write_fd, b'\0')
+
+    def drain(self):
+        os.read(self.read_fd, 4096)
+
+    def fileno(self):
+        return self.read_fd
+
+    def close(self):
+        os.close(self.read_fd)
+        os.close(self.write_fd)
+
+
+def open_fds():
+    return len(os.listdir('/proc/self/fd'))
+
+
+def test_read_pressure_parses_some_and_full(tmp_path):
+    path = tmp_path / 'memory'
+    path.write_text("some avg10=1.50 avg60=0.20 avg300=0.00 total=12345\n"
+                    "full avg10=0.00 avg60=0.10 avg300=0.00 total=678\n")
+    assert read_pressure(str(path)) == {
+        'some': {'avg10': 1.5, 'avg60': 0.2, 'avg300': 0.0, 'total': 12345.0},
+        'full': {'avg10': 0.0, 'avg60': 0.1, 'avg300': 0.0, 'total': 678.0},
+    }
+
+
+def test_cgroup_paths_resolve_under_the_cgroup_root():
+    expected = '/sys/fs/cgroup/user.slice/memory.pressure'
+    assert cgroup_pressure_path('user.slice') == expected
+    assert cgroup_pressure_path('/user.slice') == expected
+    assert cgroup_pressure_path('/sys/fs/cgroup/user.slice') == expected
+
+
+def test_trigger_spec_is_written_to_the_pressure_file(tmp_path, monkeypatch):
+    system = tmp_path / 'memory'
+    system.write_text('')
+    monkeypatch.setattr(pressure, 'SYSTEM_PRESSURE_PATH', str(system))
+    for trigger in open_pressure_triggers(stall_us=150000, window_us=2000000):
+        trigger.close()
+    assert system.read_text() == 'some 150000 2000000'
+
+
+def test_failed_registration_names_the_path_and_closes_open_triggers(tmp_path, monkeypatch):
+    system = tmp_path / 'memory'
+    system.write_text('')
+    monkeypatch.setattr(pressure, 'SYSTEM_PRESSURE_PATH', str(system))
+    monkeypatch.setattr(pressure, 'CGROUP_ROOT', str(tmp_path / 'cgroup'))
+    before = open_fds()
+    with pytest.raises(OSError) as error:
+        open_pressure_triggers(['missing.slice'])
+    assert error.value.errno == errno.ENOENT
+    assert 'missing.slice/memory.pressure' in str(error.value)
+    assert open_fds() == before
+
+
+def test_monitor_keeps_polling_when_triggers_are_unavailable(procfs, tmp_path, monkeypatch):
+    monkeypatch.setattr(pressure, 'SYSTEM_PRESSURE_PATH', str(tmp_path / 'no-psi'))
+    monitor = SystemMonitor(procfs.root)
+    try:
+        with pytest.raises(OSError):
+            monitor.enable_pressure()
+        assert monitor.pressure is None
+        assert all(source.scale == 1.0 for source in monitor.scheduler.sources)
+    finally:
+        monitor.sampler.process_collector.shutdown()
+
+
+def test_watcher_bursts_while_triggers_fire():
+    scheduler = SampleScheduler({'memory': lambda: None, 'paging': lambda: None}, metrics=MetricsRegistry())
+    trigger = PipeTrigger()
+    watcher = PressureWatcher(scheduler, [trigger], burst_interval=0.05, burst_hold=0.1, idle_scale=5.0)
+    try:
+        bursts = lambda: {source.name: source.burst_interval for source in scheduler.sources}
+        assert all(source.scale == 5.0 for source in scheduler.sources)
+        assert not watcher.wait(0)
+
+        trigger.fire()
+        assert watcher.wait(0)
+        trigger.drain()
+        assert bursts() == {'memory': 0.05, 'paging': None}
+        assert watcher.events == 1
+
+        watcher.wake()
+        assert not watcher.wait(0)
+        assert bursts()['memory'] == 0.05
+        time.sleep(0.1)
+        assert not watcher.wait(0)
+        assert bursts() == {'memory': None, 'paging': None}
+    finally:
+        watcher.close()
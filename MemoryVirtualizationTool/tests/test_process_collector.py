@@ -0,0 +1,109 @@
+import threading
+import time
+import pytest
+import components.process_collector as process_collector
+from components.process_collector import UNAVAILABLE, ProcessCollector
+
+
+@pytest.fixture
+def collector(procfs):
+    collector = ProcessCollector(procfs.root, max_workers=4, scan_budget=1.0, page_size=procfs.page_size)
+    yield collector
+    collector.shutdown()
+
+
+def add_process(procfs, pid, name='app', rss_kb=400, minflt=0):
+    procfs.write_stat(pid, name, rss_kb * 1024 // procfs.page_size, minflt)
+    procfs.write_smaps_rollup(pid, rss_kb, rss_kb // 2, rss_kb // 4, 8)
+
+
+def rows(processes):
+    return {int(row['pid']): row for row in processes}
+
+
+def test_scan_reads_rollup_totals(procfs, collector):
+    add_process(procfs, 10, 'web server', 400)
+    add_process(procfs, 11, 'db', 800)
+    processes = rows(collector.scan())
+
+    assert sorted(processes) == [10, 11]
+    assert processes[10]['name'] == 'web server'
+    assert (processes[11]['rss'], processes[11]['pss'], processes[11]['uss'], processes[11]['swap']) == (
+        800 * 1024, 400 * 1024, 200 * 1024, 8 * 1024)
+
+
+def test_unchanged_stat_reuses_cached_totals(procfs, collector):
+    add_process(procfs, 10)
+    add_process(procfs, 11)
+    collector.scan()
+    procfs.write_smaps_rollup(10, 999, 999, 999, 999)
+    procfs.write_smaps_rollup(11, 999, 999, 999, 999)
+    procfs.write_stat(11, 'app', 100, minflt=5)
+    processes = rows(collector.scan())
+
+    assert collector.cached == 1
+    assert processes[10]['pss'] == 200 * 1024
+    assert processes[11]['pss'] == 999 * 1024
+
+    collector.cache_max_age = 0.0
+    assert rows(collector.scan())[10]['pss'] == 999 * 1024
+    assert collector.cached == 0
+
+
+def test_vanished_processes_drop_out(procfs, collector):
+    add_process(procfs, 10)
+    add_process(procfs, 11)
+    collector.scan()
+    procfs.remove_process(11)
+    assert sorted(rows(collector.scan())) == [10]
+    assert sorted(rows(collector.scan([10, 12]))) == [10]
+
+
+def test_unreadable_rollup_falls_back_to_stat_rss(procfs, collector, monkeypatch):
+    add_process(procfs, 10, rss_kb=400)
+    add_process(procfs, 11, rss_kb=800)
+    real_read_bytes = process_collector.read_bytes
+
+    def deny_rollup(path):
+        if path.endswith('11/smaps_rollup'):
+            raise PermissionError(path)
+        return real_read_bytes(path)
+
+    monkeypatch.setattr(process_collector, 'read_bytes', deny_rollup)
+    processes = rows(collector.scan())
+
+    assert processes[10]['pss'] == 200 * 1024
+    assert processes[11]['rss'] == 800 * 1024
+    assert processes[11]['pss'] == processes[11]['uss'] == processes[11]['swap'] == UNAVAILABLE
+
+
+def test_stuck_read_does_not_hold_later_scans(procfs, collector, monkeypatch):
+    add_process(procfs, 10)
+    add_process(procfs, 11)
+    collector.scan()
+    release = threading.Event()
+    reads = []
+    real_read_bytes = process_collector.read_bytes
+
+    def hang_on_11(path):
+        reads.append(path)
+        if path.endswith('11/stat'):
+            release.wait(10)
+        return real_read_bytes(path)
+
+    monkeypatch.setattr(process_collector, 'read_bytes', hang_on_11)
+    collector.scan_budget = 0.2
+    assert sorted(rows(collector.scan())) == [10, 11]
+    assert collector.timed_out == 1
+
+    started = time.monotonic()
+    processes = rows(collector.scan())
+    assert time.monotonic() - started < collector.scan_budget
+    assert sorted(processes) == [10, 11]
+    assert (collector.stalled, collector.timed_out) == (1, 0)
+    assert sum(path.endswith('11/stat') for path in reads) == 1
+
+    release.set()
+    collector._in_flight[11].result(5)
+    collector.scan()
+    assert collector.stalled == 0
@@ -0,0 +1,86 @@
+import numpy as np
+import pytest
+from PyQt5.QtCore import QPoint
+from PyQt5.QtGui import QRegion
+from components.process_legend import (CELL_HEIGHT, CELL_WIDTH, VISIBLE_ROWS, ProcessLegend, format_size,
+                                       legend_limit_label)
+
+PIDS = np.arange(100, 130)
+SIZES = np.arange(30, 0, -1) << 20
+
+
+@pytest.fixture
+def legend(qapp):
+    legend = ProcessLegend(['#F44336', '#2196F3'], limit=0)
+    legend.resize(3 * CELL_WIDTH + 2 * legend.frameWidth() + 10, legend.height())
+    legend.show()
+    qapp.processEvents()
+    yield legend
+    legend.close()
+
+
+def record_updates(legend):
+    updates = []
+    legend.viewport().update = lambda *region: updates.append(region)
+    return updates
+
+
+def test_sizes_and_limits_are_labelled():
+    assert format_size(512 * 1024) == '512 KB'
+    assert format_size(3 << 20) == '3.0 MB'
+    assert format_size(5 << 30) == '5.0 GB'
+    assert legend_limit_label(20) == "Top 20 processes"
+    assert legend_limit_label(0) == "All processes"
+
+
+def test_cells_sort_by_size_then_pid_within_the_limit(legend):
+    legend.set_processes([7, 3, 5, 9], [100, 300, 300, 50])
+    assert legend.cells['pid'].tolist() == [3, 5, 7, 9]
+    legend.set_limit(2)
+    assert legend.cells['pid'].tolist() == [3, 5]
+    legend.set_limit(0)
+    assert len(legend.cells) == 4
+
+
+def test_filter_keeps_matching_pid_prefixes(legend):
+    legend.set_processes([12, 120, 212, 1], [1, 2, 3, 4])
+    legend.set_filter(' 12 ')
+    assert legend.cells['pid'].tolist() == [120, 12]
+    legend.set_processes([12, 312, 1250], [5, 6, 7])
+    assert legend.cells['pid'].tolist() == [1250, 12]
+    legend.set_filter('')
+    assert legend.cells['pid'].tolist() == [1250, 312, 12]
+
+
+def test_only_changed_visible_cells_are_repainted(legend):
+    assert legend.columns == 3
+    legend.set_processes(PIDS, SIZES)
+    updates = record_updates(legend)
+
+    sizes = SIZES.copy()
+    sizes[4] -= 1
+    legend.set_processes(PIDS, sizes)
+    assert len(updates) == 1 and updates[0][0].rects() == [legend.cell_rect(4)]
+
+    sizes[3 * (VISIBLE_ROWS + 2)] -= 1
+    legend.set_processes(PIDS, sizes)
+    assert len(updates) == 1
+
+    legend.set_processes(PIDS[:2], sizes[:2])
+    expected = QRegion()
+    for index in range(2, legend.visible_range()[1]):
+        expected = expected.united(legend.cell_rect(index))
+    assert len(updates) == 2 and updates[1][0] == expected
+
+
+def test_positions_map_to_cells_after_scrolling(legend):
+    legend.set_processes(PIDS, SIZES)
+    bar = legend.verticalScrollBar()
+    assert bar.maximum() == 10 * CELL_HEIGHT - legend.viewport().height()
+    assert legend.index_at(QPoint(CELL_WIDTH + 1, 1)) == 1
+    assert legend.index_at(QPoint(1, CELL_HEIGHT + 1)) == 3
+    assert legend.index_at(QPoint(3 * CELL_WIDTH + 1, 1)) is None
+    bar.setValue(2 * CELL_HEIGHT)
+    assert legend.index_at(QPoint(2 * CELL_WIDTH + 1, 1)) == 8
+    assert legend.visible_range() == (6, 6 + 3 * (legend.viewport().height() // CELL_HEIGHT + 1))
+    assert legend.cell_rect(6).top() == 0
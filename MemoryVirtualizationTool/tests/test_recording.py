@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from components.recording import ChunkEncoder, SessionReader, SessionRecorder, StreamDecoder, page_keys
+from components.samples import PagingSnapshot, WorkingSetSnapshot
+from components.paging_collector import PAGE_DTYPE, PAGE_PRESENT
+
+FIVE_LEVEL_VPN = 1 << 44
+
+
+def make_pages(rows):
+    pages = np.zeros(len(rows), dtype=PAGE_DTYPE)
+    pages['pid'], pages['vpn'], pages['pfn'] = np.array(rows, dtype=np.uint64).T
+    pages['flags'] = PAGE_PRESENT
+    return pages
+
+
+def paging_snapshots():
+    first = make_pages([(1, 5, 10), (0, (1 << 40) + 5, 11), (7, FIVE_LEVEL_VPN + 3, 12), (7, 3, 13)])
+    second = make_pages([(0, (1 << 40) + 5, 21), (7, FIVE_LEVEL_VPN + 3, 12), (7, 4, 14)])
+    return [PagingSnapshot(float(t), 4096, 1 << 20, len(pages), pages) for t, pages in enumerate((first, second))]
+
+
+def sorted_pages(pages):
+    return pages[np.lexsort((pages['vpn'], pages['pid']))]
+
+
+def test_recorder_skips_working_set_samples(tmp_path):
+    path = tmp_path / 'session.mvr'
+    recorder = SessionRecorder(path)
+    recorder.record('working_set', WorkingSetSnapshot(0.0, 1.0, 4096, np.empty(0, dtype=PAGE_DTYPE),
+                                                      np.empty(0, dtype=bool)))
+    recorder.close()
+
+    reader = SessionReader(path)
+    try:
+        assert list(reader.events()) == []
+    finally:
+        reader.close()
+
+
+def test_recorder_rejects_unknown_kinds(tmp_path):
+    recorder = SessionRecorder(tmp_path / 'session.mvr')
+    try:
+        with pytest.raises(AttributeError):
+            recorder.record('segmentaton', None)
+    finally:
+        recorder.close()
+
+
+def test_page_keys_keep_wide_vpns_apart():
+    pages = paging_snapshots()[0].pages
+    assert len(np.unique(page_keys(pages))) == len(pages)
+    order = np.argsort(page_keys(pages), kind='stable')
+    assert pages['pid'][order].tolist() == [0, 1, 7, 7]
+    assert pages['vpn'][order][2:].tolist() == [3, FIVE_LEVEL_VPN + 3]
+
+
+def test_paging_deltas_round_trip_with_wide_vpns(tmp_path):
+    snapshots = paging_snapshots()
+    path = tmp_path / 'session.mvr'
+    recorder = SessionRecorder(path)
+    for snapshot in snapshots:
+        recorder.record('paging', snapshot)
+    recorder.close()
+    reader = SessionReader(path)
+    try:
+        replayed = [sample for _, _, sample in reader.keyed_samples('paging', 0.0)]
+    finally:
+        reader.close()
+
+    encoder, decoder = ChunkEncoder(), StreamDecoder()
+    streamed = []
+    for snapshot in snapshots:
+        kind, count, _, _, buffers = encoder.encode_paging(snapshot)[0]
+        streamed += [sample for _, _, sample in
+                     decoder.decode(kind, count, b''.join(bytes(buffer) for buffer in buffers[1:]))]
+
+    for samples in (replayed, streamed):
+        assert len(samples) == len(snapshots)
+        for sample, snapshot in zip(samples, snapshots):
+            assert np.array_equal(sorted_pages(sample.pages), sorted_pages(snapshot.pages))
@@ -0,0 +1,151 @@
+import numpy as np
+import pytest
+from components.replacement_sim import (MAX_FRAMES, POLICIES, POLICY_CLASSES, ARCPolicy, greater_before,
+                                        miss_ratio_curve, next_occurrence, simulate, stack_distances,
+                                        synthetic_references)
+
+
+def random_references(count, pages, seed):
+    return np.random.default_rng(seed).integers(0, pages, count).astype(np.int64)
+
+
+def naive_stack_distances(references):
+    stack, distances = [], []
+    for page in references.tolist():
+        if page in stack:
+            depth = stack[::-1].index(page)
+            distances.append(depth)
+            stack.remove(page)
+        else:
+            distances.append(-1)
+        stack.append(page)
+    return distances
+
+
+def naive_fifo(references, frames):
+    queue, hits = [], []
+    for page in references.tolist():
+        hits.append(page in queue)
+        if page not in queue:
+            if len(queue) == frames:
+                queue.pop(0)
+            queue.append(page)
+    return hits
+
+
+def naive_clock(references, frames):
+    pages, referenced, hand, hits = [None] * frames, [False] * frames, 0, []
+    for page in references.tolist():
+        if page in pages:
+            referenced[pages.index(page)] = True
+            hits.append(True)
+            continue
+        hits.append(False)
+        while referenced[hand]:
+            referenced[hand] = False
+            hand = (hand + 1) % frames
+        pages[hand], referenced[hand] = page, True
+        hand = (hand + 1) % frames
+    return hits
+
+
+def naive_lfu(references, frames):
+    counts, last_use, hits = {}, {}, []
+    for time, page in enumerate(references.tolist()):
+        hits.append(page in counts)
+        if page not in counts:
+            if len(counts) == frames:
+                victim = min(counts, key=lambda resident: (counts[resident], last_use[resident]))
+                del counts[victim]
+            counts[page] = 0
+        counts[page] += 1
+        last_use[page] = time
+    return hits
+
+
+@pytest.mark.parametrize('count', [0, 1, 2, 7, 64, 513])
+def test_stack_distances_match_a_naive_lru_stack(count):
+    references = random_references(count, 12, count)
+    assert stack_distances(references).tolist() == naive_stack_distances(references)
+
+
+def test_greater_before_counts_larger_earlier_values():
+    rng = np.random.default_rng(1)
+    for count in (0, 1, 2, 3, 5, 16, 100, 257):
+        values = rng.integers(0, 20, count).astype(np.int64)
+        expected = [int(np.count_nonzero(values[:i] > value)) for i, value in enumerate(values.tolist())]
+        assert greater_before(values).tolist() == expected
+
+
+def test_next_occurrence_points_at_the_following_reference():
+    references = random_references(200, 10, 2)
+    following = next_occurrence(references).tolist()
+    for i, page in enumerate(references.tolist()):
+        later = [j for j in range(i + 1, len(references)) if references[j] == page]
+        assert following[i] == (later[0] if later else len(references))
+
+
+def test_miss_ratio_curve_matches_lru_at_every_size():
+    references = random_references(3000, 40, 3)
+    curve = miss_ratio_curve(stack_distances(references))
+    assert len(curve) == 41
+    for frames in range(1, 45):
+        lru = simulate(references, 'LRU', frames, curve)
+        assert lru.miss_ratio == pytest.approx(curve[min(frames, len(curve) - 1)])
+        misses = len(references) - sum(1 for distance in naive_stack_distances(references)
+                                       if 0 <= distance < frames)
+        assert round(lru.miss_ratio * len(references)) == misses
+
+
+@pytest.mark.parametrize('policy, naive', [('FIFO', naive_fifo), ('CLOCK', naive_clock), ('LFU', naive_lfu)])
+def test_policies_match_naive_simulators(policy, naive):
+    references = np.concatenate([random_references(1500, 30, 4), synthetic_references(1500, pages=64, seed=4)])
+    for frames in (1, 2, 7, 16, 100):
+        assert simulate(references, policy, frames).hits.tolist() == naive(references, frames)
+
+
+def test_opt_is_never_beaten():
+    for seed in range(3):
+        references = synthetic_references(4000, pages=128, seed=seed, scan_block=256)
+        for frames in (1, 4, 32, 100):
+            misses = {policy: simulate(references, policy, frames).miss_ratio for policy in POLICIES}
+            assert all(misses['OPT'] <= misses[policy] for policy in POLICIES)
+
+
+def test_arc_keeps_its_lists_within_bounds():
+    references = synthetic_references(5000, pages=200, seed=5, scan_block=128)
+    for frames in (1, 3, 50):
+        arc = ARCPolicy(frames)
+        for page in references.tolist():
+            resident = page in arc.resident()
+            hits = []
+            arc.run([page], hits)
+            assert hits == [resident]
+            assert len(arc.t1) + len(arc.t2) <= frames
+            assert len(arc.t1) + len(arc.b1) <= frames
+            assert len(arc.t1) + len(arc.t2) + len(arc.b1) + len(arc.b2) <= 2 * frames
+            assert 0 <= arc.target <= frames
+            assert not (arc.t1.keys() | arc.t2.keys()) & (arc.b1.keys() | arc.b2.keys())
+            slots = list(arc.resident().values())
+            assert len(set(slots)) == len(slots) and all(0 <= slot < frames for slot in slots)
+
+
+@pytest.mark.parametrize('policy', POLICIES)
+def test_chunked_runs_match_a_single_pass(policy):
+    references = synthetic_references(10007, pages=300, seed=6, scan_block=512)
+    frames = 64
+    result = simulate(references, policy, frames)
+    model = POLICY_CLASSES[policy](frames)
+    hits = bytearray()
+    if policy == 'OPT':
+        model.run(references.tolist(), hits, next_occurrence(references).tolist())
+    else:
+        model.run(references.tolist(), hits)
+    assert result.hits.tolist() == [bool(hit) for hit in hits]
+    assert len(result.snapshots) == -(-len(references) // -(-len(references) // MAX_FRAMES))
+    assert result.snapshots[-1].timestamp == len(references)
+    last = result.snapshots[-1].pages
+    assert dict(zip(last['vpn'].tolist(), (last['pfn'] - 1).tolist())) == dict(model.resident())
+    for snapshot in result.snapshots:
+        slots = snapshot.pages['pfn'].tolist()
+        assert len(set(slots)) == len(slots) and all(1 <= slot <= frames for slot in slots)
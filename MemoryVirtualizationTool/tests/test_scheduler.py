@@ -0,0 +1,32 @@
+from components.scheduler import SampleScheduler
+from components.metrics import MetricsRegistry
+
+
+def make_scheduler(calls):
+    sources = {name: (lambda name=name: calls.append(name)) for name in ('memory', 'paging', 'processes')}
+    return SampleScheduler(sources, {'memory': 1.0, 'paging': 1.0, 'processes': 2.0}, metrics=MetricsRegistry(),
+                           start_delays={'memory': 0.0, 'paging': 0.25, 'processes': 0.5})
+
+
+def test_restart_staggers_sources_from_thread_start():
+    calls = []
+    scheduler = make_scheduler(calls)
+    scheduler.restart(now=100.0)
+
+    list(scheduler.run_due(now=100.1))
+    assert calls == ['memory']
+    list(scheduler.run_due(now=100.3))
+    assert calls == ['memory', 'paging']
+    assert scheduler.wait_time(now=100.3) > 0.0
+    list(scheduler.run_due(now=100.5))
+    assert calls == ['memory', 'paging', 'processes']
+
+
+def test_late_start_does_not_collapse_stagger():
+    calls = []
+    scheduler = make_scheduler(calls)
+    late = scheduler.sources[0].deadline + 1.0
+    scheduler.restart(now=late)
+
+    list(scheduler.run_due(now=late))
+    assert calls == ['memory']
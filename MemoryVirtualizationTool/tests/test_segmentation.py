@@ -0,0 +1,99 @@
+import numpy as np
+from components.samples import SegmentationDelta, empty_segments, merge_segment_deltas
+from components.segmentation_collector import SegmentationCollector
+
+REGIONS = [(0x400000, 0x401000, 'r-xp', '/usr/bin/app'), (0x600000, 0x602000, 'rw-p', '/usr/bin/app'),
+           (0x1000000, 0x1004000, 'rw-p', '[heap]'), (0x7ff000000, 0x7ff021000, 'rw-p', '[stack]')]
+
+
+def by_base(segments):
+    return {int(segment['base']): segment for segment in segments}
+
+
+def collect(collector, pids, timestamp=0.0):
+    added, resized, removed = collector.collect(pids)
+    return SegmentationDelta(timestamp, added, resized, removed, False, 0, 0.0)
+
+
+def apply_delta(state, delta):
+    if delta.reset:
+        state.clear()
+    for segment_id in delta.removed.tolist():
+        del state[segment_id]
+    for segment in np.concatenate([delta.added, delta.resized]):
+        state[int(segment['segment_id'])] = segment.item()
+    return state
+
+
+def test_first_collect_adds_every_mapping(procfs):
+    procfs.add_process(5, REGIONS)
+    added, resized, removed = SegmentationCollector(procfs.root).collect([5])
+
+    assert not len(resized) and not len(removed)
+    segments = by_base(added)
+    assert sorted(segments) == [start // 1024 for start, _, _, _ in REGIONS]
+    assert [segments[start // 1024]['type'] for start, _, _, _ in REGIONS] == ['code', 'data', 'heap', 'stack']
+    assert segments[0x1000000 // 1024]['limit'] == 16
+    assert len(set(added['segment_id'].tolist())) == len(REGIONS)
+
+
+def test_changed_maps_report_added_resized_and_removed(procfs):
+    procfs.add_process(5, REGIONS)
+    collector = SegmentationCollector(procfs.root)
+    ids = {int(s['base']): int(s['segment_id']) for s in collector.collect([5])[0]}
+    procfs.write_maps(5, [REGIONS[0], (0x1000000, 0x1010000, 'rw-p', '[heap]'), REGIONS[3],
+                          (0x2000000, 0x2001000, 'rw-p', '')])
+    added, resized, removed = collector.collect([5])
+
+    assert [(int(s['base']), s['type']) for s in added] == [(0x2000000 // 1024, 'anon')]
+    assert [(int(s['segment_id']), int(s['limit'])) for s in resized] == [(ids[0x1000000 // 1024], 64)]
+    assert removed.tolist() == [ids[0x600000 // 1024]]
+    assert not any(len(part) for part in collector.collect([5]))
+
+
+def test_vanished_and_dropped_processes_remove_their_segments(procfs):
+    procfs.add_process(5, REGIONS)
+    procfs.add_process(6, REGIONS[:2])
+    collector = SegmentationCollector(procfs.root)
+    added = collector.collect([5, 6])[0]
+    procfs.remove_process(6)
+    _, _, removed = collector.collect([5, 6])
+    assert sorted(removed.tolist()) == sorted(added['segment_id'][added['process_id'] == 6].tolist())
+    _, _, removed = collector.collect([6])
+    assert sorted(removed.tolist()) == sorted(added['segment_id'][added['process_id'] == 5].tolist())
+    assert not len(collector.snapshot())
+
+
+def test_merged_deltas_match_applying_each_delta(procfs):
+    rng = np.random.default_rng(7)
+    collector = SegmentationCollector(procfs.root)
+    for pid in (5, 6):
+        procfs.add_process(pid, [])
+    deltas = []
+    for step in range(40):
+        for pid in (5, 6):
+            slots = np.flatnonzero(rng.random(24) < 0.5)
+            sizes = rng.integers(1, 64, len(slots)) * 4096
+            procfs.write_maps(pid, [(slot << 20, (slot << 20) + size, 'rw-p', '')
+                                    for slot, size in zip(slots.tolist(), sizes.tolist())])
+        deltas.append(collect(collector, [5, 6], float(step)))
+
+    expected = {}
+    for delta in deltas:
+        apply_delta(expected, delta)
+    for split in (1, 10, 39):
+        state = {}
+        for delta in deltas[:split]:
+            apply_delta(state, delta)
+        merged = deltas[split]
+        for delta in deltas[split + 1:]:
+            merged = merge_segment_deltas(merged, delta)
+        assert not np.isin(merged.added['segment_id'], merged.removed).any()
+        assert apply_delta(state, merged) == expected
+    assert expected == {int(s['segment_id']): s.item() for s in collector.snapshot()}
+
+
+def test_reset_discards_older_deltas():
+    older = SegmentationDelta(0.0, empty_segments(), empty_segments(), np.array([3]), False, 0, 0.0)
+    newer = SegmentationDelta(1.0, empty_segments(), empty_segments(), np.empty(0, dtype=np.int64), True, 0, 0.0)
+    assert merge_segment_deltas(older, newer) is newer
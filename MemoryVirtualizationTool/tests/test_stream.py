@@ -0,0 +1,135 @@
+import socket
+import threading
+import numpy as np
+import pytest
+from components.paging_collector import PAGE_DTYPE, PAGE_PRESENT
+from components.recording import (FILE_HEADER, FORMAT_VERSION, KIND_MEMORY, MAGIC, ChunkEncoder, StreamDecoder,
+                                  encode_chunk, encode_memory, memory_row)
+from components.samples import MemorySample, PagingSnapshot, SegmentationDelta, empty_segments
+from components.segmentation_collector import SEGMENT_DTYPE
+from components.stream import StreamServer, connect, read_frames, recv_exactly
+
+
+def frame_bytes(chunks):
+    return b''.join(bytes(buffer) for *_, buffers in chunks for buffer in buffers)
+
+
+def memory_chunk(timestamp):
+    return encode_memory([memory_row(MemorySample(timestamp, 100, 60, 40, 50, 40.0, 10, 1, 9, 10.0))])
+
+
+def paging_snapshot(timestamp, rows):
+    pages = np.zeros(len(rows), dtype=PAGE_DTYPE)
+    pages['pid'], pages['vpn'], pages['pfn'] = np.array(rows, dtype=np.uint64).T
+    pages['flags'] = PAGE_PRESENT
+    return PagingSnapshot(timestamp, 4096, 1 << 20, len(rows), pages)
+
+
+def segmentation_delta(timestamp, added, removed=()):
+    return SegmentationDelta(timestamp, np.array(added, dtype=SEGMENT_DTYPE), empty_segments(),
+                             np.array(removed, dtype=np.int64), False, 1024, 0.5)
+
+
+def send_slowly(sock, data):
+    for start in range(0, len(data), 7):
+        sock.sendall(data[start:start + 7])
+    sock.close()
+
+
+def test_frames_are_reassembled_from_partial_reads():
+    chunks = [memory_chunk(1.0), encode_chunk(b'TEST', 3, 2.0, 2.0, b'abcdefghij'), memory_chunk(3.0)]
+    reader, writer = socket.socketpair()
+    sender = threading.Thread(target=send_slowly,
+                              args=(writer, FILE_HEADER.pack(MAGIC, FORMAT_VERSION) + frame_bytes(chunks)))
+    sender.start()
+    frames = read_frames(reader)
+    received = [next(frames) for _ in chunks]
+    with pytest.raises(ConnectionError):
+        next(frames)
+    sender.join()
+    reader.close()
+
+    assert [(kind, count) for kind, count, _ in received] == [(KIND_MEMORY, 1), (b'TEST', 3), (KIND_MEMORY, 1)]
+    assert bytes(received[1][2]) == b'abcdefghij' + b'\0' * 6
+
+
+def test_incompatible_peer_is_rejected():
+    reader, writer = socket.socketpair()
+    writer.sendall(FILE_HEADER.pack(MAGIC, FORMAT_VERSION + 1))
+    with pytest.raises(ValueError):
+        next(read_frames(reader))
+    reader.close()
+    writer.close()
+
+
+def test_truncated_frame_raises_connection_error():
+    reader, writer = socket.socketpair()
+    frame = frame_bytes([memory_chunk(1.0)])
+    writer.sendall(frame[:-8])
+    writer.close()
+    with pytest.raises(ConnectionError):
+        recv_exactly(reader, len(frame))
+    reader.close()
+
+
+def drain(server, frames, decoder, count):
+    events = []
+    while len(events) < count:
+        server.poll(0)
+        kind, frame_count, payload = next(frames)
+        events += decoder.decode(kind, frame_count, payload)
+    return events
+
+
+def test_late_client_gets_keyframes_then_deltas(tmp_path):
+    encoder = ChunkEncoder()
+    server = StreamServer(str(tmp_path / 'collector.sock'), encoder.keyframes)
+    try:
+        server.broadcast(encoder.encode_paging(paging_snapshot(1.0, [(1, 5, 10), (2, 1 << 44, 11)])))
+        server.broadcast(encoder.encode_segmentation(segmentation_delta(1.0, [(0, 0, 4, 'heap', 1),
+                                                                             (1, 16, 8, 'stack', 1)])))
+        client = connect(server.address)
+        client.settimeout(5)
+        server.poll(1)
+        frames, decoder = read_frames(client), StreamDecoder()
+        events = drain(server, frames, decoder, 2)
+        assert [kind for _, kind, _ in events] == ['paging', 'segmentation']
+
+        second = paging_snapshot(2.0, [(2, 1 << 44, 12), (3, 7, 13)])
+        server.broadcast(encoder.encode_paging(second))
+        server.broadcast(encoder.encode_segmentation(segmentation_delta(2.0, [(2, 32, 4, 'anon', 2)], [0])))
+        server.broadcast([memory_chunk(2.0)])
+        (_, _, paging), (_, _, segmentation), (_, _, memory) = drain(server, frames, decoder, 3)
+
+        order = np.lexsort((paging.pages['vpn'], paging.pages['pid']))
+        assert np.array_equal(paging.pages[order], second.pages)
+        assert sorted(segmentation.added['segment_id'].tolist()) == [2]
+        assert segmentation.removed.tolist() == [0]
+        assert memory.timestamp == 2.0 and memory.total == 100
+        client.close()
+    finally:
+        server.close()
+    assert not (tmp_path / 'collector.sock').exists()
+
+
+def test_disconnected_and_stalled_clients_are_dropped(tmp_path):
+    server = StreamServer(str(tmp_path / 'collector.sock'), max_pending=1 << 16)
+    try:
+        gone = connect(server.address)
+        stalled = connect(server.address)
+        stalled.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        server.poll(1)
+        server.poll(0.1)
+        assert len(server.clients) == 2
+
+        gone.close()
+        server.poll(1)
+        assert len(server.clients) == 1
+
+        chunk = encode_chunk(b'TEST', 1, 0.0, 0.0, bytes(1 << 14))
+        for _ in range(64):
+            server.broadcast([chunk])
+        assert not server.clients
+        stalled.close()
+    finally:
+        server.close()
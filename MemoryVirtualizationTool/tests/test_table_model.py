@@ -0,0 +1,78 @@
+import numpy as np
+from PyQt5.QtCore import Qt
+from components.table_model import MAX_CHANGED_RUNS, StructuredTableModel
+
+ROW_DTYPE = np.dtype([('pid', np.int32), ('size', np.uint64)])
+COLUMNS = [('PID', 'pid', lambda row: str(row['pid'])), ('Size', 'size', lambda row: str(row['size']))]
+
+
+def rows(pairs):
+    return np.array(pairs, dtype=ROW_DTYPE)
+
+
+def recorded_signals(model):
+    signals = []
+    model.modelReset.connect(lambda: signals.append(('reset',)))
+    model.rowsInserted.connect(lambda parent, first, last: signals.append(('inserted', first, last)))
+    model.rowsRemoved.connect(lambda parent, first, last: signals.append(('removed', first, last)))
+    model.dataChanged.connect(lambda top, bottom: signals.append(('changed', top.row(), bottom.row())))
+    return signals
+
+
+def column(model, column=0):
+    return [model.data(model.index(row, column)) for row in range(model.rowCount())]
+
+
+def test_first_array_resets_and_formats_cells(qapp):
+    model = StructuredTableModel(COLUMNS)
+    signals = recorded_signals(model)
+    model.set_array(rows([(3, 30), (1, 10)]))
+
+    assert signals == [('reset',)]
+    assert (model.rowCount(), model.columnCount()) == (2, 2)
+    assert model.headerData(1, Qt.Horizontal) == 'Size'
+    assert column(model, 1) == ['30', '10']
+    assert model.data(model.index(0, 0), Qt.ToolTipRole) is None
+
+
+def test_growing_and_shrinking_emit_row_signals_and_changed_runs(qapp):
+    model = StructuredTableModel(COLUMNS)
+    model.set_array(rows([(1, 10), (2, 20), (3, 30), (4, 40)]))
+    signals = recorded_signals(model)
+
+    model.set_array(rows([(1, 11), (2, 20), (3, 31), (4, 41), (5, 50)]))
+    assert signals == [('inserted', 4, 4), ('changed', 0, 0), ('changed', 2, 3)]
+
+    signals.clear()
+    model.set_array(rows([(1, 11), (2, 20)]))
+    assert signals == [('removed', 2, 4)]
+    assert column(model) == ['1', '2']
+
+
+def test_scattered_changes_collapse_into_one_signal(qapp):
+    model = StructuredTableModel(COLUMNS)
+    array = rows([(pid, 0) for pid in range(4 * MAX_CHANGED_RUNS)])
+    model.set_array(array)
+    signals = recorded_signals(model)
+    array = array.copy()
+    array['size'][::2] = 1
+    model.set_array(array)
+    assert signals == [('changed', 0, len(array) - 2)]
+
+
+def test_filters_and_sorting_reorder_rows(qapp):
+    model = StructuredTableModel(COLUMNS)
+    model.set_array(rows([(3, 10), (1, 30), (2, 20), (1, 5)]))
+    model.sort(1, Qt.DescendingOrder)
+    assert column(model, 1) == ['30', '20', '10', '5']
+
+    model.set_filter('pid', 1)
+    assert column(model, 1) == ['30', '5']
+    assert model.record(1)['size'] == 5
+
+    model.set_array(rows([(1, 40), (2, 20), (1, 50)]))
+    assert column(model, 1) == ['50', '40']
+
+    model.set_filter('pid', None)
+    model.sort(-1)
+    assert column(model) == ['1', '2', '1']
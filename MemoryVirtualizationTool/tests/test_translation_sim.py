@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+from components.translation_sim import (LEVEL_BITS, TABLE_SIZE, TLB, compare_modes, page_shifts,
+                                        page_table_pages, simulate, synthetic_addresses, translation_keys)
+
+
+def random_addresses(count, seed, pages=3000):
+    rng = np.random.default_rng(seed)
+    regions = rng.integers(0, 8, count, dtype=np.uint64) << np.uint64(30)
+    offsets = rng.integers(0, pages, count, dtype=np.uint64) << np.uint64(12)
+    return np.uint64(0x7f0000000000) + regions + offsets + rng.integers(0, 4096, count, dtype=np.uint64)
+
+
+def naive_tlb_hits(keys, entries, ways):
+    ways = max(1, min(ways, entries))
+    sets = [[] for _ in range(max(1, entries // ways))]
+    hits = []
+    for key in keys.tolist():
+        lines = sets[(key >> 2) % len(sets)]
+        hits.append(key in lines)
+        if key in lines:
+            lines.remove(key)
+        elif len(lines) == ways:
+            lines.pop(0)
+        lines.append(key)
+    return hits
+
+
+def naive_walk_references(levels, shift):
+    return levels - (shift - 12) // LEVEL_BITS
+
+
+def naive_shifts(addresses, mode, thp_min_pages):
+    if mode != 'THP':
+        return [{'4K': 12, '2M': 21, '1G': 30}[mode]] * len(addresses)
+    touched = {}
+    for address in addresses.tolist():
+        touched.setdefault(address >> 21, set()).add(address >> 12)
+    return [21 if len(touched[address >> 21]) >= thp_min_pages else 12 for address in addresses.tolist()]
+
+
+@pytest.mark.parametrize('entries, ways', [(1, 1), (8, 2), (64, 4), (48, 12), (16, 64)])
+def test_tlb_matches_a_naive_set_associative_lru(entries, ways):
+    keys = translation_keys(random_addresses(4000, entries, pages=200), np.full(4000, 12, dtype=np.uint64))
+    expected = naive_tlb_hits(keys, entries, ways)
+    tlb = TLB(entries, ways)
+    hits = np.concatenate([tlb.lookup(keys[start:start + 333]) for start in range(0, len(keys), 333)])
+    assert hits.tolist() == expected
+
+
+def test_thp_promotes_regions_with_enough_touched_pages():
+    addresses = random_addresses(5000, 1, pages=1200)
+    for threshold in (1, 8, 64, 512):
+        assert page_shifts(addresses, 'THP', threshold).tolist() == naive_shifts(addresses, 'THP', threshold)
+
+
+@pytest.mark.parametrize('mode', ['4K', 'THP', '2M', '1G'])
+@pytest.mark.parametrize('levels', [4, 5])
+def test_walk_references_count_the_levels_below_each_leaf(mode, levels):
+    addresses = random_addresses(6000, 2)
+    entries, ways, thp_min_pages = 32, 4, 4
+    shifts = naive_shifts(addresses, mode, thp_min_pages)
+    keys = translation_keys(addresses, np.array(shifts, dtype=np.uint64))
+    hits = naive_tlb_hits(keys, entries, ways)
+    result = simulate(addresses, mode, levels=levels, entries=entries, ways=ways, thp_min_pages=thp_min_pages,
+                      batch=1000)
+    _, accesses, hit_count, hit_rate, walks, walk_references, _, _, _ = result
+    assert (accesses, hit_count, walks) == (len(addresses), sum(hits), hits.count(False))
+    assert hit_rate == sum(hits) / len(addresses)
+    assert walk_references == sum(naive_walk_references(levels, shift)
+                                  for shift, hit in zip(shifts, hits) if not hit)
+
+
+def test_page_table_pages_count_each_distinct_table():
+    addresses = random_addresses(3000, 3)
+    for mode in ('4K', '2M', '1G'):
+        shifts = page_shifts(addresses, mode)
+        for levels in (4, 5):
+            tables = {('root',)}
+            for address, shift in zip(addresses.tolist(), shifts.tolist()):
+                top = 48 if levels == 5 else 39
+                for level_shift in range(top, shift, -LEVEL_BITS):
+                    tables.add((level_shift, address >> level_shift))
+            assert page_table_pages(addresses, shifts, levels) == len(tables)
+
+
+def test_compare_modes_reports_every_mode():
+    addresses = synthetic_addresses(20000, working_set=64 << 20)
+    results = compare_modes(addresses, entries=64, ways=4)
+    assert results['mode'].tolist() == ['4K', 'THP', '2M', '1G']
+    assert (results['hits'] + results['walks'] == len(addresses)).all()
+    assert (results['table_bytes'] == results['table_pages'] * TABLE_SIZE).all()
+    assert results['walk_references'][0] >= results['walk_references'][2] >= results['walk_references'][3]
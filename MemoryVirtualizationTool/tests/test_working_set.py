@@ -0,0 +1,44 @@
+import numpy as np
+from components.working_set import WorkingSetCollector
+from tests.fake_procfs import pagemap_entries
+
+BASE_VPN = 0x400
+
+
+def add_resident_process(procfs, pid, pfns):
+    start = BASE_VPN * procfs.page_size
+    end = start + len(pfns) * procfs.page_size
+    vpns = np.arange(BASE_VPN, BASE_VPN + len(pfns))
+    procfs.add_process(pid, [(start, end, 'rw-p', '[heap]')], vpns, pagemap_entries(pfns))
+
+
+def test_collect_reports_pages_touched_since_marking(procfs, sysfs):
+    pfns = np.arange(1000, 1300)
+    add_resident_process(procfs, 42, pfns)
+    collector = WorkingSetCollector(procfs.root, sysfs.root, procfs.page_size)
+    collector.check_available()
+
+    first = collector.collect([42])
+    assert first.pages.size == 0
+    assert first.interval == 0.0
+    assert sysfs.idle_bits(pfns).all()
+
+    touched = pfns[::3]
+    sysfs.touch(touched)
+    sample = collector.collect([42])
+
+    assert sample.pages.size == 300
+    assert int(np.count_nonzero(sample.accessed)) == 100
+    assert (sample.accessed == np.isin(sample.pages['pfn'], touched)).all()
+    assert sysfs.idle_bits(pfns).all()
+
+
+def test_collect_skips_vanished_processes(procfs, sysfs):
+    add_resident_process(procfs, 42, np.arange(1000, 1010))
+    collector = WorkingSetCollector(procfs.root, sysfs.root, procfs.page_size)
+    collector.collect([42, 43])
+    procfs.remove_process(42)
+
+    sample = collector.collect([42, 43])
+    assert sample.pages.size == 10
+    assert collector.collect([42, 43]).pages.size == 0